@@ -0,0 +1,98 @@
+"""Challenge/verify throughput of the login nonce stores.
+
+Each round issues a challenge for a fresh address, signs it with a local
+sr25519 keypair and verifies it, like ``/auth/challenge`` followed by
+``/auth/login``.  ``--store-only`` skips signing and verification to time
+the store alone.  The ``postgres`` store needs a migrated database
+(``python -m src.migrations``).
+
+Usage, from ``api/``::
+
+    python -m benchmarks.auth_challenge --rounds 2000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import secrets
+import time
+
+from substrateinterface import Keypair
+
+from src.auth import signature
+from src.auth.nonces import MemoryNonceStore, NonceStore, PostgresNonceStore
+from src.config import settings
+from src.database import engine
+
+
+async def _round(keypair: Keypair, store_only: bool) -> bool:
+    if store_only:
+        address = secrets.token_hex(24)
+        await signature.nonce_store.put(address, "nonce")
+        return await signature.nonce_store.take(address) == "nonce"
+    address = keypair.ss58_address
+    nonce = await signature.generate_challenge(address)
+    return await signature.verify_signature(
+        address, nonce, "0x" + keypair.sign(nonce).hex()
+    )
+
+
+async def _measure(
+    name: str, store: NonceStore, rounds: int, concurrency: int, store_only: bool
+) -> None:
+    signature.nonce_store = store
+    # One keypair per concurrent client: a second challenge for the same
+    # address would replace the first
+    keypairs = [
+        Keypair.create_from_mnemonic(Keypair.generate_mnemonic())
+        for _ in range(concurrency)
+    ]
+    ok = 0
+
+    async def client(keypair: Keypair, count: int) -> None:
+        nonlocal ok
+        for _ in range(count):
+            verified = await _round(keypair, store_only)
+            ok += verified
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(kp, rounds // concurrency) for kp in keypairs))
+    elapsed = time.perf_counter() - start
+    done = rounds // concurrency * concurrency
+    print(
+        f"{name:<10} {done / elapsed:>9.0f} rounds/s   "
+        f"{elapsed / done * 1e6:>8.1f} us/round   {ok}/{done} verified"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--store",
+        choices=["memory", "postgres", "both"],
+        default="both",
+    )
+    parser.add_argument("--store-only", action="store_true")
+    args = parser.parse_args()
+
+    stores: list[tuple[str, NonceStore]] = []
+    if args.store in ("memory", "both"):
+        memory = MemoryNonceStore(
+            settings.AUTH_NONCE_TTL, settings.AUTH_NONCE_MAX_ENTRIES
+        )
+        stores.append(("memory", memory))
+    if args.store in ("postgres", "both"):
+        stores.append(("postgres", PostgresNonceStore(engine, settings.AUTH_NONCE_TTL)))
+
+    try:
+        for name, store in stores:
+            await _measure(name, store, args.rounds, args.concurrency, args.store_only)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""Compare request throughput of database engine profiles.
+
+Runs the same read workload (one session per simulated request, listing a
+page of courses) through an engine built from each profile and prints
+requests/second and latency percentiles.  ``legacy`` reproduces the old
+engine (SQL echo on, SQLAlchemy's default pool, no statement timeout);
+``configured`` uses the ``DB_*`` settings from the environment/.env.
+
+Usage, from ``api/`` against a database that already has the schema::
+
+    python -m benchmarks.db_profiles --requests 2000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import Config, settings
+from src.course import service
+from src.database import create_engine
+
+PROFILES: dict[str, Config] = {
+    "legacy": settings.model_copy(
+        update={
+            "DB_ECHO": True,
+            "DB_POOL_SIZE": 5,
+            "DB_MAX_OVERFLOW": 10,
+            "DB_POOL_TIMEOUT": 30.0,
+            "DB_POOL_PRE_PING": False,
+            "DB_POOL_RECYCLE": -1,
+            "DB_STATEMENT_CACHE_SIZE": 100,
+            "DB_STATEMENT_TIMEOUT": 0,
+        }
+    ),
+    "configured": settings,
+}
+
+
+async def _run_profile(
+    name: str, config: Config, requests: int, concurrency: int
+) -> None:
+    engine = create_engine(settings.DATABASE_URL, config)
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            async with AsyncSession(engine) as session:
+                await service.get_course_rows(session, limit=20)
+            latencies.append(time.perf_counter() - start)
+
+    try:
+        # Warm the pool so connection setup is not part of the measurement
+        await asyncio.gather(*(one_request() for _ in range(concurrency)))
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<11} {requests / elapsed:>9.1f} req/s   "
+        f"p50 {quantiles[49] * 1000:>7.2f} ms   p95 {quantiles[94] * 1000:>7.2f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), action="append", dest="profiles"
+    )
+    args = parser.parse_args()
+
+    for name in args.profiles or list(PROFILES):
+        await _run_profile(name, PROFILES[name], args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Login signature-verification throughput and event-loop stall.
+
+Runs ``--rounds`` verifications of ``/auth/login``-style signatures
+(``<Bytes>``-wrapped, as wallet extensions sign them) with ``--concurrency``
+concurrent clients under each ``AUTH_SIGNATURE_POOL`` mode.  A ticker
+coroutine measures how late the event loop wakes it up while the storm
+runs: that lag is what every other request on the worker would see.
+
+Usage, from ``api/``::
+
+    python -m benchmarks.login --rounds 4000 --concurrency 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from substrateinterface import Keypair
+
+from src.auth import verifier
+from src.config import settings
+
+_TICK = 0.005
+
+
+async def _ticker(stop: asyncio.Event, lags: list[float]) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(_TICK)
+        lags.append(time.perf_counter() - start - _TICK)
+
+
+async def _measure(
+    mode: str, keypairs: list[Keypair], rounds: int, signed: list[tuple[str, str]]
+) -> None:
+    settings.AUTH_SIGNATURE_POOL = mode  # type: ignore[assignment]
+    verifier.shutdown_pool()
+    verifier.start_pool()
+    verifier.public_key.cache_clear()
+    # Warm up the pool so worker start-up is not counted
+    await asyncio.gather(
+        *(verifier.verify(kp.ss58_address, *signed[i]) for i, kp in enumerate(keypairs))
+    )
+
+    ok = 0
+
+    async def client(index: int, count: int) -> None:
+        nonlocal ok
+        address = keypairs[index].ss58_address
+        for _ in range(count):
+            verified = await verifier.verify(address, *signed[index])
+            ok += verified
+
+    stop = asyncio.Event()
+    lags: list[float] = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    per_client = rounds // len(keypairs)
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i, per_client) for i in range(len(keypairs))))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await ticker
+    verifier.shutdown_pool()
+
+    done = per_client * len(keypairs)
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    worst = lags[-1] if lags else 0.0
+    print(
+        f"{mode:<8} {done / elapsed:>9.0f} logins/s   "
+        f"loop lag p99 {p99 * 1e3:>7.1f} ms   max {worst * 1e3:>7.1f} ms   "
+        f"{ok}/{done} verified"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument(
+        "--pool",
+        choices=["inline", "thread", "process", "all"],
+        default="all",
+    )
+    args = parser.parse_args()
+
+    keypairs = [
+        Keypair.create_from_mnemonic(Keypair.generate_mnemonic())
+        for _ in range(args.concurrency)
+    ]
+    signed = []
+    for keypair in keypairs:
+        message = f"Sign this message to authenticate: {keypair.ss58_address}"
+        wrapped = f"<Bytes>{message}</Bytes>"
+        signed.append((message, "0x" + keypair.sign(wrapped).hex()))
+
+    modes = ["inline", "thread", "process"] if args.pool == "all" else [args.pool]
+    for mode in modes:
+        await _measure(mode, keypairs, args.rounds, signed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
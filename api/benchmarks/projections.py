@@ -0,0 +1,134 @@
+"""Compare ORM and Core-projection paths of the list endpoints.
+
+For each list, runs the old path (SQLModel instances -> response models ->
+JSON) and the projection path (column tuples -> slotted dataclasses ->
+JSON) against the same rows, and reports CPU time and peak Python memory
+per 1,000 rows.
+
+Usage, from ``api/`` against a populated database::
+
+    python -m benchmarks.projections --limit 1000 --rounds 20
+    python -m benchmarks.projections --course-id <uuid>   # also time lessons
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from collections.abc import Awaitable, Callable
+
+from pydantic import TypeAdapter
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.course import service
+from src.course.models import Course, Lesson
+from src.course.projections import COURSE_ROWS, LESSON_ROWS
+from src.course.schemas import CourseResponse, LessonResponse
+from src.database import engine
+
+_COURSE_RESPONSES = TypeAdapter(list[CourseResponse])
+_LESSON_RESPONSES = TypeAdapter(list[LessonResponse])
+
+
+async def _orm_courses(session: AsyncSession, limit: int) -> list[CourseResponse]:
+    """The course listing before the row projections."""
+    result = await session.exec(
+        select(Course)
+        .where(Course.deleted_at.is_(None))  # type: ignore[union-attr]
+        .order_by(Course.created_at, Course.id)  # type: ignore[arg-type]
+        .limit(limit)
+    )
+    courses = list(result.all())
+    wallet_map = await service._get_author_wallet_map(
+        session, {c.author_id for c in courses}
+    )
+    return [service._course_to_response(c, wallet_map) for c in courses]
+
+
+async def _orm_lessons(
+    session: AsyncSession, course_id: uuid.UUID, limit: int
+) -> list[Lesson]:
+    """The lesson listing before the row projections."""
+    result = await session.exec(
+        select(Lesson)
+        .where(Lesson.course_id == course_id)  # type: ignore[arg-type]
+        .order_by(Lesson.lesson_index, Lesson.id)  # type: ignore[arg-type]
+        .limit(limit)
+    )
+    return list(result.all())
+
+Path = Callable[[AsyncSession], Awaitable[tuple[int, bytes]]]
+
+
+async def _measure(name: str, path: Path, rounds: int) -> None:
+    rows = 0
+    cpu = 0.0
+    peak = 0
+    for _ in range(rounds):
+        # A fresh session per round, like a request
+        async with AsyncSession(engine) as session:
+            tracemalloc.start()
+            start = time.process_time()
+            count, _body = await path(session)
+            cpu += time.process_time() - start
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        rows += count
+    if not rows:
+        print(f"{name:<18} no rows")
+        return
+    per_k = 1000 / (rows / rounds)
+    print(
+        f"{name:<18} {cpu / rounds * per_k * 1000:>8.2f} ms CPU   "
+        f"{peak * per_k / 1024:>9.1f} KiB peak   per 1,000 rows"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--course-id", type=uuid.UUID)
+    args = parser.parse_args()
+    limit = args.limit
+
+    async def courses_orm(session: AsyncSession) -> tuple[int, bytes]:
+        courses = await _orm_courses(session, limit)
+        return len(courses), _COURSE_RESPONSES.dump_json(courses)
+
+    async def courses_rows(session: AsyncSession) -> tuple[int, bytes]:
+        rows = await service.get_course_rows(session, limit=limit)
+        return len(rows), COURSE_ROWS.dump_json(rows)
+
+    paths: list[tuple[str, Path]] = [
+        ("courses orm", courses_orm),
+        ("courses rows", courses_rows),
+    ]
+
+    if args.course_id:
+        course_id = args.course_id
+
+        async def lessons_orm(session: AsyncSession) -> tuple[int, bytes]:
+            lessons = await _orm_lessons(session, course_id, limit)
+            responses = _LESSON_RESPONSES.validate_python(lessons, from_attributes=True)
+            return len(lessons), _LESSON_RESPONSES.dump_json(responses)
+
+        async def lessons_rows(session: AsyncSession) -> tuple[int, bytes]:
+            rows = await service.get_lesson_rows(session, course_id, limit=limit)
+            return len(rows), LESSON_ROWS.dump_json(rows)
+
+        paths += [("lessons orm", lessons_orm), ("lessons rows", lessons_rows)]
+
+    try:
+        for name, path in paths:
+            await _measure(name, path, args.rounds)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""Compare worker startup schema handling: ``create_all`` vs version check.
+
+Each run uses a fresh engine, like a worker cold start, and times only the
+schema step that ``main.lifespan`` performs.  The database must already be
+migrated (``python -m src.migrations``).
+
+Usage, from ``api/``::
+
+    python -m benchmarks.startup --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlmodel import SQLModel
+
+from src.config import settings
+from src.database import create_engine
+from src.migrations import ensure_schema
+
+
+async def _create_all() -> None:
+    engine = create_engine(settings.DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+    finally:
+        await engine.dispose()
+
+
+async def _version_check() -> None:
+    engine = create_engine(settings.DATABASE_URL)
+    try:
+        await ensure_schema(engine, auto_migrate=False)
+    finally:
+        await engine.dispose()
+
+
+async def _time(name: str, step, runs: int, workers: int) -> None:  # type: ignore[no-untyped-def]
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        # Simulate several workers booting at the same moment
+        await asyncio.gather(*(step() for _ in range(workers)))
+        timings.append(time.perf_counter() - start)
+    print(
+        f"{name:<14} mean {statistics.mean(timings) * 1000:>8.2f} ms   "
+        f"max {max(timings) * 1000:>8.2f} ms   ({workers} concurrent workers)"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    await _time("create_all", _create_all, args.runs, args.workers)
+    await _time("version check", _version_check, args.runs, args.workers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""Per-request overhead of ``X402Middleware`` on routes without a payment.
+
+Calls a one-route Starlette app directly through ASGI (no server, no
+network) ``--requests`` times, bare and behind each implementation:
+
+* ``base-http`` — the previous ``BaseHTTPMiddleware`` implementation's
+  pass-through path (header lookup, path match, ``call_next``);
+* ``asgi`` — the current pure ASGI ``X402Middleware``.
+
+Half the requests hit ``/lessons/{id}`` and half ``/courses``, none with a
+``PAYMENT-SIGNATURE`` header.
+
+Usage, from ``api/``::
+
+    python -m benchmarks.x402_middleware --requests 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+from src.x402.middleware import (
+    _LESSON_DETAIL_RE,
+    _LESSON_QUIZZES_RE,
+    X402Middleware,
+)
+
+
+class _BaseHTTPX402Middleware(BaseHTTPMiddleware):
+    """The old middleware, up to where a request without payment leaves it."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        payment_sig = request.headers.get("PAYMENT-SIGNATURE") or request.headers.get(
+            "payment-signature"
+        )
+        if not payment_sig:
+            return await call_next(request)
+        path = request.url.path
+        if not (_LESSON_DETAIL_RE.match(path) or _LESSON_QUIZZES_RE.match(path)):
+            return await call_next(request)
+        raise NotImplementedError("payment requests are not benchmarked")
+
+
+async def _endpoint(request: Request) -> Response:
+    return PlainTextResponse("ok")
+
+
+def _app(middleware: type | None) -> ASGIApp:
+    app = Starlette(
+        routes=[Route("/lessons/{lesson_id}", _endpoint), Route("/courses", _endpoint)]
+    )
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"accept", b"application/json"),
+            (b"authorization", b"Bearer token"),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 8000),
+    }
+
+
+async def _measure(name: str, app: ASGIApp, requests: int) -> float:
+    scopes = [_scope("/lessons/1b5e6bde"), _scope("/courses")]
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        pass
+
+    for scope in scopes:  # warm up (middleware stack is built lazily)
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scopes[i & 1]), receive, send)
+    per_request = (time.perf_counter() - start) / requests
+    print(f"{name:<10} {per_request * 1e6:>8.1f} us/request")
+    return per_request
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    bare = await _measure("bare", _app(None), args.requests)
+    for name, middleware in (
+        ("base-http", _BaseHTTPX402Middleware),
+        ("asgi", X402Middleware),
+    ):
+        per_request = await _measure(name, _app(middleware), args.requests)
+        print(f"{'':<10} {(per_request - bare) * 1e6:>+8.1f} us overhead")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""Throughput of x402 ``402 Payment Required`` responses.
+
+Calls a one-route Starlette app directly through ASGI (no server, no
+network) ``--requests`` times; the route raises ``PaymentRequired`` for one
+of ``--courses`` courses, as ``require_lesson_purchase`` does for a lesson
+that was not bought, and the 402 is rendered by:
+
+* ``rebuild`` — the previous handler, which built the ``PaymentRequired``
+  model and JSON+Base64-encoded the header for every response;
+* ``cached`` — the current handler, which splices the resource URL into
+  the header encoded once per course version.
+
+Usage, from ``api/``::
+
+    python -m benchmarks.x402_payment_required --requests 20000 --courses 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+
+from fastapi.responses import JSONResponse
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message
+
+from src.config import settings
+from src.course.exceptions import PaymentRequired
+from src.course.pricing import to_planck
+from src.x402.middleware import _b64_encode, _payment_required_handler
+from src.x402.types import (
+    PaymentRequired as X402PaymentRequired,
+    PaymentRequirements,
+    ResourceInfo,
+)
+
+Handler = Callable[[Request, PaymentRequired], Awaitable[Response]]
+
+
+async def _rebuild_handler(request: Request, exc: PaymentRequired) -> Response:
+    """The handler before the header templates."""
+    detail: dict = exc.detail  # type: ignore[assignment]
+    price = detail.get("price", 0)
+    min_amount = detail.get("price_planck")
+    if min_amount is None:
+        min_amount = to_planck(price)
+    payload = X402PaymentRequired(
+        x402Version=2,
+        resource=ResourceInfo(
+            url=str(request.url),
+            description=f"Access to course: {detail.get('course_title', '')}",
+            mimeType="application/json",
+        ),
+        accepts=[
+            PaymentRequirements(
+                scheme="exact",
+                network=f"polkadot:{settings.NETWORK}",
+                maxAmountRequired=str(min_amount),
+                asset="PAS",
+                payTo=detail.get(
+                    "platform_wallet_address", settings.PLATFORM_WALLET_ADDRESS
+                ),
+                maxTimeoutSeconds=300,
+                extra={
+                    "courseId": detail.get("course_id", ""),
+                    "courseTitle": detail.get("course_title", ""),
+                    "price": price,
+                },
+            )
+        ],
+    )
+    return JSONResponse(
+        status_code=402,
+        content={"error": "Payment Required", "x402Version": 2},
+        headers={"PAYMENT-REQUIRED": _b64_encode(payload.model_dump())},
+    )
+
+
+def _app(handler: Handler, courses: int) -> ASGIApp:
+    course_ids = [uuid.uuid4() for _ in range(courses)]
+
+    async def endpoint(request: Request) -> Response:
+        index = int(request.path_params["lesson_id"]) % courses
+        raise PaymentRequired(
+            course_id=course_ids[index],
+            course_title=f"Polkadot fundamentals, part {index}",
+            price=1.5,
+            platform_wallet_address="5FHneW46xGXgs5mUiveU4sbTyGBzmstUspZC92UhjJM694ty",
+            price_planck=15_000_000_000,
+        )
+
+    return Starlette(
+        routes=[Route("/lessons/{lesson_id}", endpoint)],
+        exception_handlers={PaymentRequired: handler},  # type: ignore[dict-item]
+    )
+
+
+def _scope(path: str) -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"accept", b"application/json")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 8000),
+    }
+
+
+async def _measure(name: str, app: ASGIApp, requests: int, courses: int) -> float:
+    scopes = [_scope(f"/lessons/{i}") for i in range(courses)]
+    statuses: list[int] = []
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    for scope in scopes:  # warm up (and fill the header cache)
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for i in range(requests):
+        await app(dict(scopes[i % courses]), receive, send)
+    per_request = (time.perf_counter() - start) / requests
+    assert set(statuses) == {402}, set(statuses)
+    print(
+        f"{name:<8} {per_request * 1e6:>8.1f} us/402 {1 / per_request:>10,.0f} 402/s"
+    )
+    return per_request
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--courses", type=int, default=50)
+    args = parser.parse_args()
+
+    rebuild = await _measure(
+        "rebuild", _app(_rebuild_handler, args.courses), args.requests, args.courses
+    )
+    cached = await _measure(
+        "cached",
+        _app(_payment_required_handler, args.courses),
+        args.requests,
+        args.courses,
+    )
+    print(f"{'':<8} {rebuild / cached:>8.2f}x throughput")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,4 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
@@ -17,27 +18,70 @@ from src.course.models import (  # noqa: F401
     Quiz,
     QuizAnswer,
 )
+from src.x402.models import X402Settlement  # noqa: F401
 
 from src.auth.router import auth_router, router as user_router
 from src.course.router import (
     course_router,
+    lesson_answer_router,
     lesson_detail_router,
     lesson_router,
     progress_router,
     purchase_router,
     quiz_answer_router,
+    quiz_detail_router,
     quiz_router,
 )
+from src.auth import verifier
+from src.auth.revocation import revocations
+from src.config import settings
+from src.course.analytics import run_refresher
+from src.course.service import purge_deleted_courses
+from src.instrumentation import SQLInstrumentationMiddleware
+from src.migrations import ensure_schema
+from src.replica import LAST_WRITE_HEADER, ReadYourWritesMiddleware
+from src.x402.finality import run_finality_confirmer
 from src.x402.middleware import add_x402_support
+from src.x402.router import settlement_router
+from src.x402.settlements import run_settlement_worker
 
 SQLModel.metadata.schema = "public"
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+    await ensure_schema(engine, auto_migrate=settings.DB_AUTO_MIGRATE)
+    verifier.start_pool()
+    # Course purges interrupted by a restart
+    purge_sweep = asyncio.create_task(purge_deleted_courses())
+    await revocations.rebuild()
+    revocation_sync = asyncio.create_task(revocations.run())
+    settlement_workers = [
+        asyncio.create_task(
+            run_settlement_worker(engine, settings.X402_SETTLEMENT_POLL_INTERVAL)
+        )
+        for _ in range(settings.X402_SETTLEMENT_WORKERS)
+    ]
+    confirmer = None
+    if settings.X402_BEST_BLOCK_ACCEPTANCE:
+        confirmer = asyncio.create_task(
+            run_finality_confirmer(engine, settings.X402_FINALITY_POLL_INTERVAL)
+        )
+    refresher = None
+    if settings.ANALYTICS_REFRESH_INTERVAL > 0:
+        refresher = asyncio.create_task(
+            run_refresher(engine, settings.ANALYTICS_REFRESH_INTERVAL)
+        )
     yield
+    if refresher is not None:
+        refresher.cancel()
+    if confirmer is not None:
+        confirmer.cancel()
+    revocation_sync.cancel()
+    for worker in settlement_workers:
+        worker.cancel()
+    purge_sweep.cancel()
+    verifier.shutdown_pool()
 
 
 app = FastAPI(
@@ -57,12 +101,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["PAYMENT-REQUIRED", "PAYMENT-RESPONSE"],
+    expose_headers=[
+        "PAYMENT-REQUIRED",
+        "PAYMENT-RESPONSE",
+        "X-Next-Cursor",
+        LAST_WRITE_HEADER,
+        "Server-Timing",
+    ],
 )
 
 # x402 protocol support (exception handler + PAYMENT-SIGNATURE middleware)
 add_x402_support(app)
 
+# Read-your-writes tokens for replica routing; outside the x402 middleware
+# so a purchase it records sends the rest of the request to the primary
+if settings.DATABASE_READ_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Outermost, so statements run by the x402 middleware count as well
+app.add_middleware(SQLInstrumentationMiddleware)
+
 # Auth domain
 app.include_router(auth_router)  # /auth/* (challenge, login, register, refresh, me)
 app.include_router(user_router)  # /users/* (list, get by wallet, update, delete)
@@ -72,6 +130,11 @@ app.include_router(course_router)
 app.include_router(lesson_router)
 app.include_router(lesson_detail_router)
 app.include_router(quiz_router)
+app.include_router(quiz_detail_router)
 app.include_router(quiz_answer_router)
+app.include_router(lesson_answer_router)
 app.include_router(progress_router)
 app.include_router(purchase_router)
+
+# x402 asynchronous settlement status
+app.include_router(settlement_router)
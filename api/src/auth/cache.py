@@ -0,0 +1,62 @@
+"""Short-lived per-process cache of users for request authentication.
+
+Every authenticated request resolves its JWT ``sub`` to a user; caching
+that lookup for ``AUTH_USER_CACHE_TTL`` seconds lets most requests skip the
+``user`` table.  ``update_user`` and ``delete_user`` invalidate the entry in
+the worker that handled them; other workers see the change once their
+entry expires, so the TTL bounds how long a role change or deletion can go
+unnoticed.
+
+Cached users are detached snapshots (a fresh ``User`` per hit): read them,
+but load the user through a session before modifying it.
+"""
+
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from src.auth.models import User
+from src.config import settings
+
+_COLUMNS = tuple(User.__table__.columns.keys())  # type: ignore[attr-defined]
+
+
+class UserCache:
+    """Bounded TTL cache of user snapshots keyed by user ID."""
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[uuid.UUID, tuple[dict[str, Any], float]] = (
+            OrderedDict()
+        )
+
+    def get(self, user_id: uuid.UUID) -> User | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        values, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        return User(**values)
+
+    def put(self, user: User) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries.pop(user.id, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        values = {column: getattr(user, column) for column in _COLUMNS}
+        self._entries[user.id] = (values, time.monotonic() + self.ttl)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        self._entries.pop(user_id, None)
+
+
+user_cache = UserCache(
+    settings.AUTH_USER_CACHE_TTL, settings.AUTH_USER_CACHE_MAX_ENTRIES
+)
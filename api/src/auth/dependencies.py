@@ -17,11 +17,13 @@ from src.auth.exceptions import (
 )
 from src.auth.jwt import decode_token
 from src.auth.models import User
-from src.database import get_session
+from src.auth.revocation import revocations
+from src.config import settings
+from src.database import get_read_session, get_session
 from src.models import Role
 
 # Optional bearer – returns None when no token is provided
-_bearer_scheme = HTTPBearer(auto_error=False)
+bearer_scheme = HTTPBearer(auto_error=False)
 
 
 async def valid_user_id(
@@ -35,7 +37,7 @@ async def valid_user_id(
 
 
 async def valid_wallet_address(
-    wallet_address: str, session: AsyncSession = Depends(get_session)
+    wallet_address: str, session: AsyncSession = Depends(get_read_session)
 ) -> User:
     """Validate that a user with the given wallet address exists and return it."""
     user = await service.get_user_by_wallet(session, wallet_address)
@@ -49,14 +51,10 @@ async def valid_wallet_address(
 # ---------------------------------------------------------------------------
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
-    session: AsyncSession = Depends(get_session),
-) -> User:
-    """Extract and validate the JWT Bearer token, returning the authenticated user.
-
-    Raises 401 if the token is missing, expired, or invalid.
-    """
+async def _access_token_payload(
+    credentials: HTTPAuthorizationCredentials | None,
+) -> dict:
+    """Decode and validate an access token, raising 401 on any problem."""
     if credentials is None:
         raise InvalidCredentials("Authentication required.")
 
@@ -70,19 +68,74 @@ async def get_current_user(
     if payload.get("type") != "access":
         raise InvalidCredentials("Invalid token type.")
 
-    user_id = payload.get("sub")
-    if not user_id:
+    if not payload.get("sub"):
         raise InvalidCredentials("Invalid token payload.")
 
-    user = await service.get_user_by_id(session, uuid.UUID(user_id))
+    if await revocations.is_revoked(payload.get("jti")):
+        raise InvalidCredentials("Token has been revoked.")
+
+    return payload
+
+
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    session: AsyncSession = Depends(get_session),
+) -> User:
+    """Extract and validate the JWT Bearer token, returning the authenticated user.
+
+    The user comes from the short-TTL user cache when possible, so treat it
+    as read-only.  Raises 401 if the token is missing, expired, or invalid.
+    """
+    payload = await _access_token_payload(credentials)
+    try:
+        user_id = uuid.UUID(payload["sub"])
+    except ValueError:
+        raise InvalidCredentials("Invalid token payload.")
+
+    user = await service.get_user_by_id_cached(session, user_id)
     if not user:
         raise InvalidCredentials("User no longer exists.")
 
     return user
 
 
+async def get_token_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> User:
+    """The authenticated user as described by the access token's claims.
+
+    No database access: the returned ``User`` is built from the signed
+    ``sub``/``wallet``/``role`` claims only (``display_name`` is empty), so
+    a role change or deletion takes effect when the token expires.
+    """
+    payload = await _access_token_payload(credentials)
+    try:
+        return User(
+            id=uuid.UUID(payload["sub"]),
+            wallet_address=payload["wallet"],
+            role=Role(payload["role"]),
+            display_name="",
+        )
+    except (KeyError, ValueError):
+        raise InvalidCredentials("Invalid token payload.")
+
+
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+) -> uuid.UUID:
+    """The access token's subject, without loading the user.
+
+    For long-lived requests that must not keep a session open.
+    """
+    payload = await _access_token_payload(credentials)
+    try:
+        return uuid.UUID(payload["sub"])
+    except ValueError:
+        raise InvalidCredentials("Invalid token payload.")
+
+
 async def get_optional_user(
-    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer_scheme),
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
     session: AsyncSession = Depends(get_session),
 ) -> User | None:
     """Same as ``get_current_user`` but returns ``None`` when no token is
@@ -97,9 +150,16 @@ async def get_optional_user(
 
 
 def require_role(required_role: Role):
-    """Factory that returns a dependency checking the user has *required_role*."""
+    """Factory that returns a dependency checking the user has *required_role*.
+
+    With ``AUTH_TRUST_ROLE_CLAIM`` the check uses the token's ``role`` claim
+    and the dependency yields a claims-only user (see ``get_token_user``).
+    """
+    current_user = (
+        get_token_user if settings.AUTH_TRUST_ROLE_CLAIM else get_current_user
+    )
 
-    async def _check(user: User = Depends(get_current_user)) -> User:
+    async def _check(user: User = Depends(current_user)) -> User:
         if user.role != required_role:
             raise InsufficientPermissions(
                 f"This action requires the {required_role.value} role."
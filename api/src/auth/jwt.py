@@ -22,6 +22,7 @@ def create_access_token(
         "wallet": wallet_address,
         "role": role,
         "type": "access",
+        "jti": uuid.uuid4().hex,
         "iat": now,
         "exp": now + timedelta(minutes=settings.JWT_ACCESS_TOKEN_TTL),
     }
@@ -36,6 +37,7 @@ def create_refresh_token(user_id: uuid.UUID) -> str:
     payload = {
         "sub": str(user_id),
         "type": "refresh",
+        "jti": uuid.uuid4().hex,
         "iat": now,
         "exp": now + timedelta(minutes=settings.JWT_REFRESH_TOKEN_TTL),
     }
@@ -14,6 +14,10 @@ if TYPE_CHECKING:
 
 class User(SQLModel, table=True):
     __tablename__ = "user"  # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination over (created_at, id)
+        sa.Index("user_created_at_id_idx", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -43,3 +47,35 @@ class User(SQLModel, table=True):
     payback_transactions: List["PaybackTransaction"] = Relationship(
         back_populates="user"
     )
+
+
+class AuthChallenge(SQLModel, table=True):
+    """Pending login challenge (``AUTH_NONCE_STORE=postgres``)."""
+
+    __tablename__ = "auth_challenge"  # type: ignore[assignment]
+
+    address: str = Field(sa_column=sa.Column(sa.Text, primary_key=True))
+    nonce: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
+    expires_at: datetime = Field(
+        sa_column=sa.Column(sa.DateTime(timezone=True), nullable=False, index=True)
+    )
+
+
+class RevokedToken(SQLModel, table=True):
+    """Revoked JWT, kept until the token would have expired (``jti`` claim)."""
+
+    __tablename__ = "revoked_token"  # type: ignore[assignment]
+
+    jti: str = Field(sa_column=sa.Column(sa.Text, primary_key=True))
+    expires_at: datetime = Field(
+        sa_column=sa.Column(sa.DateTime(timezone=True), nullable=False, index=True)
+    )
+    revoked_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            index=True,
+        ),
+    )
@@ -0,0 +1,137 @@
+"""Storage for login challenge nonces.
+
+A nonce is issued by ``/auth/challenge`` and consumed by the next
+``/auth/login`` or ``/auth/register`` for the same address; it is valid for
+``AUTH_NONCE_TTL`` seconds and can be used once.  Two stores are available
+(``AUTH_NONCE_STORE``):
+
+* ``memory`` — per-process and bounded: expired entries are swept on every
+  write and at most ``AUTH_NONCE_MAX_ENTRIES`` are kept (the oldest challenge
+  is dropped first).  Only correct with a single worker, since the login
+  must reach the process that issued the challenge.
+* ``postgres`` — the ``auth_challenge`` table, shared by all workers.
+  Expired rows are deleted in bulk at most once per TTL.
+"""
+
+from __future__ import annotations
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.auth.models import AuthChallenge
+from src.config import Config, settings
+
+_challenge: sa.Table = AuthChallenge.__table__  # type: ignore[attr-defined]
+
+
+class NonceStore(ABC):
+    """Single-use, expiring challenge nonces keyed by wallet address."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+
+    @abstractmethod
+    async def put(self, address: str, nonce: str) -> None:
+        """Store *nonce* for *address*, replacing any previous challenge."""
+
+    @abstractmethod
+    async def take(self, address: str) -> str | None:
+        """Remove and return the live nonce for *address*, if any."""
+
+
+class MemoryNonceStore(NonceStore):
+    """Bounded in-process store.
+
+    The TTL is the same for every entry, so insertion order is expiry
+    order: the ``OrderedDict`` doubles as the expiry queue, and sweeping
+    only ever looks at its head.  Every operation is amortised O(1).
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        super().__init__(ttl)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sweep(self, now: float) -> None:
+        entries = self._entries
+        while entries:
+            _, expires_at = next(iter(entries.values()))
+            if expires_at > now:
+                break
+            entries.popitem(last=False)
+
+    async def put(self, address: str, nonce: str) -> None:
+        now = time.monotonic()
+        self._sweep(now)
+        self._entries.pop(address, None)
+        while len(self._entries) >= self.max_entries:
+            self._entries.popitem(last=False)
+        self._entries[address] = (nonce, now + self.ttl)
+
+    async def take(self, address: str) -> str | None:
+        stored = self._entries.pop(address, None)
+        if stored is None or stored[1] <= time.monotonic():
+            return None
+        return stored[0]
+
+
+class PostgresNonceStore(NonceStore):
+    """Store shared by every worker, in the ``auth_challenge`` table."""
+
+    def __init__(self, engine: AsyncEngine, ttl: float) -> None:
+        super().__init__(ttl)
+        self._engine = engine
+        self._last_sweep = 0.0
+
+    async def put(self, address: str, nonce: str) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        statement = insert(_challenge).values(
+            address=address, nonce=nonce, expires_at=expires_at
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[_challenge.c.address],
+            set_={"nonce": nonce, "expires_at": expires_at},
+        )
+        async with self._engine.begin() as conn:
+            await conn.execute(statement)
+            if time.monotonic() - self._last_sweep >= self.ttl:
+                self._last_sweep = time.monotonic()
+                await conn.execute(
+                    sa.delete(_challenge).where(
+                        _challenge.c.expires_at <= sa.func.now()
+                    )
+                )
+
+    async def take(self, address: str) -> str | None:
+        # DELETE ... RETURNING: a nonce can be consumed by one request only
+        async with self._engine.begin() as conn:
+            row = (
+                await conn.execute(
+                    sa.delete(_challenge)
+                    .where(_challenge.c.address == address)
+                    .returning(
+                        _challenge.c.nonce, _challenge.c.expires_at > sa.func.now()
+                    )
+                )
+            ).first()
+        if row is None or not row[1]:
+            return None
+        return row[0]
+
+
+def create_nonce_store(config: Config = settings) -> NonceStore:
+    """The store selected by ``AUTH_NONCE_STORE``."""
+    if config.AUTH_NONCE_STORE == "postgres":
+        from src.database import engine
+
+        return PostgresNonceStore(engine, config.AUTH_NONCE_TTL)
+    return MemoryNonceStore(config.AUTH_NONCE_TTL, config.AUTH_NONCE_MAX_ENTRIES)
@@ -0,0 +1,229 @@
+"""Revocation of access and refresh tokens.
+
+Tokens carry a random ``jti``.  Revoking one inserts it into
+``revoked_token`` (kept until the token would have expired anyway) and
+sends ``NOTIFY token_revoked`` with the ``jti``.  Each worker mirrors the
+live revocations in a Bloom filter, so checking a token that was not
+revoked — nearly every check — is one in-memory probe.  A filter hit is
+confirmed against the table, which also absorbs the filter's false
+positives (``AUTH_REVOCATION_ERROR_RATE``).
+
+The mirror is kept current by ``LISTEN`` on a dedicated connection (asyncpg
+and psycopg) and, for notifications missed while that connection was down
+or with other drivers, by polling for recent revocations every
+``AUTH_REVOCATION_SYNC_INTERVAL`` seconds.  A Bloom filter cannot drop
+entries, so it is rebuilt from the table hourly (expired revocations are
+deleted then) and whenever it outgrows its capacity.
+
+Tokens issued without a ``jti`` cannot be revoked; they simply expire.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.auth.models import RevokedToken
+from src.config import settings
+from src.database import engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "token_revoked"
+
+_revoked: sa.Table = RevokedToken.__table__  # type: ignore[attr-defined]
+
+# Polls re-read this much history, so rows committed by transactions that
+# started before the previous poll are not missed
+_SYNC_OVERLAP = 60.0
+_REBUILD_INTERVAL = 3600.0
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings (double hashing over BLAKE2b)."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        # Optimal bit count and hash count for the target false-positive rate
+        bits_per_key = -math.log(error_rate) / math.log(2) ** 2
+        self.size = math.ceil(self.capacity * bits_per_key)
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationList:
+    """Per-worker mirror of ``revoked_token``."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+    ) -> None:
+        self._engine = engine
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._filter = BloomFilter(capacity, error_rate)
+        self._synced_at: datetime | None = None
+        self._rebuilt_at = -math.inf
+
+    def _add(self, jti: str) -> None:
+        self._filter.add(jti)
+        if self._filter.count > self._filter.capacity:
+            # Saturated: rebuild (at a larger size) on the next sync
+            self._rebuilt_at = -math.inf
+
+    # -- checking -----------------------------------------------------------
+
+    async def is_revoked(self, jti: Any) -> bool:
+        """Whether the token with this ``jti`` claim has been revoked."""
+        if not isinstance(jti, str) or jti not in self._filter:
+            return False
+        async with self._engine.connect() as conn:
+            row = await conn.scalar(
+                sa.select(sa.literal(1)).where(
+                    _revoked.c.jti == jti, _revoked.c.expires_at > sa.func.now()
+                )
+            )
+        return row is not None
+
+    # -- revoking -----------------------------------------------------------
+
+    async def revoke(self, session: AsyncSession, claims: dict[str, Any]) -> None:
+        """Revoke the token with the given (already validated) *claims*."""
+        jti = claims.get("jti")
+        if not isinstance(jti, str) or "exp" not in claims:
+            return
+        expires_at = datetime.fromtimestamp(claims["exp"], tz=timezone.utc)
+        await session.exec(
+            insert(_revoked)  # type: ignore[call-overload]
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing()
+        )
+        # Delivered to the listeners when the transaction commits
+        await session.exec(
+            sa.select(sa.func.pg_notify(CHANNEL, jti))  # type: ignore[call-overload]
+        )
+        await session.commit()
+        self._add(jti)
+
+    # -- syncing ------------------------------------------------------------
+
+    async def rebuild(self) -> None:
+        """Reload the filter from the table, dropping expired revocations."""
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                sa.delete(_revoked).where(_revoked.c.expires_at <= sa.func.now())
+            )
+            synced_at = await conn.scalar(sa.select(sa.func.now()))
+            jtis = (await conn.scalars(sa.select(_revoked.c.jti))).all()
+        self._filter = BloomFilter(max(self.capacity, 2 * len(jtis)), self.error_rate)
+        for jti in jtis:
+            self._filter.add(jti)
+        self._synced_at = synced_at
+        self._rebuilt_at = time.monotonic()
+
+    async def sync(self) -> None:
+        """Add revocations made since the last sync (or rebuild when due)."""
+        if (
+            self._synced_at is None
+            or time.monotonic() - self._rebuilt_at >= _REBUILD_INTERVAL
+        ):
+            await self.rebuild()
+            return
+        async with self._engine.connect() as conn:
+            synced_at = await conn.scalar(sa.select(sa.func.now()))
+            jtis = await conn.scalars(
+                sa.select(_revoked.c.jti).where(
+                    _revoked.c.revoked_at
+                    >= self._synced_at - timedelta(seconds=_SYNC_OVERLAP)
+                )
+            )
+            for jti in jtis:
+                self._add(jti)
+        self._synced_at = synced_at
+
+    async def _listen_on(self, conn: AsyncConnection) -> None:
+        raw = (await conn.get_raw_connection()).driver_connection
+        if hasattr(raw, "add_listener"):  # asyncpg
+            queue: asyncio.Queue[str | None] = asyncio.Queue()
+            await raw.add_listener(CHANNEL, lambda *args: queue.put_nowait(args[-1]))
+            raw.add_termination_listener(lambda *args: queue.put_nowait(None))
+            await self.sync()
+            while (jti := await queue.get()) is not None:
+                self._add(jti)
+            raise ConnectionError("Notification connection closed.")
+        if hasattr(raw, "notifies"):  # psycopg
+            await raw.execute(f"LISTEN {CHANNEL}")
+            await raw.commit()
+            await self.sync()
+            async for notify in raw.notifies():
+                self._add(notify.payload)
+            raise ConnectionError("Notification connection closed.")
+        logger.info("No LISTEN support for this driver; polling revocations only.")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._engine.connect() as conn:
+                    try:
+                        await self._listen_on(conn)
+                        return
+                    finally:
+                        # Never hand a LISTENing connection back to the pool
+                        await conn.invalidate()
+            except Exception:
+                logger.warning("Token revocation listener failed.", exc_info=True)
+            await asyncio.sleep(self.sync_interval)
+
+    async def run(self) -> None:
+        """Keep the filter in sync until cancelled."""
+        listener = asyncio.create_task(self._listen())
+        try:
+            while True:
+                await asyncio.sleep(self.sync_interval)
+                try:
+                    await self.sync()
+                except Exception:
+                    logger.exception("Token revocation sync failed.")
+        finally:
+            listener.cancel()
+
+
+revocations = RevocationList(
+    engine,
+    settings.AUTH_REVOCATION_CAPACITY,
+    settings.AUTH_REVOCATION_ERROR_RATE,
+    settings.AUTH_REVOCATION_SYNC_INTERVAL,
+)
@@ -1,10 +1,17 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Query, status
+import jwt
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth import service
-from src.auth.dependencies import get_current_user, valid_user_id, valid_wallet_address
+from src.auth.dependencies import (
+    bearer_scheme,
+    get_current_user,
+    valid_user_id,
+    valid_wallet_address,
+)
 from src.auth.exceptions import (
     InsufficientPermissions,
     InvalidCredentials,
@@ -12,6 +19,7 @@ from src.auth.exceptions import (
 )
 from src.auth.jwt import create_access_token, create_refresh_token, decode_token
 from src.auth.models import User
+from src.auth.revocation import revocations
 from src.auth.schemas import (
     AuthResponse,
     AuthTokens,
@@ -25,7 +33,8 @@ from src.auth.schemas import (
     UserUpdate,
 )
 from src.auth.signature import generate_challenge, verify_signature
-from src.database import get_session
+from src.database import get_read_session, get_session
+from src.pagination import NEXT_CURSOR_HEADER, set_next_cursor
 
 router = APIRouter(prefix="/users", tags=["Users"])
 auth_router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -46,7 +55,7 @@ auth_router = APIRouter(prefix="/auth", tags=["Auth"])
     },
 )
 async def request_challenge(data: ChallengeRequest) -> ChallengeResponse:
-    nonce = generate_challenge(data.address)
+    nonce = await generate_challenge(data.address)
     return ChallengeResponse(nonce=nonce)
 
 
@@ -68,7 +77,7 @@ async def login(
     data: LoginRequest,
     session: AsyncSession = Depends(get_session),
 ) -> AuthResponse:
-    if not verify_signature(data.address, data.message, data.signature):
+    if not await verify_signature(data.address, data.message, data.signature):
         raise InvalidCredentials("Signature verification failed.")
 
     user = await service.get_user_by_wallet(session, data.address)
@@ -103,7 +112,7 @@ async def register(
     data: RegisterRequest,
     session: AsyncSession = Depends(get_session),
 ) -> AuthResponse:
-    if not verify_signature(data.address, data.message, data.signature):
+    if not await verify_signature(data.address, data.message, data.signature):
         raise InvalidCredentials("Signature verification failed.")
 
     existing = await service.get_user_by_wallet(session, data.address)
@@ -143,18 +152,19 @@ async def refresh_tokens(
     data: RefreshRequest,
     session: AsyncSession = Depends(get_session),
 ) -> RefreshResponse:
-    import jwt as pyjwt
-
     try:
         payload = decode_token(data.refresh_token)
-    except pyjwt.ExpiredSignatureError:
+    except jwt.ExpiredSignatureError:
         raise InvalidCredentials("Refresh token has expired.")
-    except pyjwt.InvalidTokenError:
+    except jwt.InvalidTokenError:
         raise InvalidCredentials("Invalid refresh token.")
 
     if payload.get("type") != "refresh":
         raise InvalidCredentials("Invalid token type.")
 
+    if await revocations.is_revoked(payload.get("jti")):
+        raise InvalidCredentials("Refresh token has been revoked.")
+
     user_id = payload.get("sub")
     if not user_id:
         raise InvalidCredentials("Invalid token payload.")
@@ -169,6 +179,39 @@ async def refresh_tokens(
     )
 
 
+@auth_router.post(
+    "/logout",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Revoke JWT tokens",
+    description=(
+        "Revoke the given refresh token and, when sent as a Bearer token, the "
+        "access token. Revoked tokens are rejected until they expire."
+    ),
+    responses={
+        status.HTTP_204_NO_CONTENT: {"description": "Tokens revoked."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Invalid refresh token."},
+    },
+)
+async def logout(
+    data: RefreshRequest,
+    credentials: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
+    session: AsyncSession = Depends(get_session),
+) -> None:
+    tokens = [(data.refresh_token, "refresh")]
+    if credentials is not None:
+        tokens.append((credentials.credentials, "access"))
+    for token, token_type in tokens:
+        try:
+            payload = decode_token(token)
+        except jwt.ExpiredSignatureError:
+            continue  # nothing left to revoke
+        except jwt.InvalidTokenError:
+            raise InvalidCredentials(f"Invalid {token_type} token.")
+        if payload.get("type") != token_type:
+            raise InvalidCredentials("Invalid token type.")
+        await revocations.revoke(session, payload)
+
+
 @auth_router.get(
     "/me",
     response_model=UserResponse,
@@ -192,21 +235,38 @@ async def get_me(user: User = Depends(get_current_user)) -> User:
     "",
     response_model=list[UserResponse],
     summary="List all users",
-    description="Retrieve a paginated list of all registered users.",
+    description=(
+        "Retrieve a paginated list of all registered users, ordered by "
+        "registration time. Supports offset or cursor pagination."
+    ),
     responses={
         status.HTTP_200_OK: {
             "description": "A list of users returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
         },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
     },
 )
 async def list_users(
-    session: AsyncSession = Depends(get_session),
+    response: Response,
+    session: AsyncSession = Depends(get_read_session),
     offset: int = Query(default=0, ge=0, description="Number of records to skip."),
     limit: int = Query(
         default=100, ge=1, le=1000, description="Maximum number of records to return."
     ),
+    cursor: str | None = Query(
+        default=None,
+        description=(
+            "Opaque cursor from the previous page's ``X-Next-Cursor`` header. "
+            "When given, ``offset`` is ignored."
+        ),
+    ),
 ) -> list[User]:
-    return await service.get_users(session, offset=offset, limit=limit)
+    users = await service.get_users(session, offset=offset, limit=limit, cursor=cursor)
+    set_next_cursor(response, users, limit, lambda u: (u.created_at, u.id))
+    return users
 
 
 @router.get(
@@ -1,17 +1,36 @@
 import uuid
+from datetime import datetime
 
 from pydantic import UUID4
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
+from src.auth.cache import user_cache
 from src.auth.models import User
 from src.auth.schemas import UserCreate, UserUpdate
+from src.pagination import paginate
 
 
 async def get_users(
-    session: AsyncSession, *, offset: int = 0, limit: int = 100
+    session: AsyncSession,
+    *,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
 ) -> list[User]:
-    result = await session.exec(select(User).offset(offset).limit(limit))
+    """List users ordered by ``(created_at, id)``.
+
+    When *cursor* is given, *offset* is ignored.
+    """
+    statement = paginate(
+        select(User).order_by(User.created_at, User.id),  # type: ignore[arg-type]
+        (User.created_at, User.id),
+        (datetime, uuid.UUID),
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    result = await session.exec(statement)
     return list(result.all())
 
 
@@ -19,6 +38,21 @@ async def get_user_by_id(session: AsyncSession, user_id: UUID4) -> User | None:
     return await session.get(User, user_id)
 
 
+async def get_user_by_id_cached(
+    session: AsyncSession, user_id: uuid.UUID
+) -> User | None:
+    """``get_user_by_id`` through the short-TTL user cache.
+
+    Returns a detached snapshot; do not modify it (see ``src.auth.cache``).
+    """
+    user = user_cache.get(user_id)
+    if user is None:
+        user = await session.get(User, user_id)
+        if user is not None:
+            user_cache.put(user)
+    return user
+
+
 async def get_user_by_wallet(session: AsyncSession, wallet_address: str) -> User | None:
     result = await session.exec(
         select(User).where(User.wallet_address == wallet_address)  # type: ignore[arg-type]
@@ -45,6 +79,7 @@ async def update_user(session: AsyncSession, user: User, data: UserUpdate) -> Us
         setattr(user, key, value)
     session.add(user)
     await session.commit()
+    user_cache.invalidate(user.id)
     await session.refresh(user)
     return user
 
@@ -52,3 +87,4 @@ async def update_user(session: AsyncSession, user: User, data: UserUpdate) -> Us
 async def delete_user(session: AsyncSession, user: User) -> None:
     await session.delete(user)
     await session.commit()
+    user_cache.invalidate(user.id)
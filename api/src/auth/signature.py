@@ -4,7 +4,8 @@ Flow:
 1. Client requests a challenge nonce for their wallet address.
 2. Client signs the nonce with their wallet extension (sr25519).
 3. Client sends ``(address, nonce, signature)`` back.
-4. Server verifies the signature using ``substrate-interface``'s Keypair.
+4. Server verifies the signature using ``substrate-interface``'s Keypair,
+   in a worker pool (see ``src.auth.verifier``).
 
 The ``Keypair.verify()`` method automatically handles the ``<Bytes>``
 wrapping that Polkadot.js-compatible extensions apply to ``signRaw``
@@ -15,41 +16,33 @@ from __future__ import annotations
 
 import logging
 import secrets
-import time
 
-from substrateinterface import Keypair
+from src.auth import verifier
+from src.auth.nonces import NonceStore, create_nonce_store
 
 logger = logging.getLogger(__name__)
 
-# In-memory nonce store: address -> (nonce, created_at)
-# For production at scale, use Redis or a DB table.
-_nonces: dict[str, tuple[str, float]] = {}
+# Pending challenges; see src.auth.nonces for the available stores
+nonce_store: NonceStore = create_nonce_store()
 
-NONCE_TTL_SECONDS = 300  # 5 minutes
 
-
-def generate_challenge(address: str) -> str:
+async def generate_challenge(address: str) -> str:
     """Generate a time-limited challenge nonce for *address*."""
     nonce = f"Sign this message to authenticate with Polkadot LearnEarn: {secrets.token_hex(32)}"
-    _nonces[address] = (nonce, time.time())
+    await nonce_store.put(address, nonce)
     return nonce
 
 
-def verify_signature(address: str, message: str, signature: str) -> bool:
+async def verify_signature(address: str, message: str, signature: str) -> bool:
     """Verify that *signature* was produced by *address* signing *message*.
 
     Returns ``True`` if valid, ``False`` otherwise.
     Also consumes (invalidates) the nonce so it cannot be reused.
     """
-    # Check nonce exists and hasn't expired
-    stored = _nonces.pop(address, None)
-    if stored is None:
-        logger.warning("No challenge found for address %s", address)
-        return False
-
-    stored_nonce, created_at = stored
-    if time.time() - created_at > NONCE_TTL_SECONDS:
-        logger.warning("Challenge expired for address %s", address)
+    # Check a live (unexpired) nonce exists; taking it makes it single-use
+    stored_nonce = await nonce_store.take(address)
+    if stored_nonce is None:
+        logger.warning("No live challenge found for address %s", address)
         return False
 
     if stored_nonce != message:
@@ -57,9 +50,4 @@ def verify_signature(address: str, message: str, signature: str) -> bool:
         return False
 
     # Cryptographic verification
-    try:
-        keypair = Keypair(ss58_address=address)
-        return keypair.verify(data=message, signature=signature)
-    except Exception:
-        logger.exception("Signature verification error for %s", address)
-        return False
+    return await verifier.verify(address, message, signature)
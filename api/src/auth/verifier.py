@@ -0,0 +1,96 @@
+"""sr25519 signature verification off the event loop.
+
+Verifying a signature is pure CPU work in a native extension that holds
+the GIL, so running it inline in ``/auth/login`` stalls every other request
+on the worker, and a thread pool would not run two verifications at once.
+Verification therefore runs in a dedicated pool (``AUTH_SIGNATURE_POOL``):
+
+* ``process`` — a process pool of ``AUTH_SIGNATURE_WORKERS`` workers (0 =
+  one per CPU); the default.
+* ``thread`` — a thread pool; keeps the loop responsive but verifications
+  are serialised by the GIL.
+* ``inline`` — on the event loop, as before (tests, benchmarks).
+
+Decoding an SS58 address to its public key is cached per address
+(``AUTH_PUBLIC_KEY_CACHE_SIZE``) in the API process, and the worker gets
+the decoded key, so repeat logins skip the base58 decode and checksum.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from scalecodec.utils.ss58 import ss58_decode
+from substrateinterface import Keypair
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Executor | None = None
+
+
+@lru_cache(maxsize=settings.AUTH_PUBLIC_KEY_CACHE_SIZE)
+def public_key(address: str) -> bytes:
+    """The sr25519 public key encoded in SS58 *address*.
+
+    Raises ``ValueError`` for a malformed address (failures are not cached).
+    """
+    return bytes.fromhex(ss58_decode(address))
+
+
+def _verify(address: str, key: bytes, message: str, signature: str) -> bool:
+    # Runs in the pool.  Passing both the address and the key skips the
+    # decode/encode that Keypair would otherwise do.
+    try:
+        return Keypair(ss58_address=address, public_key=key).verify(
+            data=message, signature=signature
+        )
+    except Exception:
+        logger.exception("Signature verification error for %s", address)
+        return False
+
+
+def start_pool() -> None:
+    """Create the verification pool (idempotent; done lazily otherwise)."""
+    global _executor
+    if _executor is not None or settings.AUTH_SIGNATURE_POOL == "inline":
+        return
+    workers = settings.AUTH_SIGNATURE_WORKERS or None
+    if settings.AUTH_SIGNATURE_POOL == "process":
+        # spawn: forking a process that runs an event loop is not safe
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    else:
+        _executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sr25519-verify"
+        )
+
+
+def shutdown_pool() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def verify(address: str, message: str, signature: str) -> bool:
+    """Whether *signature* (hex) is *address*'s signature of *message*."""
+    try:
+        key = public_key(address)
+    except ValueError:
+        logger.warning("Invalid SS58 address %s", address)
+        return False
+
+    if settings.AUTH_SIGNATURE_POOL == "inline":
+        return _verify(address, key, message, signature)
+    start_pool()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _executor, _verify, address, key, message, signature
+    )
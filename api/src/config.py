@@ -1,9 +1,33 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
 
 class Config(BaseSettings):
     DATABASE_URL: str = "postgresql+asyncpg://localhost:5432/polkadot_learnearn"
 
+    # Database engine profile.  Each worker process owns one pool, so the
+    # server needs workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    DB_ECHO: bool = False  # log every SQL statement (development only)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 10.0  # seconds to wait for a free connection
+    DB_POOL_PRE_PING: bool = True  # test connections on checkout
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 never recycles
+    DB_STATEMENT_CACHE_SIZE: int = 256  # asyncpg prepared statements; 0 for PgBouncer
+    DB_STATEMENT_TIMEOUT: int = 15000  # milliseconds; 0 disables
+    DB_QUERY_BUDGET: int = 30  # SQL statements per request before warning; 0 disables
+    DB_QUERY_BUDGET_ENFORCE: bool = False  # raise instead of warning (tests)
+    DB_N_PLUS_ONE_THRESHOLD: int = 5  # identical statements per request to flag
+    DB_SERVER_TIMING: bool = True  # add a Server-Timing header with DB totals
+    DB_AUTO_MIGRATE: bool = True  # apply pending migrations on startup
+
+    # Optional read replica for read-only endpoints ("" = use the primary)
+    DATABASE_READ_URL: str = ""
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 2.0  # seconds between lag checks
+    DB_REPLICA_LAG_MARGIN: float = 1.0  # extra seconds a client reads its own writes
+    DB_REPLICA_MAX_LAG: float = 30.0  # seconds; beyond this all reads use the primary
+
     # AI settings
     AI_PROVIDER: str = "gemini"
     AI_MODEL: str = "gemini-2.5-flash"
@@ -22,6 +46,32 @@ class Config(BaseSettings):
     JWT_REFRESH_TOKEN_TTL: int = 10080  # minutes (7 days)
     JWT_ALGORITHM: str = "HS256"
 
+    # Login challenge nonces: "memory" (per worker, bounded) or "postgres"
+    # (shared; required when running more than one worker)
+    AUTH_NONCE_STORE: Literal["memory", "postgres"] = "memory"
+    AUTH_NONCE_TTL: int = 300  # seconds
+    AUTH_NONCE_MAX_ENTRIES: int = 100_000  # memory store only
+
+    # Authenticated users are cached per worker for this many seconds
+    # (0 = look the user up on every request)
+    AUTH_USER_CACHE_TTL: float = 30.0
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10_000
+    # Let require_role() trust the signed "role" claim instead of loading the
+    # user: role changes and deletions then apply when the access token expires
+    AUTH_TRUST_ROLE_CLAIM: bool = False
+
+    # sr25519 login signature verification: "process" pool, "thread" pool or
+    # "inline" on the event loop; 0 workers = one per CPU
+    AUTH_SIGNATURE_POOL: Literal["process", "thread", "inline"] = "process"
+    AUTH_SIGNATURE_WORKERS: int = 0
+    AUTH_PUBLIC_KEY_CACHE_SIZE: int = 10_000  # decoded addresses kept
+
+    # Token revocation: per-worker Bloom filter of revoked jti claims, kept in
+    # sync by LISTEN/NOTIFY with polling every AUTH_REVOCATION_SYNC_INTERVAL s
+    AUTH_REVOCATION_CAPACITY: int = 100_000  # filter grows beyond this
+    AUTH_REVOCATION_ERROR_RATE: float = 0.001
+    AUTH_REVOCATION_SYNC_INTERVAL: float = 30.0
+
     # Platform wallet – receives student payments, distributes to teachers
     PLATFORM_WALLET_SEED: str = ""  # 12- or 24-word mnemonic
     PLATFORM_WALLET_ADDRESS: str = ""  # SS58 address (derived or explicit)
@@ -32,6 +82,33 @@ class Config(BaseSettings):
     # Token decimals (Paseo = 10 decimals, 1 PAS = 10^10 planck)
     TOKEN_DECIMALS: int = 10
 
+    # Course deletion: courses with more quiz answers than this are purged
+    # in the background, COURSE_DELETE_BATCH_SIZE answers per transaction
+    COURSE_DELETE_SYNC_MAX_ANSWERS: int = 5000
+    COURSE_DELETE_BATCH_SIZE: int = 5000
+
+    # x402 settlement: "sync" settles before serving the paid request; "async"
+    # queues it and answers 202 with a status URL (clients may also ask with
+    # "Prefer: respond-async").  0 workers per process disables async mode.
+    X402_SETTLEMENT_MODE: Literal["sync", "async"] = "sync"
+    X402_SETTLEMENT_WORKERS: int = 2
+    X402_SETTLEMENT_POLL_INTERVAL: float = 5.0  # idle worker re-check, seconds
+    X402_SETTLEMENT_TIMEOUT: float = 300.0  # stop retrying after, seconds
+    X402_SETTLEMENT_MAX_WAIT: float = 25.0  # longest status long-poll, seconds
+    X402_PAYMENT_REQUIRED_CACHE_SIZE: int = 4096  # encoded 402 headers kept
+
+    # x402 best-block fast path: a payment found in a best (not yet final)
+    # block is accepted provisionally and unlocks the lesson at once; the
+    # finality confirmer pays the teacher once the block is final, or revokes
+    # the purchase if it is not final after X402_FINALITY_TIMEOUT seconds
+    X402_BEST_BLOCK_ACCEPTANCE: bool = False
+    X402_FINALITY_POLL_INTERVAL: float = 6.0  # about a block, seconds
+    X402_FINALITY_TIMEOUT: float = 300.0
+
+    # Teacher analytics rollups are rebuilt this often, in seconds (0 = never;
+    # run src.course.analytics.refresh_rollups from a scheduler instead)
+    ANALYTICS_REFRESH_INTERVAL: float = 300.0
+
     model_config = {"env_file": ".env"}
 
 
@@ -0,0 +1,331 @@
+"""Teacher analytics: per-course, per-lesson and per-quiz rollups.
+
+Aggregating ``course_purchase``, ``payback_transaction`` and ``quiz_answer``
+on every dashboard view gets slower with every sale and every answer, so
+the numbers are precomputed into ``course_stats``, ``lesson_stats`` and
+``quiz_stats``.  ``refresh_rollups`` rebuilds all three with one set-based
+``INSERT ... SELECT ... ON CONFLICT DO UPDATE`` each; ``run_refresher``
+calls it every ``ANALYTICS_REFRESH_INTERVAL`` seconds from the app
+lifespan of every worker, and whichever worker finds the rollups older
+than that rebuilds them (about one rebuild per interval in all).  Rows of
+deleted courses, lessons and quizzes go away through ``ON DELETE CASCADE``.
+
+Like per-student progress and paybacks, learning stats score each user's
+latest answer to a quiz.
+
+The analytics endpoint reads only these tables (three primary-key or
+``course_id`` lookups), so its cost no longer depends on course size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.course.models import (
+    Course,
+    CoursePurchase,
+    CourseStats,
+    Lesson,
+    LessonStats,
+    PaybackTransaction,
+    Quiz,
+    QuizAnswer,
+    QuizStats,
+)
+from src.course.schemas import (
+    CourseAnalyticsResponse,
+    LessonAnalytics,
+    QuizAnalytics,
+)
+from src.database import NO_STATEMENT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+_course: sa.Table = Course.__table__  # type: ignore[attr-defined]
+_purchase: sa.Table = CoursePurchase.__table__  # type: ignore[attr-defined]
+_payback: sa.Table = PaybackTransaction.__table__  # type: ignore[attr-defined]
+_lesson: sa.Table = Lesson.__table__  # type: ignore[attr-defined]
+_quiz: sa.Table = Quiz.__table__  # type: ignore[attr-defined]
+_answer: sa.Table = QuizAnswer.__table__  # type: ignore[attr-defined]
+_course_stats: sa.Table = CourseStats.__table__  # type: ignore[attr-defined]
+_lesson_stats: sa.Table = LessonStats.__table__  # type: ignore[attr-defined]
+_quiz_stats: sa.Table = QuizStats.__table__  # type: ignore[attr-defined]
+
+# Arbitrary application-wide key: one worker refreshes at a time
+_REFRESH_LOCK_KEY = 0x1EA4_A7A1
+
+PASS_THRESHOLD_PCT = 70
+
+
+# ---------------------------------------------------------------------------
+# Refresh
+# ---------------------------------------------------------------------------
+def _upsert(table: sa.Table, select: sa.Select) -> sa.Insert:
+    """``INSERT INTO table SELECT ...`` that overwrites existing rows."""
+    columns = [c.name for c in select.selected_columns]
+    statement = insert(table).from_select(columns, select)
+    key = [c.name for c in table.primary_key]
+    return statement.on_conflict_do_update(
+        index_elements=key,
+        set_={name: statement.excluded[name] for name in columns if name not in key},
+    )
+
+
+def _course_stats_select() -> sa.Select:
+    purchases = (
+        sa.select(
+            _purchase.c.course_id,
+            sa.func.count().label("purchase_count"),
+            sa.func.count(sa.distinct(_purchase.c.user_id)).label("buyer_count"),
+            sa.func.sum(_purchase.c.amount).label("revenue"),
+            sa.func.sum(_purchase.c.platform_fee_amount).label("platform_fee"),
+            sa.func.sum(_purchase.c.payback_reserve_amount).label("payback_reserve"),
+            sa.func.sum(_purchase.c.teacher_payout_amount).label("teacher_payout"),
+        )
+        .where(_purchase.c.status != "revoked")
+        .group_by(_purchase.c.course_id)
+        .subquery()
+    )
+    paybacks = (
+        sa.select(
+            _payback.c.course_id,
+            sa.func.count().label("payback_count"),
+            sa.func.sum(_payback.c.amount).label("payback_total"),
+        )
+        .group_by(_payback.c.course_id)
+        .subquery()
+    )
+    return sa.select(
+        _course.c.id.label("course_id"),
+        *(
+            sa.func.coalesce(purchases.c[name], 0).label(name)
+            for name in (
+                "purchase_count",
+                "buyer_count",
+                "revenue",
+                "platform_fee",
+                "payback_reserve",
+                "teacher_payout",
+            )
+        ),
+        sa.func.coalesce(paybacks.c.payback_count, 0).label("payback_count"),
+        sa.func.coalesce(paybacks.c.payback_total, 0).label("payback_total"),
+        sa.func.now().label("refreshed_at"),
+    ).select_from(
+        _course.outerjoin(purchases, purchases.c.course_id == _course.c.id).outerjoin(
+            paybacks, paybacks.c.course_id == _course.c.id
+        )
+    )
+
+
+def _latest_answers() -> sa.Subquery:
+    """Each user's latest answer to each quiz."""
+    return (
+        sa.select(_answer.c.quiz_id, _answer.c.user_id, _answer.c.selected_option)
+        .distinct(_answer.c.quiz_id, _answer.c.user_id)
+        .order_by(_answer.c.quiz_id, _answer.c.user_id, _answer.c.created_at.desc())
+        .subquery("latest")
+    )
+
+
+def _lesson_stats_select() -> sa.Select:
+    # A user's answered/correct quizzes per lesson
+    latest = _latest_answers()
+    per_user = (
+        sa.select(
+            _quiz.c.lesson_id,
+            sa.func.count().label("answered"),
+            sa.func.count()
+            .filter(latest.c.selected_option == _quiz.c.correct_option)
+            .label("correct"),
+        )
+        .select_from(latest.join(_quiz, _quiz.c.id == latest.c.quiz_id))
+        .group_by(_quiz.c.lesson_id, latest.c.user_id)
+        .subquery()
+    )
+    questions = (
+        sa.select(_quiz.c.lesson_id, sa.func.count().label("questions"))
+        .group_by(_quiz.c.lesson_id)
+        .subquery()
+    )
+    completed = per_user.c.answered >= questions.c.questions
+    return (
+        sa.select(
+            _lesson.c.id.label("lesson_id"),
+            _lesson.c.course_id,
+            sa.func.count(per_user.c.lesson_id).label("learners"),
+            sa.func.count().filter(completed).label("completed"),
+            sa.func.count()
+            .filter(
+                completed,
+                per_user.c.correct * 100 >= questions.c.questions * PASS_THRESHOLD_PCT,
+            )
+            .label("passed"),
+        )
+        .select_from(
+            _lesson.outerjoin(
+                questions, questions.c.lesson_id == _lesson.c.id
+            ).outerjoin(per_user, per_user.c.lesson_id == _lesson.c.id)
+        )
+        .group_by(_lesson.c.id)
+    )
+
+
+def _quiz_stats_select() -> sa.Select:
+    latest = _latest_answers()
+    return (
+        sa.select(
+            _quiz.c.id.label("quiz_id"),
+            _lesson.c.course_id,
+            sa.func.count(latest.c.user_id).label("answers"),
+            sa.func.count(latest.c.user_id)
+            .filter(latest.c.selected_option == _quiz.c.correct_option)
+            .label("correct"),
+        )
+        .select_from(
+            _quiz.join(_lesson, _lesson.c.id == _quiz.c.lesson_id).outerjoin(
+                latest, latest.c.quiz_id == _quiz.c.id
+            )
+        )
+        .group_by(_quiz.c.id, _lesson.c.course_id)
+    )
+
+
+async def refresh_rollups(
+    conn: AsyncConnection, *, max_age: float | None = None
+) -> bool:
+    """Rebuild all rollup tables in the current transaction.
+
+    Returns ``False`` without doing anything if another worker is already
+    refreshing, or if the rollups were refreshed less than *max_age*
+    seconds ago.
+    """
+    locked = await conn.scalar(
+        sa.text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _REFRESH_LOCK_KEY}
+    )
+    if not locked:
+        return False
+    if max_age is not None:
+        fresh = await conn.scalar(
+            sa.select(
+                sa.func.max(_course_stats.c.refreshed_at)
+                > sa.func.localtimestamp() - timedelta(seconds=max_age)
+            )
+        )
+        if fresh:
+            return False
+    # Full-table aggregates: not bound by the request statement_timeout
+    await conn.execute(NO_STATEMENT_TIMEOUT)
+    await conn.execute(_upsert(_course_stats, _course_stats_select()))
+    await conn.execute(_upsert(_lesson_stats, _lesson_stats_select()))
+    await conn.execute(_upsert(_quiz_stats, _quiz_stats_select()))
+    return True
+
+
+async def run_refresher(engine: AsyncEngine, interval: float) -> None:
+    """Refresh the rollups every *interval* seconds until cancelled."""
+    while True:
+        try:
+            async with engine.begin() as conn:
+                if await refresh_rollups(conn, max_age=interval):
+                    logger.debug("Analytics rollups refreshed.")
+        except Exception:
+            logger.exception("Analytics rollup refresh failed.")
+        await asyncio.sleep(interval)
+
+
+# ---------------------------------------------------------------------------
+# Read
+# ---------------------------------------------------------------------------
+def _share(part: int, whole: int) -> float:
+    return round(part / whole * 100, 1) if whole else 0.0
+
+
+async def get_course_analytics(
+    session: AsyncSession, course_id: uuid.UUID
+) -> CourseAnalyticsResponse:
+    """Precomputed analytics for a course (zeros until the first refresh)."""
+    stats = await session.get(CourseStats, course_id) or CourseStats(
+        course_id=course_id, refreshed_at=None
+    )
+
+    lesson_rows = await session.exec(
+        sa.select(  # type: ignore[call-overload]
+            _lesson.c.id,
+            _lesson.c.title,
+            _lesson.c.lesson_index,
+            _lesson_stats.c.learners,
+            _lesson_stats.c.completed,
+            _lesson_stats.c.passed,
+        )
+        .select_from(
+            _lesson.outerjoin(_lesson_stats, _lesson_stats.c.lesson_id == _lesson.c.id)
+        )
+        .where(_lesson.c.course_id == course_id)
+        .order_by(_lesson.c.lesson_index, _lesson.c.id)
+    )
+    lessons = [
+        LessonAnalytics(
+            lesson_id=lesson_id,
+            title=title,
+            lesson_index=lesson_index,
+            learners=learners or 0,
+            completed=completed or 0,
+            passed=passed or 0,
+            pass_rate=_share(passed or 0, completed or 0),
+        )
+        for lesson_id, title, lesson_index, learners, completed, passed in lesson_rows
+    ]
+
+    quiz_rows = await session.exec(
+        sa.select(  # type: ignore[call-overload]
+            _quiz.c.id,
+            _quiz.c.lesson_id,
+            _quiz.c.question,
+            _quiz.c.quiz_index,
+            _quiz_stats.c.answers,
+            _quiz_stats.c.correct,
+        )
+        .select_from(
+            _quiz.join(_lesson, _lesson.c.id == _quiz.c.lesson_id).outerjoin(
+                _quiz_stats, _quiz_stats.c.quiz_id == _quiz.c.id
+            )
+        )
+        .where(_lesson.c.course_id == course_id)
+        .order_by(_lesson.c.lesson_index, _quiz.c.quiz_index, _quiz.c.id)
+    )
+    quizzes = [
+        QuizAnalytics(
+            quiz_id=quiz_id,
+            lesson_id=lesson_id,
+            question=question,
+            quiz_index=quiz_index,
+            answers=answers or 0,
+            correct=correct or 0,
+            correct_share=_share(correct or 0, answers or 0),
+        )
+        for quiz_id, lesson_id, question, quiz_index, answers, correct in quiz_rows
+    ]
+
+    return CourseAnalyticsResponse(
+        course_id=course_id,
+        refreshed_at=stats.refreshed_at,
+        purchase_count=stats.purchase_count,
+        buyer_count=stats.buyer_count,
+        revenue=stats.revenue,
+        platform_fee=stats.platform_fee,
+        payback_reserve=stats.payback_reserve,
+        teacher_payout=stats.teacher_payout,
+        payback_count=stats.payback_count,
+        payback_total=stats.payback_total,
+        lessons=lessons,
+        quizzes=quizzes,
+    )
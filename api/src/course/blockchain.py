@@ -3,13 +3,24 @@
 Provides helpers to locate a transaction in recent finalized blocks and
 verify that a ``Balances.Transfer`` event with the expected recipient and
 minimum amount exists in the same block.
+
+The x402 best-block fast path looks past the finalized head instead, over
+a read-only ``substrate-interface`` RPC connection: the light client
+only serves finalized blocks.
+
+Every call is blocking (a search may scan ``TX_SEARCH_MAX_BLOCKS`` blocks);
+async callers run light-client calls through ``run_light_client``.
 """
 
 from __future__ import annotations
 
+import asyncio
 import base58
+import functools
 import logging
-from typing import TypedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, ParamSpec, TypedDict, TypeVar
 
 from pypolkadot import LightClient
 
@@ -38,6 +49,25 @@ def get_client() -> LightClient:
     return _client
 
 
+# One thread owns the client: calls never block the event loop, and the
+# client (not known to be thread-safe) is never used concurrently
+_light_client_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="light-client"
+)
+
+_P = ParamSpec("_P")
+_R = TypeVar("_R")
+
+
+async def run_light_client(
+    func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs
+) -> _R:
+    """Run a light-client call such as ``verify_payment`` off the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _light_client_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
 # ---------------------------------------------------------------------------
 # Byte / address helpers (ported from reference implementation)
 # ---------------------------------------------------------------------------
@@ -152,21 +182,38 @@ def verify_payment(
     *min_amount* planck is found, ``None`` otherwise.
     """
     client = get_client()
-    recipient_hex = ss58_to_hex(recipient_ss58)
-    if recipient_hex is None:
-        logger.error("Could not decode recipient SS58 address: %s", recipient_ss58)
-        return None
-
     transfers = client.events(block_hash=block_hash, pallet="Balances", name="Transfer")
     logger.info(
         "Found %d Balances.Transfer events in block %s", len(transfers), block_hash
     )
+    return _matching_transfer(
+        (
+            (
+                bytes_to_hex(t.fields.get("from")),
+                bytes_to_hex(t.fields.get("to")),
+                t.fields.get("amount", 0),
+            )
+            for t in transfers
+        ),
+        block_hash,
+        recipient_ss58,
+        min_amount,
+    )
 
-    for t in transfers:
-        to_hex = bytes_to_hex(t.fields.get("to"))
-        from_hex = bytes_to_hex(t.fields.get("from"))
-        amount: int = t.fields.get("amount", 0)
 
+def _matching_transfer(
+    transfers: Iterable[tuple[str | None, str | None, int]],
+    block_hash: str,
+    recipient_ss58: str,
+    min_amount: int,
+) -> VerifiedPayment | None:
+    """The first ``(from_hex, to_hex, amount)`` transfer paying the recipient."""
+    recipient_hex = ss58_to_hex(recipient_ss58)
+    if recipient_hex is None:
+        logger.error("Could not decode recipient SS58 address: %s", recipient_ss58)
+        return None
+
+    for from_hex, to_hex, amount in transfers:
         if to_hex and to_hex.lower() == recipient_hex.lower() and amount >= min_amount:
             logger.info(
                 "Payment verified: %s -> %s, amount=%d", from_hex, to_hex, amount
@@ -181,3 +228,107 @@ def verify_payment(
 
     logger.info("No matching transfer found in block %s", block_hash)
     return None
+
+
+# ---------------------------------------------------------------------------
+# Best (not yet finalized) blocks — substrate-interface RPC
+# ---------------------------------------------------------------------------
+
+BlockFinality = Literal["finalized", "unfinalized", "orphaned"]
+
+
+def _account_hex(value: object) -> str | None:
+    """An event's account field (hex or SS58) as public key hex."""
+    if isinstance(value, str) and not value.startswith("0x"):
+        return ss58_to_hex(value)
+    return bytes_to_hex(value)
+
+
+def find_unfinalized_tx(tx_hash: str, *, max_blocks: int | None = None) -> str | None:
+    """Search the best chain above the finalized head for a transaction hash.
+
+    Returns the block hash if found, ``None`` otherwise (also when the
+    transaction is already finalized: ``get_block_hash_from_tx`` finds it).
+    """
+    from src.platform.wallet import substrate_session
+
+    if max_blocks is None:
+        max_blocks = settings.TX_SEARCH_MAX_BLOCKS
+    if not tx_hash.startswith("0x"):
+        tx_hash = "0x" + tx_hash
+    tx_hash = tx_hash.lower()
+
+    with substrate_session() as substrate:
+        finalized_number = substrate.get_block_number(
+            substrate.get_chain_finalised_head()
+        )
+        block_hash = substrate.get_chain_head()
+        for _ in range(max_blocks):
+            block = substrate.get_block(
+                block_hash=block_hash, ignore_decoding_errors=True
+            )
+            if block is None or block["header"]["number"] <= finalized_number:
+                break
+            for ext in block["extrinsics"]:
+                if ext is not None and "0x" + ext.extrinsic_hash.hex() == tx_hash:
+                    logger.info(
+                        "Found tx in best block #%d (%s)",
+                        block["header"]["number"],
+                        block_hash,
+                    )
+                    return block_hash
+            block_hash = block["header"]["parentHash"]
+
+    logger.info("Transaction %s not found above the finalized head", tx_hash)
+    return None
+
+
+def verify_unfinalized_payment(
+    block_hash: str, recipient_ss58: str, min_amount: int
+) -> VerifiedPayment | None:
+    """``verify_payment`` for a block the light client cannot serve yet."""
+    from src.platform.wallet import substrate_session
+
+    with substrate_session() as substrate:
+        events = substrate.get_events(block_hash=block_hash)
+
+    transfers = []
+    for event in events:
+        value = event.value
+        if value["module_id"] != "Balances" or value["event_id"] != "Transfer":
+            continue
+        attributes = value["attributes"]
+        if isinstance(attributes, dict):
+            sender, recipient, amount = (
+                attributes.get("from"),
+                attributes.get("to"),
+                attributes.get("amount", 0),
+            )
+        else:  # positional fields on older metadata
+            sender, recipient, amount = attributes
+        transfers.append((_account_hex(sender), _account_hex(recipient), amount))
+    logger.info(
+        "Found %d Balances.Transfer events in best block %s", len(transfers), block_hash
+    )
+    return _matching_transfer(transfers, block_hash, recipient_ss58, min_amount)
+
+
+def block_finality(block_hash: str) -> BlockFinality:
+    """Whether *block_hash* is finalized, still unfinalized, or off the chain.
+
+    ``orphaned``: the node no longer knows the block, or another block was
+    finalized at its height.
+    """
+    from src.platform.wallet import substrate_session
+
+    with substrate_session() as substrate:
+        number = substrate.get_block_number(block_hash)
+        if number is None:
+            return "orphaned"
+        finalized_number = substrate.get_block_number(
+            substrate.get_chain_finalised_head()
+        )
+        if number > finalized_number:
+            return "unfinalized"
+        canonical = substrate.get_block_hash(number)
+    return "finalized" if canonical == block_hash else "orphaned"
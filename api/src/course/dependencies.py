@@ -1,4 +1,7 @@
-from fastapi import Depends
+import uuid
+from dataclasses import dataclass
+
+from fastapi import Depends, Request
 from pydantic import UUID4
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
@@ -14,7 +17,20 @@ from src.course.exceptions import (
     QuizNotFound,
 )
 from src.course.models import Course, CoursePurchase, Lesson, Quiz
-from src.database import get_session
+from src.database import get_read_session, get_session
+
+
+# Request-state key under which X402Middleware leaves a ``LessonAccess``
+LESSON_ACCESS_STATE = "lesson_access"
+
+
+@dataclass(slots=True)
+class LessonAccess:
+    """Lesson access already resolved for *user_id* (entitled to *course*)."""
+
+    lesson: Lesson
+    course: Course
+    user_id: uuid.UUID
 
 
 async def valid_course_id(
@@ -37,6 +53,20 @@ async def valid_lesson_id(
     return lesson
 
 
+async def valid_course_id_read(
+    course_id: UUID4, session: AsyncSession = Depends(get_read_session)
+) -> Course:
+    """``valid_course_id`` for read-only endpoints (may use the read replica)."""
+    return await valid_course_id(course_id, session)
+
+
+async def valid_lesson_id_read(
+    lesson_id: UUID4, session: AsyncSession = Depends(get_read_session)
+) -> Lesson:
+    """``valid_lesson_id`` for read-only endpoints (may use the read replica)."""
+    return await valid_lesson_id(lesson_id, session)
+
+
 async def valid_quiz_id(
     quiz_id: UUID4, session: AsyncSession = Depends(get_session)
 ) -> Quiz:
@@ -72,6 +102,7 @@ async def require_course_purchase(
         select(CoursePurchase).where(
             CoursePurchase.course_id == course.id,  # type: ignore[arg-type]
             CoursePurchase.user_id == current_user.id,  # type: ignore[arg-type]
+            CoursePurchase.status != "revoked",  # type: ignore[arg-type]
         )
     )
     purchase = result.first()
@@ -81,20 +112,36 @@ async def require_course_purchase(
             course_title=course.title,
             price=course.price,
             platform_wallet_address=settings.PLATFORM_WALLET_ADDRESS,
+            price_planck=course.price_planck,
         )
     return purchase
 
 
 async def require_lesson_purchase(
-    lesson: Lesson = Depends(valid_lesson_id),
+    request: Request,
+    lesson_id: UUID4,
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> Lesson:
     """Verify the authenticated user has purchased the course that owns this lesson.
 
-    Raises 402 PaymentRequired if no purchase exists.
-    Returns the lesson if access is granted.
+    Raises 404 if the lesson does not exist and 402 PaymentRequired if no
+    purchase exists.  Returns the lesson if access is granted.  When
+    ``X402Middleware`` already resolved access in this request, its result
+    is used and nothing is queried again.
     """
+    access: LessonAccess | None = getattr(request.state, LESSON_ACCESS_STATE, None)
+    if (
+        access is not None
+        and access.lesson.id == lesson_id
+        and access.user_id == current_user.id
+    ):
+        return access.lesson
+
+    lesson = await service.get_lesson_by_id(session, lesson_id)
+    if not lesson:
+        raise LessonNotFound()
+
     course = await service.get_course_by_id(session, lesson.course_id)
     if not course:
         raise CourseNotFound()
@@ -107,6 +154,7 @@ async def require_lesson_purchase(
         select(CoursePurchase).where(
             CoursePurchase.course_id == course.id,  # type: ignore[arg-type]
             CoursePurchase.user_id == current_user.id,  # type: ignore[arg-type]
+            CoursePurchase.status != "revoked",  # type: ignore[arg-type]
         )
     )
     purchase = result.first()
@@ -116,5 +164,6 @@ async def require_lesson_purchase(
             course_title=course.title,
             price=course.price,
             platform_wallet_address=settings.PLATFORM_WALLET_ADDRESS,
+            price_planck=course.price_planck,
         )
     return lesson
@@ -35,6 +35,23 @@ class QuizAnswerNotFound(HTTPException):
         )
 
 
+class QuizNotInLesson(HTTPException):
+    """An answer references a quiz that does not belong to the lesson."""
+
+    def __init__(self, quiz_id: uuid.UUID) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Quiz {quiz_id} does not belong to this lesson.",
+        )
+
+
+class InvalidOrder(HTTPException):
+    """A reorder/move request does not match the existing siblings."""
+
+    def __init__(self, detail: str) -> None:
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
 class CoursePurchaseNotFound(HTTPException):
     def __init__(self) -> None:
         super().__init__(
@@ -56,6 +73,26 @@ class TransactionNotFound(HTTPException):
         )
 
 
+class TransactionAlreadyUsed(HTTPException):
+    """Transaction hash is already recorded for a different purchase."""
+
+    def __init__(self, transaction_hash: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Transaction {transaction_hash} already paid for another purchase.",
+        )
+
+
+class CoursePriceUnavailable(HTTPException):
+    """The course's planck price has not been backfilled yet."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="This course cannot be purchased until its price is migrated.",
+        )
+
+
 class PaymentVerificationFailed(HTTPException):
     """Transfer exists but does not match expected recipient/amount."""
 
@@ -79,6 +116,7 @@ class PaymentRequired(HTTPException):
         course_title: str,
         price: float,
         platform_wallet_address: str,
+        price_planck: int | None = None,
     ) -> None:
         super().__init__(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
@@ -88,6 +126,7 @@ class PaymentRequired(HTTPException):
                 "course_id": str(course_id),
                 "course_title": course_title,
                 "price": price,
+                "price_planck": price_planck,
                 "platform_wallet_address": platform_wallet_address,
             },
         )
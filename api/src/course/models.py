@@ -10,8 +10,41 @@ if TYPE_CHECKING:
     from src.auth.models import User
 
 
+# Full-text search document of a course: title ranks above description.
+# 'simple' (no stemming or stop words) because courses are not all English.
+COURSE_SEARCH_CONFIG = "simple"
+COURSE_SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{COURSE_SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{COURSE_SEARCH_CONFIG}', description), 'B')"
+)
+
+
 class Course(SQLModel, table=True):
     __tablename__ = "course"  # type: ignore[assignment]
+    __table_args__ = (
+        # Generated by Postgres; only used in WHERE/ORDER BY of course search,
+        # so it is left unmapped (see __mapper_args__) and never loaded
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR,
+            sa.Computed(COURSE_SEARCH_DOCUMENT, persisted=True),
+        ),
+        # Keyset pagination over (created_at, id)
+        sa.Index("course_created_at_id_idx", "created_at", "id"),
+        # Course search: text match, price range, author filter
+        sa.Index(
+            "course_search_vector_idx", "search_vector", postgresql_using="gin"
+        ),
+        sa.Index("course_price_planck_id_idx", "price_planck", "id"),
+        sa.Index("course_author_id_created_at_id_idx", "author_id", "created_at", "id"),
+        # Sweep of courses whose background purge has not finished
+        sa.Index(
+            "course_deleted_at_idx",
+            "deleted_at",
+            postgresql_where=sa.text("deleted_at IS NOT NULL"),
+        ),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -19,6 +52,19 @@ class Course(SQLModel, table=True):
     title: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
     description: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
     price: float
+
+    # Denormalised from ``price`` and the lessons' ``payback_amount`` whenever
+    # the course or its lessons are written, so settlement needs no lesson
+    # scan and uses exact integer amounts (planck).
+    price_planck: int = Field(
+        default=0,
+        sa_column=sa.Column(sa.BigInteger, nullable=False, server_default="0"),
+    )
+    total_payback_reserve_planck: int = Field(
+        default=0,
+        sa_column=sa.Column(sa.BigInteger, nullable=False, server_default="0"),
+    )
+
     course_pool_address: str | None = Field(
         default=None,
         sa_column=sa.Column(sa.Text, nullable=True),
@@ -37,23 +83,63 @@ class Course(SQLModel, table=True):
             onupdate=sa.func.now(),
         ),
     )
+    # Set while a large course is purged in the background; the course is
+    # hidden from then on and the row goes once the purge finishes
+    deleted_at: datetime | None = Field(
+        default=None, sa_column=sa.Column(sa.DateTime, nullable=True)
+    )
 
     author_id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, sa.ForeignKey("user.id"), nullable=False)
     )
     author: "User" = Relationship(back_populates="courses")
+    # Children are removed by the ON DELETE CASCADE foreign keys;
+    # passive_deletes stops the ORM from loading them to delete row by row.
     lessons: List["Lesson"] = Relationship(
         back_populates="course",
         cascade_delete=True,
+        passive_deletes=True,
     )
     course_purchases: List["CoursePurchase"] = Relationship(
         back_populates="course",
         cascade_delete=True,
+        passive_deletes=True,
     )
 
 
 class CoursePurchase(SQLModel, table=True):
     __tablename__ = "course_purchase"  # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination of a user's purchases over (created_at, id)
+        sa.Index(
+            "course_purchase_user_id_created_at_id_idx", "user_id", "created_at", "id"
+        ),
+        # Purchase lookups per (course, user) and their paginated listing
+        sa.Index(
+            "course_purchase_course_id_user_id_created_at_idx",
+            "course_id",
+            "user_id",
+            "created_at",
+            "id",
+        ),
+        # Teacher activity feed: newest purchases/payouts of a course first
+        sa.Index(
+            "course_purchase_course_id_created_at_id_idx",
+            "course_id",
+            "created_at",
+            "id",
+        ),
+        # One purchase per on-chain payment; also the settlement claim
+        sa.Index(
+            "course_purchase_transaction_hash_key", "transaction_hash", unique=True
+        ),
+        # Finality confirmer: purchases accepted from a best block
+        sa.Index(
+            "course_purchase_provisional_since_idx",
+            "provisional_since",
+            postgresql_where=sa.text("status = 'provisional'"),
+        ),
+    )
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -78,10 +164,31 @@ class CoursePurchase(SQLModel, table=True):
     payback_reserve_amount: float = Field(default=0.0)
     teacher_payout_amount: float = Field(default=0.0)
 
+    # The exact price and teacher share (planck) of the split above; a
+    # deferred payout is sent from these, never from the float amounts
+    amount_planck: int = Field(
+        default=0,
+        sa_column=sa.Column(sa.BigInteger, nullable=False, server_default="0"),
+    )
+    teacher_payout_planck: int = Field(
+        default=0,
+        sa_column=sa.Column(sa.BigInteger, nullable=False, server_default="0"),
+    )
+
     # Teacher payout on-chain tx hash (set after platform sends to teacher)
     teacher_payout_hash: str | None = Field(sa_column=sa.Column(sa.Text, nullable=True))
 
-    # Purchase status: pending -> completed (after teacher payout) or failed
+    # Block the payment was found in, for purchases accepted before finality
+    block_hash: str | None = Field(default=None, sa_column=sa.Column(sa.Text))
+    # When the purchase was (last) accepted before finality; the finality
+    # timeout runs from here, so created_at stays the purchase date
+    provisional_since: datetime | None = Field(
+        default=None, sa_column=sa.Column(sa.DateTime)
+    )
+
+    # Purchase status: pending -> completed (after teacher payout) or failed;
+    # x402 best-block purchases start provisional -> pending/completed once
+    # their block is final, or revoked (no access) if it never is
     status: str = Field(
         default="completed",
         sa_column=sa.Column(sa.Text, nullable=False, server_default="completed"),
@@ -115,6 +222,15 @@ class PaybackTransaction(SQLModel, table=True):
     __tablename__ = "payback_transaction"  # type: ignore[assignment]
     __table_args__ = (
         sa.UniqueConstraint("user_id", "lesson_id", name="uq_payback_user_lesson"),
+        # ON DELETE CASCADE from lesson
+        sa.Index("payback_transaction_lesson_id_idx", "lesson_id"),
+        # Activity feed: newest paybacks of a course first
+        sa.Index(
+            "payback_transaction_course_id_created_at_id_idx",
+            "course_id",
+            "created_at",
+            "id",
+        ),
     )
 
     id: uuid.UUID = Field(
@@ -156,6 +272,12 @@ class PaybackTransaction(SQLModel, table=True):
 
 class Lesson(SQLModel, table=True):
     __tablename__ = "lesson"  # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination within a course over (lesson_index, id)
+        sa.Index(
+            "lesson_course_id_lesson_index_id_idx", "course_id", "lesson_index", "id"
+        ),
+    )
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -192,14 +314,20 @@ class Lesson(SQLModel, table=True):
     quizzes: List["Quiz"] = Relationship(
         back_populates="lesson",
         cascade_delete=True,
+        passive_deletes=True,
     )
     payback_transactions: List["PaybackTransaction"] = Relationship(
         back_populates="lesson",
+        passive_deletes=True,
     )
 
 
 class Quiz(SQLModel, table=True):
     __tablename__ = "quiz"  # type: ignore[assignment]
+    __table_args__ = (
+        # Keyset pagination within a lesson over (quiz_index, id)
+        sa.Index("quiz_lesson_id_quiz_index_id_idx", "lesson_id", "quiz_index", "id"),
+    )
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -236,11 +364,16 @@ class Quiz(SQLModel, table=True):
     quiz_answers: List["QuizAnswer"] = Relationship(
         back_populates="quiz",
         cascade_delete=True,
+        passive_deletes=True,
     )
 
 
 class QuizAnswer(SQLModel, table=True):
     __tablename__ = "quiz_answer"  # type: ignore[assignment]
+    __table_args__ = (
+        # ON DELETE CASCADE from quiz, and a user's answers per quiz
+        sa.Index("quiz_answer_quiz_id_user_id_idx", "quiz_id", "user_id"),
+    )
 
     id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
@@ -256,6 +389,77 @@ class QuizAnswer(SQLModel, table=True):
     user_id: uuid.UUID = Field(
         sa_column=sa.Column(postgresql.UUID, sa.ForeignKey("user.id"), nullable=False)
     )
+    # A quiz answered more than once is scored by its latest answer
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(sa.DateTime, nullable=False, server_default=sa.func.now()),
+    )
 
     quiz: "Quiz" = Relationship(back_populates="quiz_answers")
     user: "User" = Relationship(back_populates="quiz_answers")
+
+
+# ---------------------------------------------------------------------------
+# Analytics rollups (refreshed periodically by src.course.analytics)
+# ---------------------------------------------------------------------------
+class CourseStats(SQLModel, table=True):
+    __tablename__ = "course_stats"  # type: ignore[assignment]
+
+    course_id: uuid.UUID = Field(
+        sa_column=sa.Column(
+            postgresql.UUID,
+            sa.ForeignKey("course.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    purchase_count: int = Field(default=0)
+    buyer_count: int = Field(default=0)
+
+    # Totals over all purchases, in token units
+    revenue: float = Field(default=0.0)
+    platform_fee: float = Field(default=0.0)
+    payback_reserve: float = Field(default=0.0)
+    teacher_payout: float = Field(default=0.0)
+
+    payback_count: int = Field(default=0)
+    payback_total: float = Field(default=0.0)
+
+    refreshed_at: datetime = Field(
+        sa_column=sa.Column(sa.DateTime, nullable=False, server_default=sa.func.now())
+    )
+
+
+class LessonStats(SQLModel, table=True):
+    __tablename__ = "lesson_stats"  # type: ignore[assignment]
+
+    lesson_id: uuid.UUID = Field(
+        sa_column=sa.Column(
+            postgresql.UUID,
+            sa.ForeignKey("lesson.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    course_id: uuid.UUID = Field(
+        sa_column=sa.Column(postgresql.UUID, nullable=False, index=True)
+    )
+    # Students who answered at least one quiz / all quizzes / passed
+    learners: int = Field(default=0)
+    completed: int = Field(default=0)
+    passed: int = Field(default=0)
+
+
+class QuizStats(SQLModel, table=True):
+    __tablename__ = "quiz_stats"  # type: ignore[assignment]
+
+    quiz_id: uuid.UUID = Field(
+        sa_column=sa.Column(
+            postgresql.UUID,
+            sa.ForeignKey("quiz.id", ondelete="CASCADE"),
+            primary_key=True,
+        )
+    )
+    course_id: uuid.UUID = Field(
+        sa_column=sa.Column(postgresql.UUID, nullable=False, index=True)
+    )
+    answers: int = Field(default=0)
+    correct: int = Field(default=0)
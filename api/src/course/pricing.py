@@ -0,0 +1,54 @@
+"""Exact integer money math for course prices, paybacks and fee splits.
+
+Prices and paybacks are entered in token units (e.g. ``1.5`` PAS) but every
+on-chain amount is an integer number of planck (``10**TOKEN_DECIMALS`` per
+token).  Converting through ``Decimal(str(x))`` avoids the float error of
+``int(x * 10**decimals)`` (``int(0.3 * 10**10) == 2999999999``), and the fee
+split below is computed entirely in planck so its parts always add up to
+the price.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import ROUND_DOWN, Decimal
+
+from src.config import settings
+
+
+def to_planck(amount: float) -> int:
+    """Convert a token amount to planck, truncating sub-planck dust."""
+    scaled = Decimal(str(amount)).scaleb(settings.TOKEN_DECIMALS)
+    return int(scaled.to_integral_value(rounding=ROUND_DOWN))
+
+
+def from_planck(amount_planck: int) -> float:
+    """Convert planck back to token units (for display and legacy fields)."""
+    return float(Decimal(amount_planck).scaleb(-settings.TOKEN_DECIMALS))
+
+
+@dataclass(frozen=True, slots=True)
+class FeeSplit:
+    """How a course payment is divided, in planck."""
+
+    price: int
+    platform_fee: int
+    payback_reserve: int
+    teacher_share: int
+
+
+def split_payment(price_planck: int, payback_reserve_planck: int) -> FeeSplit:
+    """Split *price_planck* into platform fee, payback reserve and teacher share.
+
+    The platform fee is rounded down; the teacher receives whatever is left
+    after the fee and the reserve (never negative).
+    """
+    rate = Decimal(str(settings.PLATFORM_FEE_RATE))
+    platform_fee = int((rate * price_planck).to_integral_value(rounding=ROUND_DOWN))
+    teacher_share = max(price_planck - platform_fee - payback_reserve_planck, 0)
+    return FeeSplit(
+        price=price_planck,
+        platform_fee=platform_fee,
+        payback_reserve=payback_reserve_planck,
+        teacher_share=teacher_share,
+    )
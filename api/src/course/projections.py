@@ -0,0 +1,104 @@
+"""Lightweight read models for the list endpoints.
+
+The list endpoints select only the columns their response needs into
+slotted dataclasses and serialize them straight to JSON with a cached
+pydantic ``TypeAdapter``.  Compared to loading SQLModel instances this
+skips identity-map bookkeeping and change tracking, and skips re-validating
+each ORM object into a response model.
+
+Each dataclass mirrors the corresponding response schema in
+``src.course.schemas`` field for field (which stays the documented
+``response_model``); ``row_columns`` derives the SELECT list from the
+dataclass fields so the two cannot drift apart.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass, fields
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@dataclass(frozen=True, slots=True)
+class CourseRow:
+    id: uuid.UUID
+    title: str
+    description: str
+    price: float
+    course_pool_address: str | None
+    author_id: uuid.UUID
+    author_wallet_address: str
+    platform_wallet_address: str
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class LessonRow:
+    id: uuid.UUID
+    title: str
+    description: str
+    video_url: str
+    payback_amount: float
+    lesson_index: int
+    course_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class QuizRow:
+    id: uuid.UUID
+    question: str
+    option_a: str
+    option_b: str
+    option_c: str
+    option_d: str
+    correct_option: int
+    quiz_index: int
+    lesson_id: uuid.UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class PurchaseRow:
+    id: uuid.UUID
+    course_id: uuid.UUID
+    user_id: uuid.UUID
+    transaction_hash: str
+    amount: float
+    platform_fee_amount: float
+    payback_reserve_amount: float
+    teacher_payout_amount: float
+    teacher_payout_hash: str | None
+    status: str
+    created_at: datetime | None
+    updated_at: datetime | None
+
+
+COURSE_ROWS = TypeAdapter(list[CourseRow])
+LESSON_ROWS = TypeAdapter(list[LessonRow])
+QUIZ_ROWS = TypeAdapter(list[QuizRow])
+PURCHASE_ROWS = TypeAdapter(list[PurchaseRow])
+
+
+def row_columns(
+    table: sa.Table, row_type: type, **overrides: Any
+) -> list[sa.ColumnElement[Any]]:
+    """SELECT list for *row_type*: ``table.c[<field>]`` unless overridden."""
+    return [
+        overrides[f.name].label(f.name) if f.name in overrides else table.c[f.name]
+        for f in fields(row_type)
+    ]
+
+
+def rows_response(adapter: TypeAdapter[Any], rows: Sequence[Any]) -> Response:
+    """Serialize *rows* to a JSON response in one pass."""
+    return Response(content=adapter.dump_json(list(rows)), media_type="application/json")
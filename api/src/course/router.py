@@ -1,38 +1,63 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import UUID4
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.auth.dependencies import get_current_user, require_role
 from src.auth.exceptions import InsufficientPermissions
 from src.auth.models import User
-from src.course import service
+from src.course import analytics, service
 from src.course.dependencies import (
     require_lesson_purchase,
     valid_course_id,
+    valid_course_id_read,
     valid_lesson_id,
+    valid_lesson_id_read,
     valid_quiz_id,
 )
 from src.course.models import Course, CoursePurchase, Lesson, Quiz, QuizAnswer
+from src.course.projections import (
+    COURSE_ROWS,
+    LESSON_ROWS,
+    PURCHASE_ROWS,
+    QUIZ_ROWS,
+    rows_response,
+)
 from src.course.schemas import (
     ActivityListResponse,
+    ActivityPageResponse,
+    CourseAnalyticsResponse,
     CoursePurchaseCreate,
     CoursePurchaseResponse,
     CourseCreate,
+    CourseProgressOverview,
     CourseProgressResponse,
     CourseResponse,
     CourseUpdate,
     CourseWithLessonsResponse,
     GenerateQuizFromDataRequest,
     GenerateQuizRequest,
+    ItemPosition,
+    LessonAnswersCreate,
+    LessonAnswersResponse,
     LessonProgressResponse,
     LessonResponse,
+    MoveRequest,
     QuizAnswerCreate,
     QuizAnswerResponse,
     QuizResponse,
+    ReorderRequest,
     YouTubeMetadataResponse,
 )
-from src.database import get_session
+from src.database import get_read_session, get_session
+from src.instrumentation import query_budget
 from src.models import Role
+from src.pagination import NEXT_CURSOR_HEADER, set_next_cursor
+
+_CURSOR_DESCRIPTION = (
+    "Opaque cursor from the previous page's ``X-Next-Cursor`` header. "
+    "When given, ``offset`` is ignored."
+)
 
 # ===========================================================================
 # Course router
@@ -44,19 +69,88 @@ course_router = APIRouter(prefix="/courses", tags=["Courses"])
     "",
     response_model=list[CourseResponse],
     summary="List all courses",
-    description="Retrieve a paginated list of all available courses. Public endpoint.",
+    description=(
+        "Retrieve a paginated list of all available courses, ordered by creation "
+        "time. Supports offset or cursor pagination. Public endpoint."
+    ),
     responses={
-        status.HTTP_200_OK: {"description": "A list of courses returned successfully."},
+        status.HTTP_200_OK: {
+            "description": "A list of courses returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
     },
 )
 async def list_courses(
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     offset: int = Query(default=0, ge=0, description="Number of records to skip."),
     limit: int = Query(
         default=100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> list[CourseResponse]:
-    return await service.get_courses(session, offset=offset, limit=limit)
+    cursor: str | None = Query(default=None, description=_CURSOR_DESCRIPTION),
+) -> Response:
+    courses = await service.get_course_rows(
+        session, offset=offset, limit=limit, cursor=cursor
+    )
+    response = rows_response(COURSE_ROWS, courses)
+    set_next_cursor(response, courses, limit, lambda c: (c.created_at, c.id))
+    return response
+
+
+# Declared before "/{course_id}" so "search" is not parsed as a course ID
+@course_router.get(
+    "/search",
+    response_model=list[CourseResponse],
+    summary="Search courses",
+    description=(
+        "Full-text search over course titles and descriptions, optionally "
+        "filtered by price range and author. With ``q`` results are ranked by "
+        "relevance (title matches first), otherwise newest first. "
+        "Paginate with the ``X-Next-Cursor`` header. Public endpoint."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Matching courses returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
+    },
+)
+async def search_courses(
+    session: AsyncSession = Depends(get_read_session),
+    q: str | None = Query(
+        default=None,
+        max_length=200,
+        description='Search text: words, "quoted phrases", -excluded words.',
+    ),
+    min_price: float | None = Query(
+        default=None, ge=0, description="Minimum price in token units."
+    ),
+    max_price: float | None = Query(
+        default=None, ge=0, description="Maximum price in token units."
+    ),
+    author_id: UUID4 | None = Query(default=None, description="Only this author."),
+    limit: int = Query(
+        default=20, ge=1, le=100, description="Maximum number of records to return."
+    ),
+    cursor: str | None = Query(default=None, description=_CURSOR_DESCRIPTION),
+) -> Response:
+    courses, last_key = await service.search_course_rows(
+        session,
+        query=q.strip() if q else None,
+        min_price=min_price,
+        max_price=max_price,
+        author_id=author_id,
+        limit=limit,
+        cursor=cursor,
+    )
+    response = rows_response(COURSE_ROWS, courses)
+    set_next_cursor(response, courses, limit, lambda _: last_key)
+    return response
 
 
 @course_router.get(
@@ -70,8 +164,8 @@ async def list_courses(
     },
 )
 async def get_course(
-    course: Course = Depends(valid_course_id),
-    session: AsyncSession = Depends(get_session),
+    course: Course = Depends(valid_course_id_read),
+    session: AsyncSession = Depends(get_read_session),
 ) -> CourseResponse:
     return await service.get_course_response(session, course)
 
@@ -88,13 +182,105 @@ async def get_course(
     },
 )
 async def get_course_activities(
-    course: Course = Depends(valid_course_id),
+    course: Course = Depends(valid_course_id_read),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> ActivityListResponse:
     return await service.get_course_activities(session, course.id, current_user.id)
 
 
+@course_router.get(
+    "/{course_id}/activities/feed",
+    response_model=ActivityPageResponse,
+    summary="Get a page of course activities",
+    description=(
+        "Cursor-paginated activity feed for a course, newest first. The course "
+        "author sees every purchase, teacher payout and payback; other users see "
+        "only their own purchase and paybacks. Pass ``next_cursor`` from the "
+        "previous page as ``cursor`` to continue."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Activity page returned successfully."},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
+    },
+)
+async def get_course_activity_feed(
+    course: Course = Depends(valid_course_id_read),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+    limit: int = Query(
+        default=50, ge=1, le=500, description="Maximum number of activities to return."
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description="Cursor returned as ``next_cursor`` by the previous page.",
+    ),
+) -> ActivityPageResponse:
+    return await service.get_course_activity_page(
+        session, course, current_user.id, limit=limit, cursor=cursor
+    )
+
+
+@course_router.get(
+    "/{course_id}/activities/export",
+    summary="Export course activities as NDJSON",
+    description=(
+        "Stream the complete activity feed of a course as newline-delimited JSON "
+        "(one ``ActivityItem`` per line), newest first. Intended for full exports."
+    ),
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "NDJSON stream of activities.",
+            "content": {"application/x-ndjson": {}},
+        },
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
+    },
+)
+async def export_course_activities(
+    course: Course = Depends(valid_course_id_read),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    return StreamingResponse(
+        service.stream_course_activities(course, current_user.id),
+        media_type="application/x-ndjson",
+    )
+
+
+@course_router.get(
+    "/{course_id}/analytics",
+    response_model=CourseAnalyticsResponse,
+    summary="Get course analytics",
+    description=(
+        "Revenue, fee and payout totals, purchase count, per-lesson pass rate "
+        "and per-quiz difficulty for a course. Served from rollups refreshed "
+        "every ``ANALYTICS_REFRESH_INTERVAL`` seconds (see ``refreshed_at``). "
+        "Requires course ownership."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Course analytics returned."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
+        status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
+    },
+    # user + course + course/lesson/quiz stats
+    dependencies=[Depends(query_budget(5))],
+)
+async def get_course_analytics(
+    course: Course = Depends(valid_course_id_read),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> CourseAnalyticsResponse:
+    if course.author_id != current_user.id:
+        raise InsufficientPermissions(
+            "You can only view analytics of your own courses."
+        )
+    return await analytics.get_course_analytics(session, course.id)
+
+
 @course_router.post(
     "",
     response_model=CourseWithLessonsResponse,
@@ -159,9 +345,16 @@ async def update_course(
     summary="Delete a course",
     description=(
         "Permanently delete a course and all associated data. "
-        "Requires Teacher role and course ownership."
+        "Requires Teacher role and course ownership. Very large courses are "
+        "deleted in the background: the endpoint then returns **202 Accepted**, "
+        "the course is hidden at once and its data goes once the purge has "
+        "finished."
     ),
+    response_class=Response,
     responses={
+        status.HTTP_202_ACCEPTED: {
+            "description": "Course too large to delete inline; deletion scheduled."
+        },
         status.HTTP_204_NO_CONTENT: {"description": "Course deleted successfully."},
         status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
         status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
@@ -169,13 +362,17 @@ async def update_course(
     },
 )
 async def delete_course(
+    background_tasks: BackgroundTasks,
     course: Course = Depends(valid_course_id),
     current_user: User = Depends(require_role(Role.TEACHER)),
     session: AsyncSession = Depends(get_session),
-) -> None:
+) -> Response:
     if course.author_id != current_user.id:
         raise InsufficientPermissions("You can only delete your own courses.")
-    await service.delete_course(session, course)
+    if await service.delete_course(session, course):
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    background_tasks.add_task(service.purge_course, course.id)
+    return Response(status_code=status.HTTP_202_ACCEPTED)
 
 
 # ===========================================================================
@@ -193,21 +390,59 @@ lesson_router = APIRouter(prefix="/courses/{course_id}/lessons", tags=["Lessons"
         "ordered by lesson_index. Public endpoint (titles/descriptions visible for browsing)."
     ),
     responses={
-        status.HTTP_200_OK: {"description": "A list of lessons returned successfully."},
+        status.HTTP_200_OK: {
+            "description": "A list of lessons returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
     },
 )
 async def list_lessons(
-    course: Course = Depends(valid_course_id),
-    session: AsyncSession = Depends(get_session),
+    course: Course = Depends(valid_course_id_read),
+    session: AsyncSession = Depends(get_read_session),
     offset: int = Query(default=0, ge=0, description="Number of records to skip."),
     limit: int = Query(
         default=100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> list[Lesson]:
-    return await service.get_lessons_by_course(
-        session, course.id, offset=offset, limit=limit
+    cursor: str | None = Query(default=None, description=_CURSOR_DESCRIPTION),
+) -> Response:
+    lessons = await service.get_lesson_rows(
+        session, course.id, offset=offset, limit=limit, cursor=cursor
     )
+    response = rows_response(LESSON_ROWS, lessons)
+    set_next_cursor(response, lessons, limit, lambda l: (l.lesson_index, l.id))
+    return response
+
+
+@lesson_router.put(
+    "/order",
+    response_model=list[ItemPosition],
+    summary="Reorder a course's lessons",
+    description=(
+        "Apply a new order to all lessons of a course in one statement. "
+        "``ids`` must list every lesson of the course exactly once. "
+        "Requires Teacher role and course ownership."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "New lesson indexes, in order."},
+        status.HTTP_400_BAD_REQUEST: {"description": "IDs do not match the lessons."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
+        status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
+    },
+)
+async def reorder_lessons(
+    data: ReorderRequest,
+    course: Course = Depends(valid_course_id),
+    current_user: User = Depends(require_role(Role.TEACHER)),
+    session: AsyncSession = Depends(get_session),
+) -> list[ItemPosition]:
+    if course.author_id != current_user.id:
+        raise InsufficientPermissions("You can only reorder your own courses.")
+    return await service.reorder_lessons(session, course, data.ids)
 
 
 # Standalone lesson endpoint (get by ID — used by the lesson detail page)
@@ -229,6 +464,8 @@ lesson_detail_router = APIRouter(prefix="/lessons", tags=["Lessons"])
         status.HTTP_402_PAYMENT_REQUIRED: {"description": "Course not purchased."},
         status.HTTP_404_NOT_FOUND: {"description": "Lesson not found."},
     },
+    # user + lesson + course + purchase
+    dependencies=[Depends(query_budget(4))],
 )
 async def get_lesson(
     lesson: Lesson = Depends(require_lesson_purchase),
@@ -236,6 +473,36 @@ async def get_lesson(
     return lesson
 
 
+@lesson_detail_router.post(
+    "/{lesson_id}/move",
+    response_model=list[ItemPosition],
+    summary="Move a lesson",
+    description=(
+        "Move one lesson after another lesson of the same course "
+        "(or to the front when ``after_id`` is null) without resending the "
+        "whole course. Usually only the moved lesson is updated; the response "
+        "lists every lesson whose index changed. "
+        "Requires Teacher role and course ownership."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Lessons whose index changed."},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid ``after_id``."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
+        status.HTTP_404_NOT_FOUND: {"description": "Lesson not found."},
+    },
+)
+async def move_lesson(
+    data: MoveRequest,
+    lesson: Lesson = Depends(valid_lesson_id),
+    current_user: User = Depends(require_role(Role.TEACHER)),
+    session: AsyncSession = Depends(get_session),
+) -> list[ItemPosition]:
+    if await service.get_lesson_author_id(session, lesson.id) != current_user.id:
+        raise InsufficientPermissions("You can only reorder your own courses.")
+    return await service.move_lesson(session, lesson, data.after_id)
+
+
 # ===========================================================================
 # Quiz router (nested under /lessons/{lesson_id}/quizzes)
 # PROTECTED: requires course purchase or author access
@@ -252,7 +519,13 @@ quiz_router = APIRouter(prefix="/lessons/{lesson_id}/quizzes", tags=["Quizzes"])
         "Requires authentication and course purchase (returns 402 if not purchased)."
     ),
     responses={
-        status.HTTP_200_OK: {"description": "A list of quizzes returned successfully."},
+        status.HTTP_200_OK: {
+            "description": "A list of quizzes returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
+        },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
         status.HTTP_402_PAYMENT_REQUIRED: {"description": "Course not purchased."},
         status.HTTP_404_NOT_FOUND: {"description": "Lesson not found."},
@@ -260,15 +533,80 @@ quiz_router = APIRouter(prefix="/lessons/{lesson_id}/quizzes", tags=["Quizzes"])
 )
 async def list_quizzes(
     lesson: Lesson = Depends(require_lesson_purchase),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     offset: int = Query(default=0, ge=0, description="Number of records to skip."),
     limit: int = Query(
         default=100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> list[Quiz]:
-    return await service.get_quizzes_by_lesson(
-        session, lesson.id, offset=offset, limit=limit
+    cursor: str | None = Query(default=None, description=_CURSOR_DESCRIPTION),
+) -> Response:
+    quizzes = await service.get_quiz_rows(
+        session, lesson.id, offset=offset, limit=limit, cursor=cursor
     )
+    response = rows_response(QUIZ_ROWS, quizzes)
+    set_next_cursor(response, quizzes, limit, lambda q: (q.quiz_index, q.id))
+    return response
+
+
+@quiz_router.put(
+    "/order",
+    response_model=list[ItemPosition],
+    summary="Reorder a lesson's quizzes",
+    description=(
+        "Apply a new order to all quizzes of a lesson in one statement. "
+        "``ids`` must list every quiz of the lesson exactly once. "
+        "Requires Teacher role and course ownership."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "New quiz indexes, in order."},
+        status.HTTP_400_BAD_REQUEST: {"description": "IDs do not match the quizzes."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
+        status.HTTP_404_NOT_FOUND: {"description": "Lesson not found."},
+    },
+)
+async def reorder_quizzes(
+    data: ReorderRequest,
+    lesson: Lesson = Depends(valid_lesson_id),
+    current_user: User = Depends(require_role(Role.TEACHER)),
+    session: AsyncSession = Depends(get_session),
+) -> list[ItemPosition]:
+    if await service.get_lesson_author_id(session, lesson.id) != current_user.id:
+        raise InsufficientPermissions("You can only reorder your own courses.")
+    return await service.reorder_quizzes(session, lesson, data.ids)
+
+
+# Standalone quiz endpoints
+quiz_detail_router = APIRouter(prefix="/quizzes", tags=["Quizzes"])
+
+
+@quiz_detail_router.post(
+    "/{quiz_id}/move",
+    response_model=list[ItemPosition],
+    summary="Move a quiz",
+    description=(
+        "Move one quiz after another quiz of the same lesson "
+        "(or to the front when ``after_id`` is null). Usually only the moved "
+        "quiz is updated; the response lists every quiz whose index changed. "
+        "Requires Teacher role and course ownership."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Quizzes whose index changed."},
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid ``after_id``."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_403_FORBIDDEN: {"description": "Not the course author."},
+        status.HTTP_404_NOT_FOUND: {"description": "Quiz not found."},
+    },
+)
+async def move_quiz(
+    data: MoveRequest,
+    quiz: Quiz = Depends(valid_quiz_id),
+    current_user: User = Depends(require_role(Role.TEACHER)),
+    session: AsyncSession = Depends(get_session),
+) -> list[ItemPosition]:
+    if await service.get_lesson_author_id(session, quiz.lesson_id) != current_user.id:
+        raise InsufficientPermissions("You can only reorder your own courses.")
+    return await service.move_quiz(session, quiz, data.after_id)
 
 
 @quiz_router.post(
@@ -339,6 +677,42 @@ async def create_quiz_answer(
     return await service.create_quiz_answer(session, data, current_user.id)
 
 
+lesson_answer_router = APIRouter(
+    prefix="/lessons/{lesson_id}/answers", tags=["Quiz Answers"]
+)
+
+
+@lesson_answer_router.post(
+    "",
+    response_model=LessonAnswersResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Submit answers for a whole lesson",
+    description=(
+        "Submit the student's answers to several quizzes of a lesson in one "
+        "request. Requires authentication. All answers are saved together, the "
+        "lesson is scored once and the per-question results are returned. If "
+        "the student has now passed the lesson (scored >= 70% on all quizzes), "
+        "a payback transfer is sent on-chain; ``payback_eligible`` reports "
+        "whether this submission qualified for it."
+    ),
+    responses={
+        status.HTTP_201_CREATED: {"description": "Answers submitted and scored."},
+        status.HTTP_400_BAD_REQUEST: {
+            "description": "An answer references a quiz of another lesson."
+        },
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_404_NOT_FOUND: {"description": "Lesson not found."},
+    },
+)
+async def submit_lesson_answers(
+    data: LessonAnswersCreate,
+    lesson: Lesson = Depends(valid_lesson_id),
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_session),
+) -> LessonAnswersResponse:
+    return await service.submit_lesson_answers(session, lesson, data, current_user.id)
+
+
 # ===========================================================================
 # Progress router (quiz results + course progress) — requires auth
 # ===========================================================================
@@ -360,9 +734,9 @@ progress_router = APIRouter(prefix="", tags=["Progress"])
     },
 )
 async def get_lesson_progress(
-    lesson: Lesson = Depends(valid_lesson_id),
+    lesson: Lesson = Depends(valid_lesson_id_read),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> LessonProgressResponse:
     return await service.get_lesson_progress(session, lesson.id, current_user.id)
 
@@ -382,13 +756,36 @@ async def get_lesson_progress(
     },
 )
 async def get_course_progress(
-    course: Course = Depends(valid_course_id),
+    course: Course = Depends(valid_course_id_read),
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> CourseProgressResponse:
     return await service.get_course_progress(session, course.id, current_user.id)
 
 
+@progress_router.get(
+    "/progress/me",
+    response_model=list[CourseProgressOverview],
+    summary="Get progress across all purchased courses",
+    description=(
+        "Retrieve the authenticated user's progress in every course they bought "
+        "(completion, score and PAS earned), newest purchase first. "
+        "Computed in a single query for the student dashboard."
+    ),
+    responses={
+        status.HTTP_200_OK: {"description": "Per-course progress returned."},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+    },
+    # user + progress
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_my_progress(
+    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_read_session),
+) -> list[CourseProgressOverview]:
+    return await service.get_my_progress(session, current_user.id)
+
+
 # ===========================================================================
 # CoursePurchase router — requires auth
 # ===========================================================================
@@ -405,14 +802,18 @@ purchase_router = APIRouter(prefix="/purchases", tags=["Course Purchases"])
     ),
     responses={
         status.HTTP_200_OK: {
-            "description": "A list of purchases returned successfully."
+            "description": "A list of purchases returned successfully.",
+            "headers": {
+                NEXT_CURSOR_HEADER: {"description": "Cursor for the next page."}
+            },
         },
+        status.HTTP_400_BAD_REQUEST: {"description": "Invalid pagination cursor."},
         status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
     },
 )
 async def list_purchases(
     current_user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
     course_id: UUID4 | None = Query(
         default=None, description="Filter purchases by course ID."
     ),
@@ -420,25 +821,19 @@ async def list_purchases(
     limit: int = Query(
         default=100, ge=1, le=1000, description="Maximum number of records to return."
     ),
-) -> list[CoursePurchase]:
-    if course_id:
-        # Return only the current user's purchases for this course
-        from sqlmodel import select
-        from src.course.models import CoursePurchase as CP
-
-        result = await session.exec(
-            select(CP)
-            .where(
-                CP.course_id == course_id,  # type: ignore[arg-type]
-                CP.user_id == current_user.id,  # type: ignore[arg-type]
-            )
-            .offset(offset)
-            .limit(limit)
-        )
-        return list(result.all())
-    return await service.get_purchases_by_user(
-        session, current_user.id, offset=offset, limit=limit
+    cursor: str | None = Query(default=None, description=_CURSOR_DESCRIPTION),
+) -> Response:
+    purchases = await service.get_purchase_rows(
+        session,
+        current_user.id,
+        course_id=course_id,
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
     )
+    response = rows_response(PURCHASE_ROWS, purchases)
+    set_next_cursor(response, purchases, limit, lambda p: (p.created_at, p.id))
+    return response
 
 
 @purchase_router.post(
@@ -465,6 +860,9 @@ async def list_purchases(
             "description": "Transaction not found on-chain or payment verification failed.",
         },
         status.HTTP_404_NOT_FOUND: {"description": "Course not found."},
+        status.HTTP_409_CONFLICT: {
+            "description": "Transaction already paid for another purchase."
+        },
         status.HTTP_422_UNPROCESSABLE_ENTITY: {"description": "Validation error."},
     },
 )
@@ -63,6 +63,17 @@ class ActivityListResponse(BaseModel):
     activities: list[ActivityItem] = Field(description="List of activities.")
 
 
+class ActivityPageResponse(BaseModel):
+    """One page of the activity feed for a course, newest first."""
+
+    course_id: uuid.UUID = Field(description="Course ID.")
+    activities: list[ActivityItem] = Field(description="Activities on this page.")
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor for the next (older) page; null on the last page.",
+    )
+
+
 # ---------------------------------------------------------------------------
 # Lesson (read-only responses)
 # ---------------------------------------------------------------------------
@@ -173,6 +184,33 @@ class CourseUpdate(BaseModel):
     )
 
 
+# ---------------------------------------------------------------------------
+# Ordering (lessons within a course, quizzes within a lesson)
+# ---------------------------------------------------------------------------
+class ReorderRequest(BaseModel):
+    """New order for every lesson of a course, or every quiz of a lesson."""
+
+    ids: list[uuid.UUID] = Field(
+        ..., min_length=1, description="All item IDs, in the desired order."
+    )
+
+
+class MoveRequest(BaseModel):
+    """Move a single lesson or quiz among its siblings."""
+
+    after_id: uuid.UUID | None = Field(
+        default=None,
+        description="Sibling to place the item after (null moves it to the front).",
+    )
+
+
+class ItemPosition(BaseModel):
+    """New ordering index of a lesson or quiz."""
+
+    id: uuid.UUID = Field(description="Lesson or quiz ID.")
+    index: int = Field(description="New lesson_index / quiz_index.")
+
+
 # ---------------------------------------------------------------------------
 # Quiz
 # ---------------------------------------------------------------------------
@@ -311,6 +349,18 @@ class QuizAnswerCreate(BaseModel):
     )
 
 
+class LessonAnswersCreate(BaseModel):
+    """Schema for submitting answers to several quizzes of one lesson at once.
+
+    Every ``quiz_id`` must belong to the lesson in the URL.  If the same
+    quiz appears more than once, the last entry wins.
+    """
+
+    answers: list[QuizAnswerCreate] = Field(
+        ..., min_length=1, description="Answers to the lesson's quizzes."
+    )
+
+
 class QuizAnswerResponse(BaseModel):
     """Schema returned when reading a quiz answer."""
 
@@ -442,6 +492,17 @@ class LessonProgressResponse(BaseModel):
     results: list[QuizResultItem] = Field(description="Per-question results.")
 
 
+class LessonAnswersResponse(LessonProgressResponse):
+    """Lesson results returned after a batch answer submission."""
+
+    payback_eligible: bool = Field(
+        description=(
+            "Whether this submission qualified the user for the lesson payback "
+            "(passed, payback > 0, course purchased and not the author)."
+        )
+    )
+
+
 class CourseProgressResponse(BaseModel):
     """Overall progress for a course for a specific user."""
 
@@ -476,6 +537,77 @@ class LessonProgressSummary(BaseModel):
     )
 
 
+class CourseProgressOverview(BaseModel):
+    """One purchased course on the student dashboard (``/progress/me``)."""
+
+    course_id: uuid.UUID = Field(description="Course ID.")
+    course_title: str = Field(description="Course title.")
+    purchased_at: datetime = Field(description="When the course was first bought.")
+    total_lessons: int = Field(description="Total lessons in the course.")
+    completed_lessons: int = Field(
+        description="Number of lessons where all quizzes are answered."
+    )
+    passed_lessons: int = Field(
+        description="Number of completed lessons with score >= 70%."
+    )
+    completion_pct: float = Field(description="Completed lessons percentage (0-100).")
+    total_questions: int = Field(description="Total quiz questions in the course.")
+    answered: int = Field(description="Number answered.")
+    correct: int = Field(description="Number correct.")
+    score_pct: float = Field(
+        description="Score percentage over all questions (0-100)."
+    )
+    total_earned: float = Field(description="Total PAS earned from paybacks.")
+
+
+# ---------------------------------------------------------------------------
+# Analytics (teacher)
+# ---------------------------------------------------------------------------
+class LessonAnalytics(BaseModel):
+    """Aggregate quiz results of all students for one lesson."""
+
+    lesson_id: uuid.UUID = Field(description="Lesson ID.")
+    title: str = Field(description="Lesson title.")
+    lesson_index: int = Field(description="Lesson ordering index.")
+    learners: int = Field(description="Students who answered at least one quiz.")
+    completed: int = Field(description="Students who answered every quiz.")
+    passed: int = Field(description="Students who completed with score >= 70%.")
+    pass_rate: float = Field(description="Passed / completed, in percent (0-100).")
+
+
+class QuizAnalytics(BaseModel):
+    """Difficulty of one quiz question."""
+
+    quiz_id: uuid.UUID = Field(description="Quiz ID.")
+    lesson_id: uuid.UUID = Field(description="Parent lesson ID.")
+    question: str = Field(description="Quiz question text.")
+    quiz_index: int = Field(description="Quiz ordering index.")
+    answers: int = Field(description="Learners who answered (latest answer each).")
+    correct: int = Field(description="Learners whose latest answer is correct.")
+    correct_share: float = Field(
+        description="Share of correct answers in percent (0-100); low means hard."
+    )
+
+
+class CourseAnalyticsResponse(BaseModel):
+    """Sales and learning analytics for a course, from periodic rollups."""
+
+    course_id: uuid.UUID = Field(description="Course ID.")
+    refreshed_at: datetime | None = Field(
+        description="When the rollups were computed (null before the first run)."
+    )
+    purchase_count: int = Field(description="Number of purchases.")
+    buyer_count: int = Field(description="Number of distinct buyers.")
+    revenue: float = Field(description="Total paid by students, in token units.")
+    platform_fee: float = Field(description="Total platform fees.")
+    payback_reserve: float = Field(description="Total reserved for paybacks.")
+    teacher_payout: float = Field(description="Total paid out to the teacher.")
+    payback_count: int = Field(description="Paybacks sent to students.")
+    payback_total: float = Field(description="Total paybacks sent, in token units.")
+    lessons: list[LessonAnalytics] = Field(description="Per-lesson pass rates.")
+    quizzes: list[QuizAnalytics] = Field(description="Per-quiz difficulty.")
+
+
 # ---------------------------------------------------------------------------
 # YouTube Metadata
 # ---------------------------------------------------------------------------
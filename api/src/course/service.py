@@ -1,7 +1,12 @@
 import logging
 import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
 
+import sqlalchemy as sa
 from pydantic import UUID4
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -9,14 +14,23 @@ from src.ai.factory import get_ai_provider
 from src.ai.subtitles import fetch_subtitles
 from src.auth.models import User
 from src.config import settings
-from src.course.blockchain import get_block_hash_from_tx, verify_payment
+from src.course.blockchain import (
+    get_block_hash_from_tx,
+    run_light_client,
+    verify_payment,
+)
 from src.course.exceptions import (
     CoursePaybackExceedsPrice,
+    CoursePriceUnavailable,
+    InvalidOrder,
     PaymentVerificationFailed,
     QuizGenerationFailed,
+    QuizNotInLesson,
+    TransactionAlreadyUsed,
     TransactionNotFound,
 )
 from src.course.models import (
+    COURSE_SEARCH_CONFIG,
     Course,
     CoursePurchase,
     Lesson,
@@ -24,27 +38,51 @@ from src.course.models import (
     Quiz,
     QuizAnswer,
 )
+from src.course.pricing import FeeSplit, from_planck, split_payment, to_planck
+from src.course.projections import (
+    CourseRow,
+    LessonRow,
+    PurchaseRow,
+    QuizRow,
+    row_columns,
+)
 from src.course.schemas import (
     ActivityItem,
     ActivityListResponse,
+    ActivityPageResponse,
     ActivityType,
     CourseCreate,
     CoursePurchaseCreate,
+    CourseProgressOverview,
     CourseProgressResponse,
     CourseResponse,
     CourseUpdate,
     CourseWithLessonsResponse,
     GeneratedQuizList,
+    ItemPosition,
+    LessonAnswersCreate,
+    LessonAnswersResponse,
     LessonProgressResponse,
     LessonProgressSummary,
+    LessonUpsert,
     LessonWithQuizzesResponse,
     QuizAnswerCreate,
     QuizResponse,
     QuizResultItem,
+    QuizUpsert,
 )
+from src.pagination import decode_cursor, encode_cursor, paginate
 
 logger = logging.getLogger(__name__)
 
+_course_table: sa.Table = Course.__table__  # type: ignore[attr-defined]
+_course_purchase_table: sa.Table = CoursePurchase.__table__  # type: ignore[attr-defined]
+_lesson_table: sa.Table = Lesson.__table__  # type: ignore[attr-defined]
+_payback_table: sa.Table = PaybackTransaction.__table__  # type: ignore[attr-defined]
+_quiz_table: sa.Table = Quiz.__table__  # type: ignore[attr-defined]
+_quiz_answer_table: sa.Table = QuizAnswer.__table__  # type: ignore[attr-defined]
+
+
 # ---------------------------------------------------------------------------
 # Course
 # ---------------------------------------------------------------------------
@@ -79,17 +117,123 @@ def _course_to_response(
     )
 
 
-async def get_courses(
-    session: AsyncSession, *, offset: int = 0, limit: int = 100
-) -> list[CourseResponse]:
-    result = await session.exec(select(Course).offset(offset).limit(limit))
-    courses = list(result.all())
-    wallet_map = await _get_author_wallet_map(session, {c.author_id for c in courses})
-    return [_course_to_response(c, wallet_map) for c in courses]
+async def get_course_rows(
+    session: AsyncSession,
+    *,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[CourseRow]:
+    """List courses ordered by ``(created_at, id)``, as lightweight rows.
+
+    When *cursor* is given, *offset* is ignored and the page starts right
+    after the row the cursor points to.  The author wallet comes from an
+    outer join instead of a second query.
+    """
+    course = _course_table
+    statement = paginate(
+        sa.select(
+            *row_columns(
+                course,
+                CourseRow,
+                author_wallet_address=sa.func.coalesce(User.wallet_address, ""),
+                platform_wallet_address=sa.literal(
+                    settings.PLATFORM_WALLET_ADDRESS, sa.Text
+                ),
+            )
+        )
+        .select_from(course.outerjoin(User, User.id == course.c.author_id))  # type: ignore[arg-type]
+        .where(course.c.deleted_at.is_(None))
+        .order_by(course.c.created_at, course.c.id),
+        (course.c.created_at, course.c.id),
+        (datetime, uuid.UUID),
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    result = await session.exec(statement)
+    return [CourseRow(*row) for row in result]
+
+
+async def search_course_rows(
+    session: AsyncSession,
+    *,
+    query: str | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    author_id: uuid.UUID | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[CourseRow], tuple | None]:
+    """Search courses by text, price range and author.
+
+    With *query* (web-search syntax: words, ``"phrases"``, ``-excluded``)
+    matches come from the GIN index on ``course.search_vector`` and are
+    ranked best first, title hits above description hits; without it,
+    newest courses come first.  Either way pages are keyset-paginated.
+
+    Returns the rows and the sort key of the last one (for the next cursor).
+    """
+    course = _course_table
+    statement = sa.select(
+        *row_columns(
+            course,
+            CourseRow,
+            author_wallet_address=sa.func.coalesce(User.wallet_address, ""),
+            platform_wallet_address=sa.literal(
+                settings.PLATFORM_WALLET_ADDRESS, sa.Text
+            ),
+        )
+    ).select_from(
+        course.outerjoin(User, User.id == course.c.author_id)  # type: ignore[arg-type]
+    ).where(course.c.deleted_at.is_(None))
+
+    if min_price is not None:
+        statement = statement.where(course.c.price_planck >= to_planck(min_price))
+    if max_price is not None:
+        statement = statement.where(course.c.price_planck <= to_planck(max_price))
+    if author_id is not None:
+        statement = statement.where(course.c.author_id == author_id)
+
+    if query:
+        ts_query = sa.func.websearch_to_tsquery(
+            sa.literal_column(f"'{COURSE_SEARCH_CONFIG}'::regconfig"), query
+        )
+        # float8 so the rank survives the cursor round trip exactly
+        rank = sa.func.ts_rank_cd(course.c.search_vector, ts_query).cast(sa.Double)
+        keys: tuple = (rank, course.c.id)
+        types: tuple[type, ...] = (float, uuid.UUID)
+        statement = statement.add_columns(rank.label("rank")).where(
+            course.c.search_vector.op("@@")(ts_query)
+        )
+    else:
+        keys = (course.c.created_at, course.c.id)
+        types = (datetime, uuid.UUID)
+    statement = paginate(
+        statement.order_by(*(key.desc() for key in keys)),
+        keys,
+        types,
+        offset=0,
+        limit=limit,
+        cursor=cursor,
+        descending=True,
+    )
+
+    result = (await session.exec(statement)).all()
+    if not result:
+        return [], None
+    last = result[-1]
+    if query:
+        return [CourseRow(*row[:-1]) for row in result], (last.rank, last.id)
+    return [CourseRow(*row) for row in result], (last.created_at, last.id)
 
 
 async def get_course_by_id(session: AsyncSession, course_id: UUID4) -> Course | None:
-    return await session.get(Course, course_id)
+    """The course, or ``None`` if it does not exist or is being deleted."""
+    course = await session.get(Course, course_id)
+    if course is None or course.deleted_at is not None:
+        return None
+    return course
 
 
 async def get_course_response(session: AsyncSession, course: Course) -> CourseResponse:
@@ -98,9 +242,132 @@ async def get_course_response(session: AsyncSession, course: Course) -> CourseRe
     return _course_to_response(course, wallet_map)
 
 
-async def delete_course(session: AsyncSession, course: Course) -> None:
-    await session.delete(course)
+async def delete_course(session: AsyncSession, course: Course) -> bool:
+    """Delete *course*; the database cascades to all of its rows.
+
+    When the course has more than ``COURSE_DELETE_SYNC_MAX_ANSWERS`` quiz
+    answers it is only marked deleted (hidden from reads and purchases) and
+    ``False`` is returned: the caller should then schedule ``purge_course``
+    instead of holding the request (and the row locks) for the whole
+    cascade; ``purge_deleted_courses`` finishes purges that were lost.
+    Counting stops at the threshold, so this check costs the same for any
+    course size.
+    """
+    limit = settings.COURSE_DELETE_SYNC_MAX_ANSWERS
+    sample = (
+        _course_answers(course.id, _quiz_answer_table.c.id).limit(limit + 1).subquery()
+    )
+    answers = await session.scalar(sa.select(sa.func.count()).select_from(sample))
+    if answers and answers > limit:
+        await session.exec(
+            sa.update(_course_table)  # type: ignore[call-overload]
+            .where(_course_table.c.id == course.id)
+            .values(deleted_at=sa.func.now())
+        )
+        await session.commit()
+        return False
+
+    await session.exec(
+        sa.delete(_course_table).where(_course_table.c.id == course.id)  # type: ignore[call-overload]
+    )
     await session.commit()
+    return True
+
+
+def _course_answers(course_id: uuid.UUID, *columns: sa.ColumnElement) -> sa.Select:
+    """``SELECT <columns>`` over every quiz answer of a course."""
+    answer, quiz, lesson = _quiz_answer_table, _quiz_table, _lesson_table
+    return (
+        sa.select(*columns)
+        .select_from(
+            answer.join(quiz, quiz.c.id == answer.c.quiz_id).join(
+                lesson, lesson.c.id == quiz.c.lesson_id
+            )
+        )
+        .where(lesson.c.course_id == course_id)
+    )
+
+
+async def purge_course(course_id: uuid.UUID) -> None:
+    """Background deletion of a large course.
+
+    Quiz answers (by far the largest child table) are deleted in batches of
+    ``COURSE_DELETE_BATCH_SIZE``, each in its own short transaction, and then
+    the course row itself, which cascades to the remaining smaller tables.
+    Safe to run again if it is interrupted; a purge of the same course that
+    is already running (in any worker) is left to finish on its own.
+    """
+    from src.database import engine
+
+    batch_size = settings.COURSE_DELETE_BATCH_SIZE
+    batch = sa.delete(_quiz_answer_table).where(
+        _quiz_answer_table.c.id.in_(
+            _course_answers(course_id, _quiz_answer_table.c.id).limit(batch_size)
+        )
+    )
+    lock_key = sa.func.hashtextextended(str(course_id), 0)
+    try:
+        async with engine.connect() as lock_conn:
+            locked = await lock_conn.scalar(
+                sa.select(sa.func.pg_try_advisory_lock(lock_key))
+            )
+            if not locked:
+                return
+            try:
+                deleted = await _purge_course(engine, course_id, batch, batch_size)
+            finally:
+                await lock_conn.execute(
+                    sa.select(sa.func.pg_advisory_unlock(lock_key))
+                )
+                await lock_conn.commit()
+        logger.info("Purged course %s (%d quiz answers).", course_id, deleted)
+    except Exception:
+        logger.exception("Background purge of course %s failed.", course_id)
+
+
+async def _purge_course(
+    engine: AsyncEngine, course_id: uuid.UUID, batch: sa.Delete, batch_size: int
+) -> int:
+    from src.database import NO_STATEMENT_TIMEOUT
+
+    deleted = 0
+    while True:
+        async with AsyncSession(engine) as purge_session:
+            await purge_session.exec(NO_STATEMENT_TIMEOUT)  # type: ignore[call-overload]
+            result = await purge_session.exec(batch)  # type: ignore[call-overload]
+            await purge_session.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+
+    # The course row cascades to every remaining lesson, quiz and purchase
+    async with AsyncSession(engine) as purge_session:
+        await purge_session.exec(NO_STATEMENT_TIMEOUT)  # type: ignore[call-overload]
+        await purge_session.exec(
+            sa.delete(_course_table).where(_course_table.c.id == course_id)  # type: ignore[call-overload]
+        )
+        await purge_session.commit()
+    return deleted
+
+
+async def purge_deleted_courses() -> None:
+    """Finish the purge of every course still marked deleted.
+
+    Run at startup: a purge scheduled as a background task is lost if its
+    worker stops before it finishes.
+    """
+    from src.database import engine
+
+    async with engine.connect() as conn:
+        course_ids = (
+            await conn.scalars(
+                sa.select(_course_table.c.id).where(
+                    _course_table.c.deleted_at.is_not(None)
+                )
+            )
+        ).all()
+    for course_id in course_ids:
+        await purge_course(course_id)
 
 
 # ---------------------------------------------------------------------------
@@ -108,26 +375,36 @@ async def delete_course(session: AsyncSession, course: Course) -> None:
 # ---------------------------------------------------------------------------
 
 
+def _payback_reserve_planck(lessons: list) -> int:
+    """Sum of the lessons' ``payback_amount`` in planck."""
+    return sum(to_planck(l.payback_amount) for l in lessons)
+
+
 def _validate_course_economics(price: float, lessons: list) -> None:
     """Raise CoursePaybackExceedsPrice if total paybacks + platform fee > price.
 
+    The check is done in planck with the same split used at settlement, so
+    a course that validates here can always be settled.
+
     Args:
         price: Course price in token units.
         lessons: List of LessonUpsert (or similar with payback_amount attribute).
     """
-    if price <= 0:
+    price_planck = to_planck(price)
+    total_payback = _payback_reserve_planck(lessons)
+    if price_planck <= 0:
         # Free courses: all paybacks must be 0
-        total_payback = sum(l.payback_amount for l in lessons)
         if total_payback > 0:
             raise CoursePaybackExceedsPrice("Free courses cannot have payback amounts.")
         return
 
-    total_payback = sum(l.payback_amount for l in lessons)
-    platform_fee = price * settings.PLATFORM_FEE_RATE
-    if total_payback + platform_fee > price:
+    platform_fee = split_payment(price_planck, total_payback).platform_fee
+    if total_payback + platform_fee > price_planck:
         raise CoursePaybackExceedsPrice(
-            f"Total payback ({total_payback}) + platform fee ({platform_fee:.4f}) "
-            f"= {total_payback + platform_fee:.4f} exceeds course price ({price})."
+            f"Total payback ({from_planck(total_payback)}) + platform fee "
+            f"({from_planck(platform_fee):.4f}) = "
+            f"{from_planck(total_payback + platform_fee):.4f} exceeds course price "
+            f"({price})."
         )
 
 
@@ -196,60 +473,103 @@ async def _build_course_with_lessons_response(
 
 
 # ---------------------------------------------------------------------------
-# Helper: sync quizzes for a lesson (desired-state)
+# Helpers: set-based lesson/quiz writes
+#
+# Lesson and quiz IDs are generated client-side so rows can be written with
+# multi-row INSERTs and batched (executemany) UPDATEs, without a flush per
+# lesson to learn its primary key.
 # ---------------------------------------------------------------------------
-async def _sync_quizzes_for_lesson(
-    session: AsyncSession,
-    lesson_id: uuid.UUID,
-    quiz_upserts: list,
+_LESSON_FIELDS = ("title", "description", "video_url", "payback_amount", "lesson_index")
+_QUIZ_FIELDS = (
+    "question",
+    "option_a",
+    "option_b",
+    "option_c",
+    "option_d",
+    "correct_option",
+    "quiz_index",
+)
+
+
+def _lesson_values(lesson_data: LessonUpsert) -> dict:
+    return {field: getattr(lesson_data, field) for field in _LESSON_FIELDS}
+
+
+def _quiz_values(quiz_data: QuizUpsert) -> dict:
+    return {field: getattr(quiz_data, field) for field in _QUIZ_FIELDS}
+
+
+def _bulk_update_params(row_id: uuid.UUID, values: dict) -> dict:
+    return {"b_id": row_id, **{f"b_{k}": v for k, v in values.items()}}
+
+
+async def _bulk_insert(
+    session: AsyncSession, table: sa.Table, rows: list[dict]
 ) -> None:
-    """Create, update, or delete quizzes for a lesson based on desired state."""
+    """Insert *rows* with a single multi-row ``INSERT``."""
+    if rows:
+        await session.exec(sa.insert(table), params=rows)
 
-    # Get existing quizzes
-    result = await session.exec(
-        select(Quiz).where(Quiz.lesson_id == lesson_id)  # type: ignore[arg-type]
-    )
-    existing_quizzes = {q.id: q for q in result.all()}
-
-    # IDs present in the request
-    request_ids: set[uuid.UUID] = set()
-    for qd in quiz_upserts:
-        if qd.id:
-            request_ids.add(qd.id)
-
-    # Delete quizzes not in the request
-    for existing_id, existing_quiz in existing_quizzes.items():
-        if existing_id not in request_ids:
-            await session.delete(existing_quiz)
-
-    # Create or update quizzes
-    for qd in quiz_upserts:
-        if qd.id and qd.id in existing_quizzes:
-            # Update existing quiz
-            quiz = existing_quizzes[qd.id]
-            quiz.question = qd.question
-            quiz.option_a = qd.option_a
-            quiz.option_b = qd.option_b
-            quiz.option_c = qd.option_c
-            quiz.option_d = qd.option_d
-            quiz.correct_option = qd.correct_option
-            quiz.quiz_index = qd.quiz_index
-            quiz.lesson_id = lesson_id
-            session.add(quiz)
-        else:
-            # Create new quiz
-            quiz = Quiz(
-                id=uuid.uuid4(),
-                question=qd.question,
-                option_a=qd.option_a,
-                option_b=qd.option_b,
-                option_c=qd.option_c,
-                option_d=qd.option_d,
-                correct_option=qd.correct_option,
-                quiz_index=qd.quiz_index,
-                lesson_id=lesson_id,
+
+async def _bulk_update(
+    session: AsyncSession, table: sa.Table, fields: tuple[str, ...], rows: list[dict]
+) -> None:
+    """Run ``UPDATE <table> SET <fields> WHERE id = :b_id`` as one executemany."""
+    if rows:
+        statement = (
+            sa.update(table)
+            .where(table.c.id == sa.bindparam("b_id"))
+            .values(
+                {field: sa.bindparam(f"b_{field}") for field in fields}
+                | {"updated_at": sa.func.now()}
             )
-            session.add(quiz)
+        )
+        await session.exec(statement, params=rows)
+
+
+async def _bulk_delete(
+    session: AsyncSession, table: sa.Table, ids: list[uuid.UUID]
+) -> None:
+    """Delete rows by ID; dependants are removed by ``ON DELETE CASCADE``."""
+    if ids:
+        await session.exec(sa.delete(table).where(table.c.id.in_(ids)))
+
+
+def _respace_lessons(lessons: list[LessonUpsert]) -> list[LessonUpsert]:
+    """Sort *lessons* and their quizzes by the client's indexes and store
+    them ``INDEX_GAP`` apart (see "Ordering" below)."""
+    return [
+        lesson.model_copy(
+            update={
+                "lesson_index": _gap_index(i),
+                "quizzes": [
+                    quiz.model_copy(update={"quiz_index": _gap_index(j)})
+                    for j, quiz in enumerate(
+                        sorted(lesson.quizzes, key=lambda q: q.quiz_index)
+                    )
+                ],
+            }
+        )
+        for i, lesson in enumerate(sorted(lessons, key=lambda l: l.lesson_index))
+    ]
+
+
+def _new_lesson_rows(
+    course_id: uuid.UUID, lessons: list[LessonUpsert]
+) -> tuple[list[dict], list[dict]]:
+    """Build INSERT rows for brand-new lessons and all of their quizzes."""
+    lesson_rows: list[dict] = []
+    quiz_rows: list[dict] = []
+    for lesson_data in lessons:
+        lesson_id = uuid.uuid4()
+        lesson_rows.append(
+            {"id": lesson_id, "course_id": course_id, **_lesson_values(lesson_data)}
+        )
+        quiz_rows.extend(
+            {"id": uuid.uuid4(), "lesson_id": lesson_id, **_quiz_values(qd)}
+            for qd in lesson_data.quizzes
+        )
+    return lesson_rows, quiz_rows
 
 
 # ---------------------------------------------------------------------------
@@ -296,42 +616,22 @@ async def create_course_with_lessons(
         title=data.title,
         description=data.description,
         price=data.price,
+        price_planck=to_planck(data.price),
+        total_payback_reserve_planck=_payback_reserve_planck(data.lessons),
         course_pool_address=pool_address,
         author_id=author_id,
     )
     session.add(course)
 
-    # Flush so that course.id is available for FK references
+    # Flush so the course row exists before the lessons reference it
     await session.flush()
 
-    # Create lessons and their quizzes
-    for lesson_data in data.lessons:
-        lesson = Lesson(
-            id=uuid.uuid4(),
-            title=lesson_data.title,
-            description=lesson_data.description,
-            video_url=lesson_data.video_url,
-            payback_amount=lesson_data.payback_amount,
-            lesson_index=lesson_data.lesson_index,
-            course_id=course.id,
-        )
-        session.add(lesson)
-        await session.flush()
-
-        # Create quizzes for this lesson
-        for qd in lesson_data.quizzes:
-            quiz = Quiz(
-                id=uuid.uuid4(),
-                question=qd.question,
-                option_a=qd.option_a,
-                option_b=qd.option_b,
-                option_c=qd.option_c,
-                option_d=qd.option_d,
-                correct_option=qd.correct_option,
-                quiz_index=qd.quiz_index,
-                lesson_id=lesson.id,
-            )
-            session.add(quiz)
+    # Create lessons and their quizzes with one multi-row INSERT per table
+    lesson_rows, quiz_rows = _new_lesson_rows(
+        course.id, _respace_lessons(data.lessons)
+    )
+    await _bulk_insert(session, _lesson_table, lesson_rows)
+    await _bulk_insert(session, _quiz_table, quiz_rows)
 
     await session.commit()
     await session.refresh(course)
@@ -358,73 +658,65 @@ async def update_course_with_lessons(
     course.title = data.title
     course.description = data.description
     course.price = data.price
+    course.price_planck = to_planck(data.price)
+    course.total_payback_reserve_planck = _payback_reserve_planck(data.lessons)
     course.course_pool_address = data.course_pool_address
     session.add(course)
 
     # Flush so that course changes are persisted
     await session.flush()
 
-    # --- Lessons: desired-state sync ---
+    # --- Load existing lesson and quiz IDs for the whole course in one query ---
     result = await session.exec(
-        select(Lesson).where(Lesson.course_id == course.id)  # type: ignore[arg-type]
+        select(Lesson.id, Quiz.id)  # type: ignore[call-overload]
+        .outerjoin(Quiz, Quiz.lesson_id == Lesson.id)
+        .where(Lesson.course_id == course.id)
     )
-    existing_lessons = {lesson.id: lesson for lesson in result.all()}
-
-    # IDs present in the request (only for lessons that have an id)
-    request_ids: set[uuid.UUID] = set()
-    for lesson_data in data.lessons:
-        if lesson_data.id:
-            request_ids.add(lesson_data.id)
-
-    # Delete lessons not in the request (cascade deletes their quizzes)
-    for existing_id, existing_lesson in existing_lessons.items():
-        if existing_id not in request_ids:
-            await session.delete(existing_lesson)
-
-    # Create or update lessons (and sync their quizzes)
-    for lesson_data in data.lessons:
-        if lesson_data.id and lesson_data.id in existing_lessons:
-            # Update existing lesson
-            lesson = existing_lessons[lesson_data.id]
-            lesson.title = lesson_data.title
-            lesson.description = lesson_data.description
-            lesson.video_url = lesson_data.video_url
-            lesson.payback_amount = lesson_data.payback_amount
-            lesson.lesson_index = lesson_data.lesson_index
-            lesson.course_id = course.id
-            session.add(lesson)
-            await session.flush()
-
-            # Sync quizzes for this existing lesson
-            await _sync_quizzes_for_lesson(session, lesson.id, lesson_data.quizzes)
-        else:
-            # Create new lesson
-            lesson = Lesson(
-                id=uuid.uuid4(),
-                title=lesson_data.title,
-                description=lesson_data.description,
-                video_url=lesson_data.video_url,
-                payback_amount=lesson_data.payback_amount,
-                lesson_index=lesson_data.lesson_index,
-                course_id=course.id,
-            )
-            session.add(lesson)
-            await session.flush()
-
-            # Create quizzes for the new lesson
-            for qd in lesson_data.quizzes:
-                quiz = Quiz(
-                    id=uuid.uuid4(),
-                    question=qd.question,
-                    option_a=qd.option_a,
-                    option_b=qd.option_b,
-                    option_c=qd.option_c,
-                    option_d=qd.option_d,
-                    correct_option=qd.correct_option,
-                    quiz_index=qd.quiz_index,
-                    lesson_id=lesson.id,
+    existing_quizzes: dict[uuid.UUID, set[uuid.UUID]] = {}
+    for lesson_id, quiz_id in result.all():
+        quiz_ids = existing_quizzes.setdefault(lesson_id, set())
+        if quiz_id is not None:
+            quiz_ids.add(quiz_id)
+
+    # --- Diff the desired state against the existing rows ---
+    lessons = _respace_lessons(data.lessons)
+    kept_lessons = [l for l in lessons if l.id and l.id in existing_quizzes]
+    new_lessons = [l for l in lessons if not (l.id and l.id in existing_quizzes)]
+    kept_lesson_ids = {l.id for l in kept_lessons}
+
+    # Lessons not in the request are deleted (quizzes, answers, paybacks cascade)
+    lesson_deletes = [lid for lid in existing_quizzes if lid not in kept_lesson_ids]
+    lesson_updates = [
+        _bulk_update_params(l.id, _lesson_values(l))  # type: ignore[arg-type]
+        for l in kept_lessons
+    ]
+    lesson_inserts, quiz_inserts = _new_lesson_rows(course.id, new_lessons)
+
+    quiz_deletes: list[uuid.UUID] = []
+    quiz_updates: list[dict] = []
+    for lesson_data in kept_lessons:
+        lesson_quiz_ids = existing_quizzes[lesson_data.id]  # type: ignore[index]
+        request_ids = {qd.id for qd in lesson_data.quizzes if qd.id}
+        quiz_deletes.extend(qid for qid in lesson_quiz_ids if qid not in request_ids)
+        for qd in lesson_data.quizzes:
+            if qd.id and qd.id in lesson_quiz_ids:
+                quiz_updates.append(_bulk_update_params(qd.id, _quiz_values(qd)))
+            else:
+                quiz_inserts.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "lesson_id": lesson_data.id,
+                        **_quiz_values(qd),
+                    }
                 )
-                session.add(quiz)
+
+    # --- Apply the diff: at most one statement per operation and table ---
+    await _bulk_delete(session, _quiz_table, quiz_deletes)
+    await _bulk_delete(session, _lesson_table, lesson_deletes)
+    await _bulk_update(session, _lesson_table, _LESSON_FIELDS, lesson_updates)
+    await _bulk_insert(session, _lesson_table, lesson_inserts)
+    await _bulk_update(session, _quiz_table, _QUIZ_FIELDS, quiz_updates)
+    await _bulk_insert(session, _quiz_table, quiz_inserts)
 
     await session.commit()
     await session.refresh(course)
@@ -433,19 +725,197 @@ async def update_course_with_lessons(
 
 
 # ---------------------------------------------------------------------------
-# Lesson (read-only)
+# Ordering: lesson_index / quiz_index
+#
+# Siblings are stored INDEX_GAP apart, so moving or appending one item
+# normally writes only that row (at the midpoint between its new
+# neighbours).  Only when the neighbours have no free index left between
+# them are all siblings re-spaced, with a single UPDATE ... FROM (VALUES ...).
 # ---------------------------------------------------------------------------
-async def get_lessons_by_course(
-    session: AsyncSession, course_id: UUID4, *, offset: int = 0, limit: int = 100
-) -> list[Lesson]:
+INDEX_GAP = 1024
+_INDEX_COLUMNS = {"lesson": "lesson_index", "quiz": "quiz_index"}
+
+
+def _gap_index(position: int) -> int:
+    return (position + 1) * INDEX_GAP
+
+
+async def _sibling_order(
+    session: AsyncSession, table: sa.Table, parent: str, parent_id: uuid.UUID
+) -> list[tuple[uuid.UUID, int]]:
+    """``(id, index)`` of every child of *parent_id*, in display order."""
+    index = table.c[_INDEX_COLUMNS[table.name]]
     result = await session.exec(
-        select(Lesson)
-        .where(Lesson.course_id == course_id)  # type: ignore[arg-type]
-        .order_by(Lesson.lesson_index)  # type: ignore[arg-type]
-        .offset(offset)
-        .limit(limit)
+        sa.select(table.c.id, index)  # type: ignore[call-overload]
+        .where(table.c[parent] == parent_id)
+        .order_by(index, table.c.id)
+    )
+    return [(row_id, row_index) for row_id, row_index in result]
+
+
+async def _apply_order(
+    session: AsyncSession,
+    table: sa.Table,
+    parent: str,
+    parent_id: uuid.UUID,
+    ids: list[uuid.UUID],
+) -> list[ItemPosition]:
+    """Re-space *ids* ``INDEX_GAP`` apart in the given order, in one UPDATE."""
+    column = _INDEX_COLUMNS[table.name]
+    positions = [
+        ItemPosition(id=row_id, index=_gap_index(i)) for i, row_id in enumerate(ids)
+    ]
+    new_order = sa.values(
+        sa.column("id", table.c.id.type),
+        sa.column("idx", sa.Integer),
+        name="new_order",
+    ).data([(p.id, p.index) for p in positions])
+    await session.exec(
+        sa.update(table)  # type: ignore[call-overload]
+        .where(table.c.id == new_order.c.id, table.c[parent] == parent_id)
+        .values({column: new_order.c.idx, "updated_at": sa.func.now()})
     )
-    return list(result.all())
+    return positions
+
+
+async def _reorder(
+    session: AsyncSession,
+    table: sa.Table,
+    parent: str,
+    parent_id: uuid.UUID,
+    ids: list[uuid.UUID],
+) -> list[ItemPosition]:
+    siblings = await _sibling_order(session, table, parent, parent_id)
+    if len(set(ids)) != len(ids) or set(ids) != {row_id for row_id, _ in siblings}:
+        raise InvalidOrder(f"The new order must list every {table.name} exactly once.")
+    positions = await _apply_order(session, table, parent, parent_id, ids)
+    await session.commit()
+    return positions
+
+
+async def _move(
+    session: AsyncSession,
+    table: sa.Table,
+    parent: str,
+    parent_id: uuid.UUID,
+    item_id: uuid.UUID,
+    after_id: uuid.UUID | None,
+) -> list[ItemPosition]:
+    siblings = [
+        (row_id, index)
+        for row_id, index in await _sibling_order(session, table, parent, parent_id)
+        if row_id != item_id
+    ]
+    if after_id is None:
+        slot = 0
+    else:
+        slot = next(
+            (i + 1 for i, (row_id, _) in enumerate(siblings) if row_id == after_id),
+            None,
+        )
+        if slot is None:
+            raise InvalidOrder(
+                f"{after_id} is not another {table.name} of the same parent."
+            )
+
+    # Free indexes lie strictly between the neighbours (indexes are >= 0)
+    lower = siblings[slot - 1][1] if slot else -1
+    upper = siblings[slot][1] if slot < len(siblings) else lower + 2 * INDEX_GAP
+    if upper - lower < 2:
+        ids = [row_id for row_id, _ in siblings]
+        ids.insert(slot, item_id)
+        positions = await _apply_order(session, table, parent, parent_id, ids)
+    else:
+        if slot == len(siblings):
+            new_index = max(lower, 0) + INDEX_GAP  # append: leave a full gap
+        else:
+            new_index = (lower + upper) // 2
+        await session.exec(
+            sa.update(table)  # type: ignore[call-overload]
+            .where(table.c.id == item_id)
+            .values(
+                {_INDEX_COLUMNS[table.name]: new_index, "updated_at": sa.func.now()}
+            )
+        )
+        positions = [ItemPosition(id=item_id, index=new_index)]
+    await session.commit()
+    return positions
+
+
+async def get_lesson_author_id(
+    session: AsyncSession, lesson_id: uuid.UUID
+) -> uuid.UUID | None:
+    """Author of the course that *lesson_id* belongs to."""
+    return await session.scalar(
+        sa.select(_course_table.c.author_id)
+        .join(_lesson_table, _lesson_table.c.course_id == _course_table.c.id)
+        .where(_lesson_table.c.id == lesson_id)
+    )
+
+
+async def reorder_lessons(
+    session: AsyncSession, course: Course, lesson_ids: list[uuid.UUID]
+) -> list[ItemPosition]:
+    """Apply a new order to all lessons of *course*."""
+    return await _reorder(session, _lesson_table, "course_id", course.id, lesson_ids)
+
+
+async def move_lesson(
+    session: AsyncSession, lesson: Lesson, after_id: uuid.UUID | None
+) -> list[ItemPosition]:
+    """Move *lesson* after *after_id* (to the front when ``None``).
+
+    Returns the lessons whose index changed — usually just *lesson*.
+    """
+    return await _move(
+        session, _lesson_table, "course_id", lesson.course_id, lesson.id, after_id
+    )
+
+
+async def reorder_quizzes(
+    session: AsyncSession, lesson: Lesson, quiz_ids: list[uuid.UUID]
+) -> list[ItemPosition]:
+    """Apply a new order to all quizzes of *lesson*."""
+    return await _reorder(session, _quiz_table, "lesson_id", lesson.id, quiz_ids)
+
+
+async def move_quiz(
+    session: AsyncSession, quiz: Quiz, after_id: uuid.UUID | None
+) -> list[ItemPosition]:
+    """Move *quiz* after *after_id* (to the front when ``None``).
+
+    Returns the quizzes whose index changed — usually just *quiz*.
+    """
+    return await _move(
+        session, _quiz_table, "lesson_id", quiz.lesson_id, quiz.id, after_id
+    )
+
+
+# ---------------------------------------------------------------------------
+# Lesson (read-only)
+# ---------------------------------------------------------------------------
+async def get_lesson_rows(
+    session: AsyncSession,
+    course_id: UUID4,
+    *,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[LessonRow]:
+    """List a course's lessons ordered by ``(lesson_index, id)``, as rows."""
+    lesson = _lesson_table
+    statement = paginate(
+        sa.select(*row_columns(lesson, LessonRow))
+        .where(lesson.c.course_id == course_id)
+        .order_by(lesson.c.lesson_index, lesson.c.id),
+        (lesson.c.lesson_index, lesson.c.id),
+        (int, uuid.UUID),
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
+    )
+    result = await session.exec(statement)
+    return [LessonRow(*row) for row in result]
 
 
 async def get_lesson_by_id(session: AsyncSession, lesson_id: UUID4) -> Lesson | None:
@@ -455,17 +925,28 @@ async def get_lesson_by_id(session: AsyncSession, lesson_id: UUID4) -> Lesson |
 # ---------------------------------------------------------------------------
 # Quiz
 # ---------------------------------------------------------------------------
-async def get_quizzes_by_lesson(
-    session: AsyncSession, lesson_id: UUID4, *, offset: int = 0, limit: int = 100
-) -> list[Quiz]:
-    result = await session.exec(
-        select(Quiz)
-        .where(Quiz.lesson_id == lesson_id)  # type: ignore[arg-type]
-        .order_by(Quiz.quiz_index)  # type: ignore[arg-type]
-        .offset(offset)
-        .limit(limit)
+async def get_quiz_rows(
+    session: AsyncSession,
+    lesson_id: UUID4,
+    *,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[QuizRow]:
+    """List a lesson's quizzes ordered by ``(quiz_index, id)``, as lightweight rows."""
+    quiz = _quiz_table
+    statement = paginate(
+        sa.select(*row_columns(quiz, QuizRow))
+        .where(quiz.c.lesson_id == lesson_id)
+        .order_by(quiz.c.quiz_index, quiz.c.id),
+        (quiz.c.quiz_index, quiz.c.id),
+        (int, uuid.UUID),
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
     )
-    return list(result.all())
+    result = await session.exec(statement)
+    return [QuizRow(*row) for row in result]
 
 
 async def gen_quiz(
@@ -530,9 +1011,13 @@ async def gen_quiz(
         raise QuizGenerationFailed(detail=str(exc)) from exc
 
     # --- Persist generated quizzes ---
-    # Determine the starting index based on existing quizzes
-    existing_quizzes = await get_quizzes_by_lesson(session, lesson.id)
-    start_index = max((q.quiz_index for q in existing_quizzes), default=-1) + 1
+    # Append after the lesson's last quiz, INDEX_GAP apart
+    last_index = await session.scalar(
+        sa.select(sa.func.max(_quiz_table.c.quiz_index)).where(
+            _quiz_table.c.lesson_id == lesson.id
+        )
+    )
+    start_index = (last_index or 0) + INDEX_GAP
 
     quizzes: list[Quiz] = []
     for i, item in enumerate(result.items):
@@ -544,7 +1029,7 @@ async def gen_quiz(
             option_c=item.option_c,
             option_d=item.option_d,
             correct_option=item.correct_option,
-            quiz_index=start_index + i,
+            quiz_index=start_index + i * INDEX_GAP,
             lesson_id=lesson.id,
         )
         session.add(quiz)
@@ -690,8 +1175,6 @@ async def _try_send_payback(quiz_id: uuid.UUID, user_id: uuid.UUID) -> None:
     4. No PaybackTransaction exists yet for this (user_id, lesson_id)
     5. The user has purchased the course (not the author)
     """
-    from sqlalchemy.exc import IntegrityError
-
     from src.database import engine
 
     async with AsyncSession(engine) as pb_session:
@@ -728,7 +1211,7 @@ async def _try_send_payback(quiz_id: uuid.UUID, user_id: uuid.UUID) -> None:
             select(QuizAnswer).where(
                 QuizAnswer.quiz_id.in_(quiz_ids),  # type: ignore[union-attr]
                 QuizAnswer.user_id == user_id,  # type: ignore[arg-type]
-            )
+            ).order_by(QuizAnswer.created_at)  # type: ignore[arg-type]
         )
         answers = list(answers_result.all())
 
@@ -756,101 +1239,249 @@ async def _try_send_payback(quiz_id: uuid.UUID, user_id: uuid.UUID) -> None:
         course = await pb_session.get(Course, lesson.course_id)
         if not course:
             return
-        if course.author_id == user_id:
-            return  # Authors don't get paybacks
+        if not await _has_purchased(pb_session, course, user_id):
+            return
 
-        purchase_result = await pb_session.exec(
-            select(CoursePurchase).where(
-                CoursePurchase.course_id == course.id,  # type: ignore[arg-type]
-                CoursePurchase.user_id == user_id,  # type: ignore[arg-type]
-            )
+        await _send_lesson_payback(pb_session, lesson, user_id)
+
+
+async def _has_purchased(
+    session: AsyncSession, course: Course, user_id: uuid.UUID
+) -> bool:
+    """True if *user_id* bought *course*; authors never count as buyers.
+
+    A ``provisional`` purchase (its payment not final yet) does not count:
+    no payback goes out for a payment that may still be revoked.
+    """
+    if course.author_id == user_id:
+        return False  # Authors don't get paybacks
+    purchase_result = await session.exec(
+        select(CoursePurchase.id)  # type: ignore[call-overload]
+        .where(
+            CoursePurchase.course_id == course.id,  # type: ignore[arg-type]
+            CoursePurchase.user_id == user_id,  # type: ignore[arg-type]
+            CoursePurchase.status.not_in(("provisional", "revoked")),  # type: ignore[union-attr]
         )
-        if not purchase_result.first():
-            return  # No purchase
+        .limit(1)
+    )
+    return purchase_result.first() is not None
 
-        # Get user wallet address for on-chain transfer
-        user = await pb_session.get(User, user_id)
-        if not user:
-            return
 
-        # Send payback on-chain
-        amount_planck = int(lesson.payback_amount * (10**settings.TOKEN_DECIMALS))
-        if amount_planck <= 0:
-            return
+async def _send_lesson_payback(
+    pb_session: AsyncSession, lesson: Lesson, user_id: uuid.UUID
+) -> str | None:
+    """Transfer the lesson payback on-chain and record it.
 
-        logger.info(
-            "Attempting payback: %.4f PAS (%d planck) -> %s (user=%s, lesson=%s)",
-            lesson.payback_amount,
-            amount_planck,
-            user.wallet_address,
+    Eligibility must already have been checked by the caller.  Returns the
+    payback transaction hash, or ``None`` if nothing was recorded.
+    """
+    from sqlalchemy.exc import IntegrityError
+
+    # Get user wallet address for on-chain transfer
+    user = await pb_session.get(User, user_id)
+    if not user:
+        return None
+
+    # Send payback on-chain
+    amount_planck = to_planck(lesson.payback_amount)
+    if amount_planck <= 0:
+        return None
+
+    logger.info(
+        "Attempting payback: %.4f PAS (%d planck) -> %s (user=%s, lesson=%s)",
+        lesson.payback_amount,
+        amount_planck,
+        user.wallet_address,
+        user_id,
+        lesson.id,
+    )
+
+    from src.platform.wallet import async_transfer_payback
+
+    tx_hash = await async_transfer_payback(user.wallet_address, amount_planck)
+
+    # Record the payback transaction
+    payback = PaybackTransaction(
+        id=uuid.uuid4(),
+        user_id=user_id,
+        lesson_id=lesson.id,
+        course_id=lesson.course_id,
+        amount=lesson.payback_amount,
+        transaction_hash=tx_hash,
+    )
+    pb_session.add(payback)
+    try:
+        await pb_session.commit()
+    except IntegrityError:
+        # Race condition: another request already inserted the payback.
+        # The on-chain transfer was already sent (duplicate spend) but
+        # we can't undo that.  Log and move on.
+        await pb_session.rollback()
+        logger.warning(
+            "Payback record already exists for user=%s lesson=%s — "
+            "on-chain transfer %s may be a duplicate.",
             user_id,
             lesson.id,
+            tx_hash,
         )
+        return None
+
+    logger.info(
+        "Payback sent: %.4f PAS -> %s (lesson=%s, tx=%s)",
+        lesson.payback_amount,
+        user.wallet_address,
+        lesson.id,
+        tx_hash,
+    )
+    return tx_hash
 
-        from src.platform.wallet import async_transfer_payback
 
-        tx_hash = await async_transfer_payback(user.wallet_address, amount_planck)
+# ---------------------------------------------------------------------------
+# Lesson answers — batch submission, scored once
+# ---------------------------------------------------------------------------
+async def submit_lesson_answers(
+    session: AsyncSession,
+    lesson: Lesson,
+    data: LessonAnswersCreate,
+    user_id: uuid.UUID,
+) -> LessonAnswersResponse:
+    """Submit answers to many quizzes of *lesson* in one go.
 
-        # Record the payback transaction
-        payback = PaybackTransaction(
-            id=uuid.uuid4(),
-            user_id=user_id,
-            lesson_id=lesson.id,
-            course_id=course.id,
-            amount=lesson.payback_amount,
-            transaction_hash=tx_hash,
+    All answers are written with a single multi-row ``INSERT`` and one
+    commit.  The lesson is then scored once from the submitted answers
+    (plus any earlier answers to quizzes not in this batch), and the
+    payback is sent at most once for the whole submission.
+
+    Raises:
+        QuizNotInLesson: 400 if an answer references a quiz of another lesson.
+    """
+    quizzes_result = await session.exec(
+        select(Quiz)
+        .where(Quiz.lesson_id == lesson.id)  # type: ignore[arg-type]
+        .order_by(Quiz.quiz_index)  # type: ignore[arg-type]
+    )
+    quizzes = list(quizzes_result.all())
+    quiz_ids = {q.id for q in quizzes}
+
+    submitted: dict[uuid.UUID, int] = {}
+    for item in data.answers:
+        if item.quiz_id not in quiz_ids:
+            raise QuizNotInLesson(item.quiz_id)
+        submitted[item.quiz_id] = item.selected_option  # last wins
+
+    # Earlier answers only matter for quizzes this batch does not cover
+    answer_map: dict[uuid.UUID, int] = {}
+    remaining = quiz_ids - submitted.keys()
+    if remaining:
+        previous = await session.exec(
+            select(QuizAnswer.quiz_id, QuizAnswer.selected_option).where(  # type: ignore[call-overload]
+                QuizAnswer.quiz_id.in_(remaining),  # type: ignore[union-attr]
+                QuizAnswer.user_id == user_id,  # type: ignore[arg-type]
+            ).order_by(QuizAnswer.created_at)  # type: ignore[arg-type]
+        )
+        answer_map.update(previous.all())
+    answer_map.update(submitted)
+
+    payback_result = await session.exec(
+        select(PaybackTransaction).where(
+            PaybackTransaction.user_id == user_id,  # type: ignore[arg-type]
+            PaybackTransaction.lesson_id == lesson.id,  # type: ignore[arg-type]
         )
-        pb_session.add(payback)
+    )
+    payback = payback_result.first()
+
+    progress = _build_lesson_progress(lesson.id, quizzes, answer_map, payback)
+
+    # As for single answers: every quiz answered, and a passing score
+    eligible = (
+        payback is None
+        and progress.completed
+        and progress.passed
+        and bool(quizzes)
+        and lesson.payback_amount > 0
+    )
+    if eligible:
+        course = await session.get(Course, lesson.course_id)
+        eligible = course is not None and await _has_purchased(
+            session, course, user_id
+        )
+
+    await _bulk_insert(
+        session,
+        _quiz_answer_table,
+        [
+            {
+                "id": uuid.uuid4(),
+                "quiz_id": quiz_id,
+                "selected_option": selected_option,
+                "user_id": user_id,
+            }
+            for quiz_id, selected_option in submitted.items()
+        ],
+    )
+    await session.commit()
+
+    payback_tx_hash = progress.payback_tx_hash
+    if eligible:
+        # Separate session, as in create_quiz_answer: a failed payback must
+        # not poison the caller's session.
+        from src.database import engine
+
         try:
-            await pb_session.commit()
-        except IntegrityError:
-            # Race condition: another request already inserted the payback.
-            # The on-chain transfer was already sent (duplicate spend) but
-            # we can't undo that.  Log and move on.
-            await pb_session.rollback()
-            logger.warning(
-                "Payback record already exists for user=%s lesson=%s — "
-                "on-chain transfer %s may be a duplicate.",
+            async with AsyncSession(engine) as pb_session:
+                payback_tx_hash = await _send_lesson_payback(
+                    pb_session, lesson, user_id
+                )
+        except Exception:
+            logger.exception(
+                "Payback attempt failed for user=%s lesson=%s — "
+                "the answers were saved but the on-chain transfer did not succeed.",
                 user_id,
                 lesson.id,
-                tx_hash,
             )
-            return
 
-        logger.info(
-            "Payback sent: %.4f PAS -> %s (lesson=%s, tx=%s)",
-            lesson.payback_amount,
-            user.wallet_address,
-            lesson.id,
-            tx_hash,
-        )
+    return LessonAnswersResponse(
+        **progress.model_dump(exclude={"payback_sent", "payback_tx_hash"}),
+        payback_sent=payback_tx_hash is not None,
+        payback_tx_hash=payback_tx_hash,
+        payback_eligible=eligible,
+    )
 
 
 # ---------------------------------------------------------------------------
 # CoursePurchase
 # ---------------------------------------------------------------------------
-async def get_purchases_by_course(
-    session: AsyncSession, course_id: UUID4, *, offset: int = 0, limit: int = 100
-) -> list[CoursePurchase]:
-    result = await session.exec(
-        select(CoursePurchase)
-        .where(CoursePurchase.course_id == course_id)  # type: ignore[arg-type]
-        .offset(offset)
-        .limit(limit)
+async def get_purchase_rows(
+    session: AsyncSession,
+    user_id: UUID4,
+    *,
+    course_id: UUID4 | None = None,
+    offset: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+) -> list[PurchaseRow]:
+    """List a user's purchases ordered by ``(created_at, id)``, as lightweight rows.
+
+    Optionally restricted to a single *course_id*.
+    """
+    purchase = _course_purchase_table
+    statement = (
+        sa.select(*row_columns(purchase, PurchaseRow))
+        .where(purchase.c.user_id == user_id, purchase.c.status != "revoked")
+        .order_by(purchase.c.created_at, purchase.c.id)
     )
-    return list(result.all())
-
-
-async def get_purchases_by_user(
-    session: AsyncSession, user_id: UUID4, *, offset: int = 0, limit: int = 100
-) -> list[CoursePurchase]:
-    result = await session.exec(
-        select(CoursePurchase)
-        .where(CoursePurchase.user_id == user_id)  # type: ignore[arg-type]
-        .offset(offset)
-        .limit(limit)
+    if course_id:
+        statement = statement.where(purchase.c.course_id == course_id)
+    statement = paginate(
+        statement,
+        (purchase.c.created_at, purchase.c.id),
+        (datetime, uuid.UUID),
+        offset=offset,
+        limit=limit,
+        cursor=cursor,
     )
-    return list(result.all())
+    result = await session.exec(statement)
+    return [PurchaseRow(*row) for row in result]
 
 
 async def create_purchase(
@@ -874,13 +1505,19 @@ async def create_purchase(
     Raises:
         TransactionNotFound: 402 if the tx hash is not in recent blocks.
         PaymentVerificationFailed: 402 if the transfer doesn't match.
+        TransactionAlreadyUsed: 409 if the transaction paid for another purchase.
+        CoursePriceUnavailable: 503 if the course's planck price is not set.
     """
+    # 0 until the course_planck_totals migration: any transfer would match
+    if course.price_planck <= 0:
+        raise CoursePriceUnavailable()
+
     tx_hash = data.transaction_hash
 
     # Step 1 – find the block that contains this transaction
     block_hash: str | None = data.block_hash
     if block_hash is None:
-        block_hash = get_block_hash_from_tx(tx_hash)
+        block_hash = await run_light_client(get_block_hash_from_tx, tx_hash)
     if block_hash is None:
         raise TransactionNotFound(tx_hash)
 
@@ -891,84 +1528,196 @@ async def create_purchase(
             "Platform wallet address not configured. Cannot verify payment."
         )
 
-    min_amount = int(course.price * (10**settings.TOKEN_DECIMALS))
+    split = split_payment(course.price_planck, course.total_payback_reserve_planck)
+    min_amount = split.price
 
-    payment = verify_payment(block_hash, platform_address, min_amount)
+    payment = await run_light_client(
+        verify_payment, block_hash, platform_address, min_amount
+    )
     if payment is None:
         raise PaymentVerificationFailed(
             f"No transfer of >= {min_amount} planck to platform wallet {platform_address} "
             f"found in block {block_hash}."
         )
 
-    # Step 3 – calculate fee split
-    price = course.price
-    platform_fee = round(price * settings.PLATFORM_FEE_RATE, 10)
+    # Steps 3-5 – fee split (from the course's denormalised planck totals),
+    # teacher payout and persistence
+    return await settle_purchase(
+        session,
+        course_id=data.course_id,
+        author_id=course.author_id,
+        user_id=user_id,
+        tx_hash=tx_hash,
+        split=split,
+    )
 
-    # Sum all lesson payback amounts for this course
-    lessons_result = await session.exec(
-        select(Lesson).where(Lesson.course_id == course.id)  # type: ignore[arg-type]
+
+async def _pay_teacher(
+    session: AsyncSession, author_id: uuid.UUID, amount_planck: int, course_id: UUID4
+) -> str | None:
+    """Send the teacher's share on-chain; the payout hash, or ``None`` if not sent."""
+    wallet_map = await _get_author_wallet_map(session, {author_id})
+    teacher_wallet = wallet_map.get(author_id)
+    if not teacher_wallet:
+        logger.warning(
+            "No wallet found for author %s; skipping teacher payout.", author_id
+        )
+        return None
+
+    from src.platform.wallet import async_transfer_to_teacher
+
+    try:
+        payout_hash = await async_transfer_to_teacher(teacher_wallet, amount_planck)
+    except Exception:
+        logger.exception(
+            "Teacher payout FAILED: %.4f PAS (%d planck) -> %s for course=%s. "
+            "Purchase will be saved with status='pending'.",
+            from_planck(amount_planck),
+            amount_planck,
+            teacher_wallet,
+            course_id,
+        )
+        # We still record the purchase — teacher payout can be retried
+        return None
+    logger.info(
+        "Teacher payout: %.4f PAS -> %s (tx=%s)",
+        from_planck(amount_planck),
+        teacher_wallet,
+        payout_hash,
     )
-    lessons = list(lessons_result.all())
-    total_payback_reserve = round(sum(l.payback_amount for l in lessons), 10)
+    return payout_hash
 
-    teacher_share = round(price - platform_fee - total_payback_reserve, 10)
-    if teacher_share < 0:
-        teacher_share = 0.0
 
-    # Step 4 – send teacher's share on-chain (if > 0)
-    teacher_payout_hash: str | None = None
-    if teacher_share > 0:
-        wallet_map = await _get_author_wallet_map(session, {course.author_id})
-        teacher_wallet = wallet_map.get(course.author_id)
-        if teacher_wallet:
-            from src.platform.wallet import async_transfer_to_teacher
+async def settle_purchase(
+    session: AsyncSession,
+    *,
+    course_id: UUID4,
+    author_id: uuid.UUID,
+    user_id: uuid.UUID,
+    tx_hash: str,
+    split: FeeSplit,
+    provisional_block: str | None = None,
+) -> CoursePurchase:
+    """Record a verified payment and pay the teacher their share.
 
-            teacher_amount_planck = int(teacher_share * (10**settings.TOKEN_DECIMALS))
-            try:
-                teacher_payout_hash = await async_transfer_to_teacher(
-                    teacher_wallet, teacher_amount_planck
-                )
-                logger.info(
-                    "Teacher payout: %.4f PAS -> %s (tx=%s)",
-                    teacher_share,
-                    teacher_wallet,
-                    teacher_payout_hash,
-                )
-            except Exception:
-                logger.exception(
-                    "Teacher payout FAILED: %.4f PAS (%d planck) -> %s for course=%s. "
-                    "Purchase will be saved with status='pending'.",
-                    teacher_share,
-                    teacher_amount_planck,
-                    teacher_wallet,
-                    course.id,
-                )
-                # We still record the purchase — teacher payout can be retried
-        else:
-            logger.warning(
-                "No wallet found for author %s; skipping teacher payout.",
-                course.author_id,
-            )
+    The purchase is inserted (as ``pending``) *before* the payout: the
+    unique ``transaction_hash`` makes that insert the claim on the payment,
+    so of any number of requests settling the same transaction, on any
+    worker, only one pays the teacher.  The others get the recorded
+    purchase back when it is for the same course and user.  A ``revoked``
+    purchase of the same course and user is reinstated by the claim.
 
-    # Step 5 – persist
-    purchase = CoursePurchase(
+    A payment only seen in a best block (*provisional_block*, not finalized
+    yet) is recorded as ``provisional`` and not paid out: the finality
+    confirmer calls ``pay_confirmed_purchase`` once the block is final.
+
+    Raises:
+        TransactionAlreadyUsed: 409 if the transaction paid for another
+            purchase.
+    """
+    purchase_table = _course_purchase_table
+    values = insert(purchase_table).values(
         id=uuid.uuid4(),
-        course_id=data.course_id,
+        course_id=course_id,
         user_id=user_id,
         transaction_hash=tx_hash,
-        amount=price,
-        platform_fee_amount=platform_fee,
-        payback_reserve_amount=total_payback_reserve,
-        teacher_payout_amount=teacher_share,
-        teacher_payout_hash=teacher_payout_hash,
-        status="completed" if teacher_payout_hash else "pending",
+        amount=from_planck(split.price),
+        platform_fee_amount=from_planck(split.platform_fee),
+        payback_reserve_amount=from_planck(split.payback_reserve),
+        teacher_payout_amount=from_planck(split.teacher_share),
+        amount_planck=split.price,
+        teacher_payout_planck=split.teacher_share,
+        block_hash=provisional_block,
+        provisional_since=sa.func.now() if provisional_block else None,
+        status="provisional" if provisional_block else "pending",
     )
-    session.add(purchase)
+    excluded = values.excluded
+    # A purchase revoked because its block was not final in time is claimed
+    # again (and restarts its finality timeout) now that the payment verified
+    claim = values.on_conflict_do_update(
+        index_elements=["transaction_hash"],
+        set_={
+            "status": excluded.status,
+            "block_hash": excluded.block_hash,
+            "provisional_since": excluded.provisional_since,
+            "amount": excluded.amount,
+            "platform_fee_amount": excluded.platform_fee_amount,
+            "payback_reserve_amount": excluded.payback_reserve_amount,
+            "teacher_payout_amount": excluded.teacher_payout_amount,
+            "amount_planck": excluded.amount_planck,
+            "teacher_payout_planck": excluded.teacher_payout_planck,
+            "updated_at": sa.func.now(),
+        },
+        where=sa.and_(
+            purchase_table.c.status == "revoked",
+            purchase_table.c.course_id == excluded.course_id,
+            purchase_table.c.user_id == excluded.user_id,
+        ),
+    ).returning(purchase_table.c.id)
+    result = await session.exec(claim)  # type: ignore[call-overload]
+    purchase_id = result.scalar_one_or_none()
     await session.commit()
-    await session.refresh(purchase)
+
+    if purchase_id is None:
+        existing = (
+            await session.exec(
+                select(CoursePurchase).where(
+                    CoursePurchase.transaction_hash == tx_hash  # type: ignore[arg-type]
+                )
+            )
+        ).one()
+        if existing.course_id != course_id or existing.user_id != user_id:
+            raise TransactionAlreadyUsed(tx_hash)
+        return existing
+
+    payout_hash: str | None = None
+    if split.teacher_share > 0 and not provisional_block:
+        payout_hash = await _pay_teacher(
+            session, author_id, split.teacher_share, course_id
+        )
+
+    # populate_existing: a reinstated row may already be in the session
+    purchase = await session.get(CoursePurchase, purchase_id, populate_existing=True)
+    assert purchase is not None
+    if payout_hash:
+        purchase.teacher_payout_hash = payout_hash
+        purchase.status = "completed"
+        session.add(purchase)
+        await session.commit()
+        await session.refresh(purchase)
     return purchase
 
 
+async def pay_confirmed_purchase(
+    session: AsyncSession, purchase_id: uuid.UUID
+) -> None:
+    """Send the payout deferred for a best-block purchase that is now final.
+
+    The caller must first have committed the purchase's move from
+    ``provisional`` to ``pending``, like the claim in ``settle_purchase``:
+    a payout that is sent but not recorded is then never sent again.
+    """
+    purchase = await session.get(CoursePurchase, purchase_id)
+    if (
+        purchase is None
+        or purchase.status != "pending"
+        or purchase.teacher_payout_hash is not None
+    ):
+        return
+    teacher_share = purchase.teacher_payout_planck
+    course = await session.get(Course, purchase.course_id)
+    if teacher_share <= 0 or course is None:
+        return
+    payout_hash = await _pay_teacher(
+        session, course.author_id, teacher_share, purchase.course_id
+    )
+    if payout_hash:
+        purchase.teacher_payout_hash = payout_hash
+        purchase.status = "completed"
+        session.add(purchase)
+        await session.commit()
+
+
 # ---------------------------------------------------------------------------
 # Progress / Results
 # ---------------------------------------------------------------------------
@@ -996,6 +1745,29 @@ async def get_lesson_progress(
     )
     payback = payback_result.first()
 
+    # Get user's answers for these quizzes
+    answer_map: dict[uuid.UUID, int] = {}
+    if quizzes:
+        answers_result = await session.exec(
+            select(QuizAnswer).where(
+                QuizAnswer.quiz_id.in_([q.id for q in quizzes]),  # type: ignore[union-attr]
+                QuizAnswer.user_id == user_id,  # type: ignore[arg-type]
+            ).order_by(QuizAnswer.created_at)  # type: ignore[arg-type]
+        )
+        # quiz_id -> latest answer (oldest first, so the last one wins)
+        for a in answers_result.all():
+            answer_map[a.quiz_id] = a.selected_option
+
+    return _build_lesson_progress(lesson_id, quizzes, answer_map, payback)
+
+
+def _build_lesson_progress(
+    lesson_id: uuid.UUID,
+    quizzes: list[Quiz],
+    answer_map: dict[uuid.UUID, int],
+    payback: PaybackTransaction | None,
+) -> LessonProgressResponse:
+    """Score *quizzes* against ``quiz_id -> selected_option`` in *answer_map*."""
     if not quizzes:
         return LessonProgressResponse(
             lesson_id=lesson_id,
@@ -1010,30 +1782,15 @@ async def get_lesson_progress(
             results=[],
         )
 
-    # Get user's answers for these quizzes
-    quiz_ids = [q.id for q in quizzes]
-    answers_result = await session.exec(
-        select(QuizAnswer).where(
-            QuizAnswer.quiz_id.in_(quiz_ids),  # type: ignore[union-attr]
-            QuizAnswer.user_id == user_id,  # type: ignore[arg-type]
-        )
-    )
-    answers = list(answers_result.all())
-
-    # Build a map: quiz_id -> latest answer (in case of multiple attempts, take last)
-    answer_map: dict[uuid.UUID, QuizAnswer] = {}
-    for a in answers:
-        answer_map[a.quiz_id] = a  # last wins if duplicates
-
     # Build results
     results: list[QuizResultItem] = []
     correct_count = 0
     answered_count = 0
 
     for q in quizzes:
-        answer = answer_map.get(q.id)
-        is_correct = answer is not None and answer.selected_option == q.correct_option
-        if answer is not None:
+        selected = answer_map.get(q.id)
+        is_correct = selected is not None and selected == q.correct_option
+        if selected is not None:
             answered_count += 1
         if is_correct:
             correct_count += 1
@@ -1046,7 +1803,7 @@ async def get_lesson_progress(
                 option_c=q.option_c,
                 option_d=q.option_d,
                 correct_option=q.correct_option,
-                selected_option=answer.selected_option if answer else None,
+                selected_option=selected,
                 is_correct=is_correct,
             )
         )
@@ -1111,7 +1868,7 @@ async def get_course_progress(
             select(QuizAnswer).where(
                 QuizAnswer.quiz_id.in_(all_quiz_ids),  # type: ignore[union-attr]
                 QuizAnswer.user_id == user_id,  # type: ignore[arg-type]
-            )
+            ).order_by(QuizAnswer.created_at)  # type: ignore[arg-type]
         )
         for a in answers_result.all():
             answer_map[a.quiz_id] = a
@@ -1186,17 +1943,292 @@ async def get_course_progress(
     )
 
 
+async def get_my_progress(
+    session: AsyncSession, user_id: uuid.UUID
+) -> list[CourseProgressOverview]:
+    """Progress in every course *user_id* bought, newest purchase first.
+
+    Same rules as ``get_course_progress`` (completed: every quiz answered;
+    passed: completed with score >= 70%), computed in a single query.
+    """
+    purchase, lesson, quiz = _course_purchase_table, _lesson_table, _quiz_table
+    answer, payback = _quiz_answer_table, _payback_table
+
+    purchased = (
+        sa.select(
+            purchase.c.course_id,
+            sa.func.min(purchase.c.created_at).label("purchased_at"),
+        )
+        .where(purchase.c.user_id == user_id, purchase.c.status != "revoked")
+        .group_by(purchase.c.course_id)
+        .cte("purchased")
+    )
+    course_quizzes = purchased.join(
+        lesson, lesson.c.course_id == purchased.c.course_id
+    ).join(quiz, quiz.c.lesson_id == lesson.c.id)
+    # The latest answer per quiz, as get_course_progress scores it
+    latest = (
+        sa.select(answer.c.quiz_id, answer.c.selected_option)
+        .select_from(
+            course_quizzes.join(
+                answer,
+                sa.and_(answer.c.quiz_id == quiz.c.id, answer.c.user_id == user_id),
+            )
+        )
+        .distinct(answer.c.quiz_id)
+        .order_by(answer.c.quiz_id, answer.c.created_at.desc())
+        .subquery("latest")
+    )
+    lessons = (
+        sa.select(
+            lesson.c.course_id,
+            sa.func.count(quiz.c.id).label("questions"),
+            sa.func.count(latest.c.quiz_id).label("answered"),
+            sa.func.count(latest.c.quiz_id)
+            .filter(latest.c.selected_option == quiz.c.correct_option)
+            .label("correct"),
+        )
+        .select_from(
+            purchased.join(lesson, lesson.c.course_id == purchased.c.course_id)
+            .outerjoin(quiz, quiz.c.lesson_id == lesson.c.id)
+            .outerjoin(latest, latest.c.quiz_id == quiz.c.id)
+        )
+        .group_by(lesson.c.course_id, lesson.c.id)
+        .subquery("lessons")
+    )
+    earned = (
+        sa.select(payback.c.course_id, sa.func.sum(payback.c.amount).label("amount"))
+        .where(payback.c.user_id == user_id)
+        .group_by(payback.c.course_id)
+        .subquery("earned")
+    )
+
+    completed = sa.and_(
+        lessons.c.questions > 0, lessons.c.answered >= lessons.c.questions
+    )
+    course = _course_table
+    result = await session.exec(
+        sa.select(  # type: ignore[call-overload]
+            course.c.id,
+            course.c.title,
+            purchased.c.purchased_at,
+            sa.func.count(lessons.c.course_id),
+            sa.func.count().filter(completed),
+            sa.func.count().filter(
+                completed, lessons.c.correct * 100 >= lessons.c.questions * 70
+            ),
+            *(
+                sa.func.coalesce(sa.func.sum(lessons.c[column]), 0).cast(sa.Integer)
+                for column in ("questions", "answered", "correct")
+            ),
+            sa.func.coalesce(earned.c.amount, 0.0),
+        )
+        .select_from(
+            purchased.join(course, course.c.id == purchased.c.course_id)
+            .outerjoin(lessons, lessons.c.course_id == purchased.c.course_id)
+            .outerjoin(earned, earned.c.course_id == purchased.c.course_id)
+        )
+        .where(course.c.deleted_at.is_(None))
+        .group_by(course.c.id, purchased.c.purchased_at, earned.c.amount)
+        .order_by(purchased.c.purchased_at.desc(), course.c.id)
+    )
+
+    overviews: list[CourseProgressOverview] = []
+    for (
+        course_id,
+        title,
+        purchased_at,
+        total_lessons,
+        completed_lessons,
+        passed_lessons,
+        questions,
+        answered,
+        correct,
+        total_earned,
+    ) in result:
+        overviews.append(
+            CourseProgressOverview(
+                course_id=course_id,
+                course_title=title,
+                purchased_at=purchased_at,
+                total_lessons=total_lessons,
+                completed_lessons=completed_lessons,
+                passed_lessons=passed_lessons,
+                completion_pct=(
+                    round(completed_lessons / total_lessons * 100, 1)
+                    if total_lessons
+                    else 0.0
+                ),
+                total_questions=questions,
+                answered=answered,
+                correct=correct,
+                score_pct=round(correct / questions * 100, 1) if questions else 0.0,
+                total_earned=round(total_earned, 4),
+            )
+        )
+    return overviews
+
+
 # ---------------------------------------------------------------------------
 # Activities
 # ---------------------------------------------------------------------------
+_SUBSCAN_EXTRINSIC_URL = "https://assethub-paseo.subscan.io/extrinsic/{}"
+_ACTIVITY_STREAM_BATCH_SIZE = 500
+
+# Rows of the activity feed are ordered by this key, newest first.  ``type``
+# breaks the tie between a purchase and its payout, which share a row.
+_ActivityKey = tuple[datetime, uuid.UUID, str]
+
+
+def _activity_union(
+    course_id: uuid.UUID,
+    user_id: uuid.UUID,
+    is_author: bool,
+    *,
+    limit: int | None = None,
+    before: _ActivityKey | None = None,
+) -> sa.Select:
+    """Build the ``UNION ALL ... ORDER BY timestamp DESC`` activity query.
+
+    The author sees every purchase, teacher payout and payback of the course;
+    anyone else sees only their own purchase and paybacks.  When *limit* is
+    given, each branch is pre-limited with the keyset condition so every
+    branch is served by an index range scan before the merge.  Type names
+    sort the same in Python and in any SQL collation (they differ at a
+    letter before any underscore), so each branch applies the outer cursor
+    comparison exactly.
+    """
+    purchase_filter = [
+        CoursePurchase.course_id == course_id,
+        CoursePurchase.status != "revoked",
+    ]
+    payback_filter = [PaybackTransaction.course_id == course_id]
+    if not is_author:
+        purchase_filter.append(CoursePurchase.user_id == user_id)
+        payback_filter.append(PaybackTransaction.user_id == user_id)
+
+    branches = [
+        (
+            sa.select(
+                CoursePurchase.id.label("id"),  # type: ignore[union-attr]
+                sa.literal(ActivityType.PURCHASE.value, sa.Text).label("type"),
+                CoursePurchase.amount.label("amount"),  # type: ignore[attr-defined]
+                CoursePurchase.transaction_hash.label("transaction_hash"),  # type: ignore[union-attr]
+                CoursePurchase.created_at.label("timestamp"),  # type: ignore[union-attr]
+                CoursePurchase.status.label("status"),  # type: ignore[union-attr]
+                CoursePurchase.user_id.label("user_id"),  # type: ignore[union-attr]
+                sa.cast(sa.null(), sa.Text).label("lesson_title"),
+            ).where(*purchase_filter),
+            ActivityType.PURCHASE,
+            (CoursePurchase.created_at, CoursePurchase.id),
+        ),
+        (
+            sa.select(
+                PaybackTransaction.id.label("id"),  # type: ignore[union-attr]
+                sa.literal(ActivityType.PAYBACK.value, sa.Text).label("type"),
+                PaybackTransaction.amount.label("amount"),  # type: ignore[attr-defined]
+                PaybackTransaction.transaction_hash.label("transaction_hash"),  # type: ignore[union-attr]
+                PaybackTransaction.created_at.label("timestamp"),  # type: ignore[union-attr]
+                sa.literal("completed", sa.Text).label("status"),
+                PaybackTransaction.user_id.label("user_id"),  # type: ignore[union-attr]
+                Lesson.title.label("lesson_title"),  # type: ignore[union-attr]
+            )
+            .join(Lesson, PaybackTransaction.lesson_id == Lesson.id)  # type: ignore[arg-type]
+            .where(*payback_filter),
+            ActivityType.PAYBACK,
+            (PaybackTransaction.created_at, PaybackTransaction.id),
+        ),
+    ]
+    if is_author:
+        branches.append(
+            (
+                sa.select(
+                    CoursePurchase.id.label("id"),  # type: ignore[union-attr]
+                    sa.literal(ActivityType.TEACHER_PAYOUT.value, sa.Text).label("type"),
+                    CoursePurchase.teacher_payout_amount.label("amount"),  # type: ignore[attr-defined]
+                    CoursePurchase.teacher_payout_hash.label("transaction_hash"),  # type: ignore[union-attr]
+                    CoursePurchase.created_at.label("timestamp"),  # type: ignore[union-attr]
+                    sa.literal("completed", sa.Text).label("status"),
+                    CoursePurchase.user_id.label("user_id"),  # type: ignore[union-attr]
+                    sa.cast(sa.null(), sa.Text).label("lesson_title"),
+                ).where(
+                    *purchase_filter,
+                    CoursePurchase.teacher_payout_hash.is_not(None),  # type: ignore[union-attr]
+                ),
+                ActivityType.TEACHER_PAYOUT,
+                (CoursePurchase.created_at, CoursePurchase.id),
+            )
+        )
+
+    selects = []
+    for branch, activity_type, (ts_col, id_col) in branches:
+        if before is not None:
+            # The outer (timestamp, id, type) < before, within one branch
+            # (constant type): its cursor row itself is excluded here too,
+            # so the branch still contributes *limit* rows
+            key = sa.tuple_(ts_col, id_col)
+            branch = branch.where(
+                key <= sa.tuple_(*before[:2])
+                if activity_type.value < before[2]
+                else key < sa.tuple_(*before[:2])
+            )
+        if limit is not None:
+            branch = branch.order_by(ts_col.desc(), id_col.desc()).limit(limit)  # type: ignore[union-attr]
+        selects.append(branch.subquery().select())
+
+    feed = sa.union_all(*selects).subquery("activity")
+    statement = sa.select(feed).order_by(
+        feed.c.timestamp.desc(), feed.c.id.desc(), feed.c.type.desc()
+    )
+    if before is not None:
+        statement = statement.where(
+            sa.tuple_(feed.c.timestamp, feed.c.id, feed.c.type) < sa.tuple_(*before)
+        )
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def _row_to_activity(row: sa.Row, course: Course, is_author: bool) -> ActivityItem:
+    activity_type = ActivityType(row.type)
+    if activity_type is ActivityType.PURCHASE:
+        description = (
+            f"Purchase by user {row.user_id}"
+            if is_author
+            else f"Course Purchase: {course.title}"
+        )
+        user_id = row.user_id
+    elif activity_type is ActivityType.TEACHER_PAYOUT:
+        description = "Teacher Payout"
+        user_id = course.author_id  # Payout is TO the teacher
+    else:
+        description = f"Reward: {row.lesson_title}"
+        user_id = row.user_id
+
+    return ActivityItem(
+        id=row.id,
+        type=activity_type,
+        amount=row.amount,
+        transaction_hash=row.transaction_hash,
+        timestamp=row.timestamp,
+        status=row.status,
+        description=description,
+        user_id=user_id,
+        subscan_link=_SUBSCAN_EXTRINSIC_URL.format(row.transaction_hash),
+    )
+
+
 async def get_course_activities(
     session: AsyncSession, course_id: uuid.UUID, user_id: uuid.UUID
 ) -> ActivityListResponse:
     """Get all activities (transactions) for a course.
 
-    If the user is the course author (Teacher), returns all purchases of the course
-    and all teacher payouts.
+    If the user is the course author (Teacher), returns all purchases of the
+    course, all teacher payouts and all paybacks sent to students.
     If the user is a student, returns only their own purchase and paybacks.
+
+    Prefer :func:`get_course_activity_page` or :func:`stream_course_activities`
+    for courses with many sales.
     """
     course = await session.get(Course, course_id)
     if not course:
@@ -1204,100 +2236,64 @@ async def get_course_activities(
 
         raise CourseNotFound()
 
-    activities: list[ActivityItem] = []
     is_author = course.author_id == user_id
+    result = await session.exec(_activity_union(course.id, user_id, is_author))  # type: ignore[call-overload]
+    activities = [_row_to_activity(row, course, is_author) for row in result.all()]
+    return ActivityListResponse(course_id=course_id, activities=activities)
 
-    if is_author:
-        # Teacher view: All purchases + payouts
-        purchases_result = await session.exec(
-            select(CoursePurchase).where(CoursePurchase.course_id == course_id) # type: ignore[arg-type]
-        )
-        purchases = purchases_result.all()
-
-        for p in purchases:
-            # Student Purchase
-            activities.append(
-                ActivityItem(
-                    id=p.id,
-                    type=ActivityType.PURCHASE,
-                    amount=p.amount,
-                    transaction_hash=p.transaction_hash,
-                    timestamp=p.created_at, # type: ignore[arg-type]
-                    status=p.status,
-                    description=f"Purchase by user {p.user_id}",
-                    user_id=p.user_id,
-                    subscan_link=f"https://assethub-paseo.subscan.io/extrinsic/{p.transaction_hash}",
-                )
-            )
-            # Teacher Payout
-            if p.teacher_payout_hash:
-                activities.append(
-                    ActivityItem(
-                        id=uuid.uuid4(),  # Virtual ID for the payout event
-                        type=ActivityType.TEACHER_PAYOUT,
-                        amount=p.teacher_payout_amount,
-                        transaction_hash=p.teacher_payout_hash,
-                        timestamp=p.created_at, # type: ignore[arg-type]
-                        status="completed",
-                        description="Teacher Payout",
-                        user_id=user_id,  # Payout is TO the teacher
-                        subscan_link=f"https://assethub-paseo.subscan.io/extrinsic/{p.teacher_payout_hash}",
-                    )
-                )
 
-    else:
-        # Student view: My purchase + My paybacks
-        # 1. Purchase
-        purchase_result = await session.exec(
-            select(CoursePurchase).where(
-                CoursePurchase.course_id == course_id, # type: ignore[arg-type]
-                CoursePurchase.user_id == user_id, # type: ignore[arg-type]
-            )
-        )
-        purchase = purchase_result.first()
-        if purchase:
-            activities.append(
-                ActivityItem(
-                    id=purchase.id,
-                    type=ActivityType.PURCHASE,
-                    amount=purchase.amount,
-                    transaction_hash=purchase.transaction_hash,
-                    timestamp=purchase.created_at, # type: ignore[arg-type]
-                    status=purchase.status,
-                    description=f"Course Purchase: {course.title}",
-                    user_id=user_id,
-                    subscan_link=f"https://assethub-paseo.subscan.io/extrinsic/{purchase.transaction_hash}",
-                )
-            )
+async def get_course_activity_page(
+    session: AsyncSession,
+    course: Course,
+    user_id: uuid.UUID,
+    *,
+    limit: int = 50,
+    cursor: str | None = None,
+) -> ActivityPageResponse:
+    """Return one page of the activity feed, newest first.
+
+    Purchases, payouts and paybacks are merged and ordered in a single
+    ``UNION ALL`` query; *cursor* continues after the last item of the
+    previous page.
+    """
+    before: _ActivityKey | None = None
+    if cursor:
+        before = decode_cursor(cursor, datetime, uuid.UUID, str)  # type: ignore[assignment]
 
-        # 2. Paybacks
-        # Join with Lesson to get the title
-        paybacks_result = await session.exec(
-            select(PaybackTransaction, Lesson.title)
-            .join(Lesson, PaybackTransaction.lesson_id == Lesson.id) # type: ignore[arg-type]
-            .where(
-                PaybackTransaction.course_id == course_id, # type: ignore[arg-type]
-                PaybackTransaction.user_id == user_id, # type: ignore[arg-type]
-            )
-        )
-        paybacks = paybacks_result.all()
-
-        for pb, lesson_title in paybacks:
-            activities.append(
-                ActivityItem(
-                    id=pb.id,
-                    type=ActivityType.PAYBACK,
-                    amount=pb.amount,
-                    transaction_hash=pb.transaction_hash,
-                    timestamp=pb.created_at, # type: ignore[arg-type]
-                    status="completed",
-                    description=f"Reward: {lesson_title}",
-                    user_id=user_id,
-                    subscan_link=f"https://assethub-paseo.subscan.io/extrinsic/{pb.transaction_hash}",
-                )
-            )
+    is_author = course.author_id == user_id
+    result = await session.exec(  # type: ignore[call-overload]
+        _activity_union(course.id, user_id, is_author, limit=limit, before=before)
+    )
+    rows = result.all()
+    activities = [_row_to_activity(row, course, is_author) for row in rows]
 
-    # Sort by timestamp descending
-    activities.sort(key=lambda x: x.timestamp, reverse=True)
+    next_cursor: str | None = None
+    if len(rows) >= limit:
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id, last.type)
 
-    return ActivityListResponse(course_id=course_id, activities=activities)
+    return ActivityPageResponse(
+        course_id=course.id, activities=activities, next_cursor=next_cursor
+    )
+
+
+async def stream_course_activities(
+    course: Course, user_id: uuid.UUID
+) -> AsyncIterator[str]:
+    """Yield the full activity feed as NDJSON lines, newest first.
+
+    Uses its own DB session and a server-side cursor so the export never
+    holds more than one fetch batch in memory, independent of the
+    request-scoped session's lifetime.  Exports tolerate replica lag, so
+    the stream reads from the read replica when one is configured.
+    """
+    from src.database import read_engine
+
+    is_author = course.author_id == user_id
+    statement = _activity_union(course.id, user_id, is_author).execution_options(
+        yield_per=_ACTIVITY_STREAM_BATCH_SIZE
+    )
+    async with AsyncSession(read_engine) as stream_session:
+        result = await stream_session.stream(statement)
+        async for row in result:
+            yield _row_to_activity(row, course, is_author).model_dump_json() + "\n"
@@ -1,10 +1,21 @@
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import create_async_engine
+import sqlalchemy as sa
+from fastapi import Request
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from src.config import settings
+from src.config import Config, settings
+from src.instrumentation import instrument_engine
+from src.replica import (
+    LAST_WRITE_HEADER,
+    ReplicaLagMonitor,
+    must_read_primary,
+    track_primary_writes,
+)
 
 POSTGRES_INDEXES_NAMING_CONVENTION = {
     "ix": "%(column_0_label)s_idx",
@@ -16,9 +27,78 @@ POSTGRES_INDEXES_NAMING_CONVENTION = {
 
 SQLModel.metadata.naming_convention = POSTGRES_INDEXES_NAMING_CONVENTION
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True)
+# DB_STATEMENT_TIMEOUT is sized for requests; background jobs (migrations,
+# rollup rebuilds, course purges) lift it for their own transactions
+NO_STATEMENT_TIMEOUT = sa.text("SET LOCAL statement_timeout = 0")
+
+
+def _connect_args(url: str, config: Config) -> dict[str, Any]:
+    """Driver-specific connection arguments for the engine profile."""
+    driver = make_url(url).get_driver_name()
+    if driver == "asyncpg":
+        args: dict[str, Any] = {
+            # asyncpg's own cache and SQLAlchemy's adapter cache
+            "statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": config.DB_STATEMENT_CACHE_SIZE,
+        }
+        if config.DB_STATEMENT_TIMEOUT:
+            args["server_settings"] = {
+                "statement_timeout": str(config.DB_STATEMENT_TIMEOUT)
+            }
+        return args
+    if driver == "psycopg":
+        args = {}
+        if config.DB_STATEMENT_CACHE_SIZE == 0:
+            args["prepare_threshold"] = None
+        if config.DB_STATEMENT_TIMEOUT:
+            args["options"] = f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT}"
+        return args
+    return {}
+
+
+def create_engine(url: str, config: Config = settings) -> AsyncEngine:
+    """Build an async engine using the pool/driver profile in *config*."""
+    return create_async_engine(
+        url,
+        echo=config.DB_ECHO,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        connect_args=_connect_args(url, config),
+    )
+
+
+engine = create_engine(settings.DATABASE_URL)
+instrument_engine(engine)
+
+# Read-only endpoints use the replica when one is configured
+read_engine = engine
+replica_lag: ReplicaLagMonitor | None = None
+if settings.DATABASE_READ_URL:
+    read_engine = create_engine(settings.DATABASE_READ_URL)
+    instrument_engine(read_engine)
+    track_primary_writes(engine)
+    replica_lag = ReplicaLagMonitor(read_engine, settings.DB_REPLICA_LAG_CHECK_INTERVAL)
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSession(engine) as session:
         yield session
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints.
+
+    Bound to the read replica unless the client has to see its own recent
+    writes (see ``src.replica``); without ``DATABASE_READ_URL`` it is the
+    same as ``get_session``.  Never write through this session.
+    """
+    bind = engine
+    if replica_lag is not None and not await must_read_primary(
+        request.headers.get(LAST_WRITE_HEADER), replica_lag
+    ):
+        bind = read_engine
+    async with AsyncSession(bind) as session:
+        yield session
@@ -0,0 +1,145 @@
+"""Per-request SQL instrumentation: statement counts, DB time, N+1 hints.
+
+Every statement executed through an instrumented engine is counted and
+timed against the HTTP request that issued it (tracked with a context
+variable, so it also covers sessions opened by middleware and helpers
+running in the request's task).  ``SQLInstrumentationMiddleware`` then
+
+* adds the totals as a ``Server-Timing`` header
+  (``db;dur=12.4;desc="6 queries"``);
+* logs the same SQL text executed ``DB_N_PLUS_ONE_THRESHOLD`` times or more
+  in one request — the usual sign of an N+1 loop that should become a
+  join or a set-based query;
+* warns when a request runs more statements than its budget — the route's
+  ``query_budget(n)`` dependency, or ``DB_QUERY_BUDGET`` by default.  With
+  ``DB_QUERY_BUDGET_ENFORCE`` (for tests) it raises ``QueryBudgetExceeded``
+  instead, so the test client fails the test.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueryStats:
+    """Statements executed on behalf of the current request."""
+
+    count: int = 0
+    duration: float = 0.0  # seconds
+    statements: Counter[str] = field(default_factory=Counter)
+    budget: int = 0  # 0 = no budget
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least *threshold* times, most frequent first."""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL statements than its budget (test mode only)."""
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """Stats for the request being handled, or ``None`` outside a request."""
+    return _query_stats.get()
+
+
+def query_budget(limit: int) -> Callable[[], Awaitable[None]]:
+    """Route dependency that sets the request's statement budget to *limit*.
+
+    Usage: ``@router.get(..., dependencies=[Depends(query_budget(4))])``.
+    """
+
+    async def _set_budget() -> None:
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return _set_budget
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Count and time every statement *engine* executes for the current request."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        if _query_stats.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):  # type: ignore[no-untyped-def]
+        stats = _query_stats.get()
+        starts = conn.info.get("query_start")
+        if stats is None or not starts:
+            return
+        stats.duration += time.perf_counter() - starts.pop()
+        stats.count += 1
+        stats.statements[statement] += 1
+
+
+class SQLInstrumentationMiddleware:
+    """Pure ASGI middleware that reports per-request SQL statistics."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(budget=settings.DB_QUERY_BUDGET)
+        token = _query_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and settings.DB_SERVER_TIMING:
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _query_stats.reset(token)
+        self._report(scope, stats)
+
+    @staticmethod
+    def _report(scope: Scope, stats: QueryStats) -> None:
+        endpoint = f"{scope['method']} {scope['path']}"
+
+        for sql, times in stats.repeated(settings.DB_N_PLUS_ONE_THRESHOLD):
+            logger.warning(
+                "Possible N+1 in %s: statement ran %d times: %s",
+                endpoint,
+                times,
+                " ".join(sql.split())[:200],
+            )
+
+        if stats.budget and stats.count > stats.budget:
+            message = (
+                f"{endpoint} ran {stats.count} SQL statements "
+                f"(budget {stats.budget})."
+            )
+            if settings.DB_QUERY_BUDGET_ENFORCE:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
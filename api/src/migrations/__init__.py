@@ -0,0 +1,26 @@
+"""Versioned schema migrations.
+
+The applied migrations are recorded in the ``schema_version`` table, so a
+worker boot only has to compare one number instead of reflecting every
+table with ``create_all``.  Pending migrations run in a single transaction
+under a Postgres advisory lock: when many workers start together one of
+them migrates and the others wait, then find nothing left to do.
+
+Run pending migrations explicitly with ``python -m src.migrations``.
+"""
+
+from src.migrations.runner import (
+    LATEST_VERSION,
+    SchemaOutOfDate,
+    ensure_schema,
+    get_schema_version,
+    migrate,
+)
+
+__all__ = [
+    "LATEST_VERSION",
+    "SchemaOutOfDate",
+    "ensure_schema",
+    "get_schema_version",
+    "migrate",
+]
@@ -0,0 +1,36 @@
+"""Apply or check schema migrations: ``python -m src.migrations [--check]``."""
+
+import argparse
+import asyncio
+import sys
+
+from src.database import engine
+from src.migrations import LATEST_VERSION, get_schema_version, migrate
+
+
+async def _main(check: bool) -> int:
+    try:
+        if check:
+            async with engine.connect() as conn:
+                current = await get_schema_version(conn)
+            print(f"schema version {current}, latest {LATEST_VERSION}")
+            return 0 if current >= LATEST_VERSION else 1
+
+        applied = await migrate(engine)
+        if applied:
+            print(f"applied migrations: {', '.join(map(str, applied))}")
+        else:
+            print(f"schema is up to date (version {LATEST_VERSION})")
+        return 0
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Polkadot LearnEarn schema migrations")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report the schema version; exit 1 if migrations are pending",
+    )
+    sys.exit(asyncio.run(_main(parser.parse_args().check)))
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+from sqlalchemy.exc import ProgrammingError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.database import NO_STATEMENT_TIMEOUT
+from src.migrations.versions import MIGRATIONS
+
+logger = logging.getLogger(__name__)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+# Arbitrary application-wide key for pg_advisory_xact_lock
+_MIGRATION_LOCK_KEY = 0x1EA4_2E42
+
+_CREATE_VERSION_TABLE = sa.text(
+    "CREATE TABLE IF NOT EXISTS schema_version ("
+    " version INTEGER PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " applied_at TIMESTAMPTZ NOT NULL DEFAULT now()"
+    ")"
+)
+_SELECT_VERSION = sa.text("SELECT COALESCE(MAX(version), 0) FROM schema_version")
+_INSERT_VERSION = sa.text(
+    "INSERT INTO schema_version (version, name) VALUES (:version, :name)"
+)
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is behind this build and auto-migration is disabled."""
+
+    def __init__(self, current: int, latest: int) -> None:
+        super().__init__(
+            f"Database schema is at version {current} but this build needs "
+            f"version {latest}. Run `python -m src.migrations` first."
+        )
+
+
+async def get_schema_version(conn: AsyncConnection) -> int:
+    """Applied schema version, 0 if the database has never been migrated."""
+    try:
+        return int(await conn.scalar(_SELECT_VERSION) or 0)
+    except ProgrammingError:
+        # schema_version does not exist yet
+        await conn.rollback()
+        return 0
+
+
+async def migrate(engine: AsyncEngine) -> list[int]:
+    """Apply pending migrations in one transaction; return the versions applied."""
+    applied: list[int] = []
+    async with engine.begin() as conn:
+        # Waiting for another worker's migration, a backfill or an index
+        # build may take longer than a request
+        await conn.execute(NO_STATEMENT_TIMEOUT)
+        await conn.execute(
+            sa.text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": _MIGRATION_LOCK_KEY},
+        )
+        await conn.execute(_CREATE_VERSION_TABLE)
+        current = int(await conn.scalar(_SELECT_VERSION) or 0)
+        for migration in MIGRATIONS:
+            if migration.version <= current:
+                continue
+            logger.info(
+                "Applying schema migration %04d_%s", migration.version, migration.name
+            )
+            await conn.run_sync(migration.upgrade)
+            await conn.execute(
+                _INSERT_VERSION,
+                {"version": migration.version, "name": migration.name},
+            )
+            applied.append(migration.version)
+    return applied
+
+
+async def ensure_schema(engine: AsyncEngine, *, auto_migrate: bool) -> None:
+    """Startup check: one query when the schema is already current.
+
+    Raises:
+        SchemaOutOfDate: the database is behind and *auto_migrate* is off.
+    """
+    async with engine.connect() as conn:
+        current = await get_schema_version(conn)
+
+    if current == LATEST_VERSION:
+        return
+    if current > LATEST_VERSION:
+        # A newer build already migrated (e.g. during a rolling deploy)
+        logger.warning(
+            "Database schema version %d is newer than this build (%d).",
+            current,
+            LATEST_VERSION,
+        )
+        return
+    if not auto_migrate:
+        raise SchemaOutOfDate(current, LATEST_VERSION)
+    await migrate(engine)
@@ -0,0 +1,248 @@
+"""Schema migrations, in order.
+
+Every migration must be idempotent (``IF NOT EXISTS``, guarded backfills):
+databases created before versioning existed start at version 0 and replay
+the whole list on top of whatever ``create_all`` built back then, and the
+baseline creates fresh databases from the current models.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+# Naming convention first, then every model so the metadata is complete
+from src import database  # noqa: F401
+from src.auth import models as auth_models  # noqa: F401
+from src.config import settings
+from src.course import models as course_models  # noqa: F401
+from src.x402 import models as x402_models  # noqa: F401
+
+
+@dataclass(frozen=True, slots=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _baseline(conn: Connection) -> None:
+    SQLModel.metadata.create_all(conn)
+
+
+def _keyset_indexes(conn: Connection) -> None:
+    for statement in (
+        'CREATE INDEX IF NOT EXISTS user_created_at_id_idx ON "user" (created_at, id)',
+        "CREATE INDEX IF NOT EXISTS course_created_at_id_idx ON course (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS course_purchase_user_id_created_at_id_idx "
+        "ON course_purchase (user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS course_purchase_course_id_user_id_created_at_idx "
+        "ON course_purchase (course_id, user_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS course_purchase_course_id_created_at_id_idx "
+        "ON course_purchase (course_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS payback_transaction_course_id_created_at_id_idx "
+        "ON payback_transaction (course_id, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS lesson_course_id_lesson_index_id_idx "
+        "ON lesson (course_id, lesson_index, id)",
+        "CREATE INDEX IF NOT EXISTS quiz_lesson_id_quiz_index_id_idx "
+        "ON quiz (lesson_id, quiz_index, id)",
+    ):
+        conn.execute(sa.text(statement))
+
+
+def _course_planck_totals(conn: Connection) -> None:
+    conn.execute(
+        sa.text(
+            "ALTER TABLE course "
+            "ADD COLUMN IF NOT EXISTS price_planck BIGINT NOT NULL DEFAULT 0, "
+            "ADD COLUMN IF NOT EXISTS total_payback_reserve_planck BIGINT NOT NULL "
+            "DEFAULT 0"
+        )
+    )
+    # Same truncation as src.course.pricing.to_planck; numeric throughout (a
+    # float8 power of ten would turn 0.3 into 2999999999 planck)
+    conn.execute(
+        sa.text(
+            "UPDATE course SET "
+            "price_planck = trunc(price::numeric * power(10::numeric, :decimals))"
+            "::bigint, "
+            "total_payback_reserve_planck = COALESCE(("
+            "  SELECT sum(trunc("
+            "    lesson.payback_amount::numeric * power(10::numeric, :decimals)"
+            "  ))"
+            "  FROM lesson WHERE lesson.course_id = course.id"
+            "), 0)::bigint "
+            "WHERE price_planck = 0 AND total_payback_reserve_planck = 0"
+        ),
+        {"decimals": settings.TOKEN_DECIMALS},
+    )
+
+
+def _cascade_indexes(conn: Connection) -> None:
+    # Foreign keys that ON DELETE CASCADE follows had no index of their own
+    conn.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS quiz_answer_quiz_id_user_id_idx "
+            "ON quiz_answer (quiz_id, user_id)"
+        )
+    )
+    conn.execute(
+        sa.text(
+            "CREATE INDEX IF NOT EXISTS payback_transaction_lesson_id_idx "
+            "ON payback_transaction (lesson_id)"
+        )
+    )
+
+
+def _gapped_order_indexes(conn: Connection) -> None:
+    # Re-space lesson/quiz indexes INDEX_GAP (1024, src.course.service) apart,
+    # keeping the current order, so single moves need not renumber siblings
+    for table, index, parent in (
+        ("lesson", "lesson_index", "course_id"),
+        ("quiz", "quiz_index", "lesson_id"),
+    ):
+        conn.execute(
+            sa.text(
+                f"UPDATE {table} SET {index} = ranked.pos * :gap "
+                f"FROM (SELECT id, row_number() OVER ("
+                f"  PARTITION BY {parent} ORDER BY {index}, id) AS pos "
+                f"  FROM {table}) AS ranked "
+                f"WHERE {table}.id = ranked.id"
+            ),
+            {"gap": 1024},
+        )
+
+
+def _analytics_rollups(conn: Connection) -> None:
+    SQLModel.metadata.create_all(
+        conn,
+        tables=[
+            course_models.CourseStats.__table__,  # type: ignore[attr-defined]
+            course_models.LessonStats.__table__,  # type: ignore[attr-defined]
+            course_models.QuizStats.__table__,  # type: ignore[attr-defined]
+        ],
+    )
+
+
+def _course_search(conn: Connection) -> None:
+    for statement in (
+        "ALTER TABLE course ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({course_models.COURSE_SEARCH_DOCUMENT}) STORED",
+        "CREATE INDEX IF NOT EXISTS course_search_vector_idx "
+        "ON course USING gin (search_vector)",
+        "CREATE INDEX IF NOT EXISTS course_price_planck_id_idx "
+        "ON course (price_planck, id)",
+        "CREATE INDEX IF NOT EXISTS course_author_id_created_at_id_idx "
+        "ON course (author_id, created_at, id)",
+    ):
+        conn.execute(sa.text(statement))
+
+
+def _auth_challenge(conn: Connection) -> None:
+    SQLModel.metadata.create_all(
+        conn,
+        tables=[auth_models.AuthChallenge.__table__],  # type: ignore[attr-defined]
+    )
+
+
+def _revoked_token(conn: Connection) -> None:
+    SQLModel.metadata.create_all(
+        conn,
+        tables=[auth_models.RevokedToken.__table__],  # type: ignore[attr-defined]
+    )
+
+
+def _unique_purchase_transaction(conn: Connection) -> None:
+    duplicates = conn.scalar(
+        sa.text(
+            "SELECT count(*) FROM (SELECT transaction_hash FROM course_purchase "
+            "GROUP BY transaction_hash HAVING count(*) > 1) AS duplicate"
+        )
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"{duplicates} transaction hashes are recorded on more than one "
+            "course_purchase row; resolve them before migrating."
+        )
+    conn.execute(
+        sa.text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS course_purchase_transaction_hash_key "
+            "ON course_purchase (transaction_hash)"
+        )
+    )
+
+
+def _x402_settlement(conn: Connection) -> None:
+    SQLModel.metadata.create_all(
+        conn,
+        tables=[x402_models.X402Settlement.__table__],  # type: ignore[attr-defined]
+    )
+
+
+def _provisional_purchases(conn: Connection) -> None:
+    for statement in (
+        "ALTER TABLE course_purchase "
+        "ADD COLUMN IF NOT EXISTS block_hash TEXT, "
+        "ADD COLUMN IF NOT EXISTS provisional_since TIMESTAMP, "
+        "ADD COLUMN IF NOT EXISTS amount_planck BIGINT NOT NULL DEFAULT 0, "
+        "ADD COLUMN IF NOT EXISTS teacher_payout_planck BIGINT NOT NULL DEFAULT 0",
+        "UPDATE course_purchase SET provisional_since = created_at "
+        "WHERE status = 'provisional' AND provisional_since IS NULL",
+        "CREATE INDEX IF NOT EXISTS course_purchase_provisional_since_idx "
+        "ON course_purchase (provisional_since) WHERE status = 'provisional'",
+    ):
+        conn.execute(sa.text(statement))
+    # As in course_planck_totals; only unpaid purchases will ever use them
+    conn.execute(
+        sa.text(
+            "UPDATE course_purchase SET "
+            "amount_planck = trunc(amount::numeric * power(10::numeric, :decimals))"
+            "::bigint, "
+            "teacher_payout_planck = trunc("
+            "  teacher_payout_amount::numeric * power(10::numeric, :decimals)"
+            ")::bigint "
+            "WHERE amount_planck = 0 AND teacher_payout_planck = 0"
+        ),
+        {"decimals": settings.TOKEN_DECIMALS},
+    )
+
+
+def _course_deleted_at(conn: Connection) -> None:
+    for statement in (
+        "ALTER TABLE course ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP",
+        "CREATE INDEX IF NOT EXISTS course_deleted_at_idx "
+        "ON course (deleted_at) WHERE deleted_at IS NOT NULL",
+    ):
+        conn.execute(sa.text(statement))
+
+
+def _quiz_answer_created_at(conn: Connection) -> None:
+    # Existing answers all get the migration time: their order is unknown
+    conn.execute(
+        sa.text(
+            "ALTER TABLE quiz_answer "
+            "ADD COLUMN IF NOT EXISTS created_at TIMESTAMP NOT NULL DEFAULT now()"
+        )
+    )
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(1, "baseline", _baseline),
+    Migration(2, "keyset_indexes", _keyset_indexes),
+    Migration(3, "course_planck_totals", _course_planck_totals),
+    Migration(4, "cascade_indexes", _cascade_indexes),
+    Migration(5, "gapped_order_indexes", _gapped_order_indexes),
+    Migration(6, "analytics_rollups", _analytics_rollups),
+    Migration(7, "course_search", _course_search),
+    Migration(8, "auth_challenge", _auth_challenge),
+    Migration(9, "revoked_token", _revoked_token),
+    Migration(10, "unique_purchase_transaction", _unique_purchase_transaction),
+    Migration(11, "x402_settlement", _x402_settlement),
+    Migration(12, "provisional_purchases", _provisional_purchases),
+    Migration(13, "course_deleted_at", _course_deleted_at),
+    Migration(14, "quiz_answer_created_at", _quiz_answer_created_at),
+)
@@ -0,0 +1,120 @@
+"""Opaque keyset (cursor) pagination helpers.
+
+List endpoints accept either the classic ``offset``/``limit`` pair or an
+opaque ``cursor`` returned by a previous page.  A cursor encodes the sort
+key of the last row that was returned — e.g. ``(created_at, id)`` or
+``(lesson_index, id)`` — so the next page is fetched with a row-value
+comparison (``WHERE (created_at, id) > (:ts, :id)``) that Postgres turns
+into an index range scan, instead of an ``OFFSET`` that gets slower the
+deeper a client pages.
+
+The cursor for the next page is returned in the ``X-Next-Cursor``
+response header, so the JSON body of existing list endpoints is
+unchanged.  The header is omitted on the last page.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(HTTPException):
+    """The pagination cursor could not be decoded."""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode a sort key into an opaque, URL-safe cursor string."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple[Any, ...]:
+    """Decode *cursor* and coerce each element to the matching entry in *types*.
+
+    Supported types are ``datetime``, ``uuid.UUID``, ``int``, ``float`` and
+    ``str``.  Raises ``InvalidCursor`` (400) on any malformed input.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor arity mismatch")
+        decoded: list[Any] = []
+        for value, typ in zip(values, types):
+            if typ in (datetime, uuid.UUID) and not isinstance(value, str):
+                raise ValueError("unexpected cursor value")
+            if typ is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif typ is uuid.UUID:
+                decoded.append(uuid.UUID(value))
+            elif typ in (int, float, str):
+                if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                    raise ValueError("unexpected cursor value")
+                decoded.append(typ(value))
+            else:
+                raise TypeError(f"Unsupported cursor type: {typ!r}")
+        return tuple(decoded)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise InvalidCursor()
+
+
+def paginate(
+    statement: Any,
+    keys: tuple[Any, ...],
+    types: tuple[type, ...],
+    *,
+    offset: int,
+    limit: int,
+    cursor: str | None,
+    descending: bool = False,
+) -> Any:
+    """Apply keyset (*cursor*) or ``OFFSET`` pagination and ``LIMIT`` to *statement*.
+
+    *statement* must already be ordered by *keys* — all ascending, or all
+    descending with *descending*; *types* are the Python types of the key
+    columns, used to decode the cursor.
+    """
+    if cursor:
+        after = decode_cursor(cursor, *types)
+        if descending:
+            statement = statement.where(sa.tuple_(*keys) < sa.tuple_(*after))
+        else:
+            statement = statement.where(sa.tuple_(*keys) > sa.tuple_(*after))
+    else:
+        statement = statement.offset(offset)
+    return statement.limit(limit)
+
+
+def set_next_cursor(
+    response: Response,
+    items: Sequence[Any],
+    limit: int,
+    key: Callable[[Any], tuple[Any, ...]],
+) -> None:
+    """Set the ``X-Next-Cursor`` header when *items* filled a whole page."""
+    if items and len(items) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(items[-1]))
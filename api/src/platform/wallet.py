@@ -18,6 +18,8 @@ from __future__ import annotations
 import asyncio
 import logging
 import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from substrateinterface import Keypair, SubstrateInterface
 
@@ -31,6 +33,10 @@ logger = logging.getLogger(__name__)
 _keypair: Keypair | None = None
 _substrate: SubstrateInterface | None = None
 _lock = threading.Lock()  # protects _substrate from concurrent thread access
+# Read-only RPC (best-block lookups) has a connection of its own: a transfer
+# holds _lock until its block is included, and lookups must not wait for that
+_reader: SubstrateInterface | None = None
+_reader_lock = threading.Lock()
 
 
 def get_keypair() -> Keypair:
@@ -47,32 +53,50 @@ def get_keypair() -> Keypair:
     return _keypair
 
 
-def get_substrate() -> SubstrateInterface:
-    """Return (and lazily create) the shared ``SubstrateInterface`` instance.
-
-    If the cached connection appears dead (e.g. WebSocket closed), it is
-    discarded and a fresh connection is established.
-    """
-    global _substrate
-    if _substrate is not None:
+def _connect(substrate: SubstrateInterface | None) -> SubstrateInterface:
+    """Return *substrate* if it still answers, else a fresh connection."""
+    if substrate is not None:
         # Quick health-check: if the underlying websocket is gone, reconnect.
         try:
-            _substrate.get_block_number(None)  # cheap RPC call
+            substrate.get_block_number(None)  # cheap RPC call
+            return substrate
         except Exception:
             logger.warning("Substrate RPC connection stale — reconnecting.")
             try:
-                _substrate.close()
+                substrate.close()
             except Exception:
                 pass
-            _substrate = None
 
-    if _substrate is None:
-        logger.info("Connecting to Substrate RPC: %s", settings.SUBSTRATE_RPC_URL)
-        _substrate = SubstrateInterface(url=settings.SUBSTRATE_RPC_URL)
-        logger.info("Connected to chain: %s", _substrate.chain)
+    logger.info("Connecting to Substrate RPC: %s", settings.SUBSTRATE_RPC_URL)
+    substrate = SubstrateInterface(url=settings.SUBSTRATE_RPC_URL)
+    logger.info("Connected to chain: %s", substrate.chain)
+    return substrate
+
+
+def get_substrate() -> SubstrateInterface:
+    """Return (and lazily create) the shared ``SubstrateInterface`` instance.
+
+    If the cached connection appears dead (e.g. WebSocket closed), it is
+    discarded and a fresh connection is established.
+    """
+    global _substrate
+    _substrate = _connect(_substrate)
     return _substrate
 
 
+@contextmanager
+def substrate_session() -> Iterator[SubstrateInterface]:
+    """Hold the read-only ``SubstrateInterface`` for a series of RPC calls.
+
+    The connection is not thread-safe, so readers are serialised on their
+    own lock; never submit extrinsics through it.
+    """
+    global _reader
+    with _reader_lock:
+        _reader = _connect(_reader)
+        yield _reader
+
+
 # ---------------------------------------------------------------------------
 # Transfer helpers
 # ---------------------------------------------------------------------------
@@ -0,0 +1,149 @@
+"""Read-replica routing with read-your-writes.
+
+When ``DATABASE_READ_URL`` is set, read-only endpoints use a session bound
+to the replica (``get_read_session`` in ``src.database``).  A client must
+still see its own writes, so a read falls back to the primary when:
+
+* the current request has already committed on the primary (e.g. the x402
+  middleware just recorded a purchase before running the lesson endpoint);
+* the client sent an ``X-Last-Write`` token — returned by the server on
+  every response whose request committed on the primary — that is more
+  recent than the replica's current lag (plus ``DB_REPLICA_LAG_MARGIN``);
+* the replica lags by more than ``DB_REPLICA_MAX_LAG`` or cannot be reached.
+
+The replica lag is measured on the replica itself at most once every
+``DB_REPLICA_LAG_CHECK_INTERVAL`` seconds per worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+LAST_WRITE_HEADER = "X-Last-Write"
+
+# Zero when the replica has replayed everything it received (an idle
+# primary does not make the replica look stale), otherwise the age of the
+# last replayed transaction.
+_REPLICA_LAG_QUERY = sa.text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaLagMonitor:
+    """Cached replication lag of a read replica, in seconds."""
+
+    def __init__(self, engine: AsyncEngine, interval: float) -> None:
+        self._engine = engine
+        self._interval = interval
+        self._lag = 0.0
+        self._checked_at = -math.inf
+        self._lock = asyncio.Lock()
+
+    async def lag(self) -> float:
+        """Current lag; ``math.inf`` if the replica could not be queried."""
+        if time.monotonic() - self._checked_at < self._interval:
+            return self._lag
+        async with self._lock:
+            if time.monotonic() - self._checked_at >= self._interval:
+                self._lag = await self._measure()
+                self._checked_at = time.monotonic()
+        return self._lag
+
+    async def _measure(self) -> float:
+        try:
+            async with self._engine.connect() as conn:
+                return float(await conn.scalar(_REPLICA_LAG_QUERY) or 0.0)
+        except Exception:
+            logger.warning(
+                "Replica lag check failed; reading from the primary.", exc_info=True
+            )
+            return math.inf
+
+
+# ---------------------------------------------------------------------------
+# Per-request write tracking
+# ---------------------------------------------------------------------------
+@dataclass(slots=True)
+class _RequestWrites:
+    last_write: float | None = None
+
+
+_request_writes: ContextVar[_RequestWrites | None] = ContextVar(
+    "request_writes", default=None
+)
+
+
+def track_primary_writes(engine: AsyncEngine) -> None:
+    """Record every commit on *engine* against the current request."""
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _on_commit(conn):  # type: ignore[no-untyped-def]
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.last_write = time.time()
+
+
+class ReadYourWritesMiddleware:
+    """Pure ASGI middleware that hands out ``X-Last-Write`` tokens."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        writes = _RequestWrites()
+        token = _request_writes.set(writes)
+
+        async def send_with_token(message: Message) -> None:
+            if message["type"] == "http.response.start" and writes.last_write:
+                headers = MutableHeaders(scope=message)
+                headers[LAST_WRITE_HEADER] = f"{writes.last_write:.3f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_token)
+        finally:
+            _request_writes.reset(token)
+
+
+async def must_read_primary(
+    last_write_token: str | None, monitor: ReplicaLagMonitor
+) -> bool:
+    """Decide whether a read-only request has to go to the primary."""
+    writes = _request_writes.get()
+    if writes is not None and writes.last_write is not None:
+        return True
+
+    lag = await monitor.lag()
+    if lag > settings.DB_REPLICA_MAX_LAG:
+        return True
+
+    if not last_write_token:
+        return False
+    try:
+        last_write = float(last_write_token)
+    except ValueError:
+        return False
+    return time.time() - last_write <= lag + settings.DB_REPLICA_LAG_MARGIN
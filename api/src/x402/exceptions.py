@@ -0,0 +1,9 @@
+from fastapi import HTTPException, status
+
+
+class SettlementNotFound(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Settlement not found.",
+        )
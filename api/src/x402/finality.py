@@ -0,0 +1,188 @@
+"""Finality confirmation of x402 purchases accepted from a best block.
+
+With ``X402_BEST_BLOCK_ACCEPTANCE`` the x402 scheme accepts a payment found
+in a best (not yet finalized) block: the purchase is recorded as
+``provisional`` and the lesson is served at once instead of after GRANDPA
+finality.  ``run_finality_confirmer`` (started by the app lifespan) checks
+each provisional purchase's block every ``X402_FINALITY_POLL_INTERVAL``
+seconds:
+
+* finalized — the purchase becomes ``pending`` and, once that is
+  committed, the deferred teacher payout is sent (``pay_confirmed_purchase``);
+* orphaned — the transaction is looked up again, in case a reorg moved it
+  to another block, and the purchase follows it there;
+* still not final after ``X402_FINALITY_TIMEOUT`` — the purchase is
+  revoked; access checks and paybacks ignore revoked purchases.
+
+Rows are claimed with ``FOR UPDATE SKIP LOCKED``, so every worker process
+can run the confirmer.  ``metrics`` counts the purchases this process
+accepted, confirmed and revoked; every change is logged with the totals.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Literal
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import settings
+from src.course.blockchain import (
+    block_finality,
+    find_unfinalized_tx,
+    get_block_hash_from_tx,
+    run_light_client,
+    verify_payment,
+    verify_unfinalized_payment,
+)
+from src.course.models import CoursePurchase
+from src.course.service import pay_confirmed_purchase
+
+logger = logging.getLogger(__name__)
+
+PROVISIONAL = "provisional"
+REVOKED = "revoked"
+
+Outcome = Literal["accepted", "confirmed", "revoked"]
+
+
+@dataclass(slots=True)
+class FastPathMetrics:
+    """Best-block purchases handled by this process."""
+
+    accepted: int = 0
+    confirmed: int = 0
+    revoked: int = 0
+
+
+metrics = FastPathMetrics()
+
+
+def record(outcome: Outcome, purchase: CoursePurchase) -> None:
+    """Count *outcome* for *purchase* and log it with the totals."""
+    setattr(metrics, outcome, getattr(metrics, outcome) + 1)
+    logger.log(
+        logging.WARNING if outcome == "revoked" else logging.INFO,
+        "x402 best-block purchase %s %s (tx=%s); "
+        "accepted=%d confirmed=%d revoked=%d",
+        purchase.id,
+        outcome,
+        purchase.transaction_hash,
+        metrics.accepted,
+        metrics.confirmed,
+        metrics.revoked,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Confirmation
+# ---------------------------------------------------------------------------
+async def _relocate(purchase: CoursePurchase) -> str | None:
+    """The block now holding the purchase's payment after a reorg, if any."""
+    tx_hash = purchase.transaction_hash
+    recipient = settings.PLATFORM_WALLET_ADDRESS
+    min_amount = purchase.amount_planck
+    block_hash = await asyncio.to_thread(find_unfinalized_tx, tx_hash)
+    if block_hash is not None:
+        verified = await asyncio.to_thread(
+            verify_unfinalized_payment, block_hash, recipient, min_amount
+        )
+    else:
+        block_hash = await run_light_client(get_block_hash_from_tx, tx_hash)
+        if block_hash is None:
+            return None
+        verified = await run_light_client(
+            verify_payment, block_hash, recipient, min_amount
+        )
+    return block_hash if verified else None
+
+
+async def _confirm(purchase: CoursePurchase, overdue: bool) -> Outcome | None:
+    """Check *purchase* once and update it (not committed)."""
+    finality = "orphaned"
+    if purchase.block_hash:
+        finality = await asyncio.to_thread(block_finality, purchase.block_hash)
+    if finality == "finalized":
+        # Paid only after this is committed (see pay_confirmed_purchase)
+        purchase.status = "pending"
+        return "confirmed"
+    if finality == "orphaned":
+        block_hash = await _relocate(purchase)
+        if block_hash is not None:
+            logger.info(
+                "x402 best-block purchase %s moved from block %s to %s",
+                purchase.id,
+                purchase.block_hash,
+                block_hash,
+            )
+            purchase.block_hash = block_hash
+            return None
+    if overdue:
+        purchase.status = REVOKED
+        return "revoked"
+    return None
+
+
+async def confirm_provisional(engine: AsyncEngine) -> int:
+    """Check every provisional purchase once; the number checked."""
+    timeout = timedelta(seconds=settings.X402_FINALITY_TIMEOUT)
+    overdue = (
+        CoursePurchase.provisional_since  # type: ignore[operator]
+        < sa.func.localtimestamp() - timeout
+    )
+    checked: set[uuid.UUID] = set()
+    while True:
+        # The row stays locked until its outcome is committed
+        async with AsyncSession(engine, expire_on_commit=False) as claim:
+            statement = select(CoursePurchase, overdue.label("overdue")).where(
+                CoursePurchase.status == PROVISIONAL  # type: ignore[arg-type]
+            )
+            if checked:
+                statement = statement.where(
+                    CoursePurchase.id.not_in(checked)  # type: ignore[union-attr]
+                )
+            row = (
+                await claim.exec(
+                    statement.order_by(CoursePurchase.provisional_since)  # type: ignore[arg-type]
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+            ).first()
+            if row is None:
+                return len(checked)
+            purchase, is_overdue = row
+            checked.add(purchase.id)
+            try:
+                outcome = await _confirm(purchase, is_overdue)
+            except Exception:
+                # Chain unreachable: retried on the next pass, never revoked
+                logger.exception("Finality check of purchase %s failed.", purchase.id)
+                continue
+            claim.add(purchase)
+            await claim.commit()
+        if outcome is not None:
+            record(outcome, purchase)
+        if outcome == "confirmed":
+            try:
+                async with AsyncSession(engine) as session:
+                    await pay_confirmed_purchase(session, purchase.id)
+            except Exception:
+                # Left pending, like any purchase whose payout failed
+                logger.exception("Payout for purchase %s failed.", purchase.id)
+
+
+async def run_finality_confirmer(engine: AsyncEngine, interval: float) -> None:
+    """Confirm provisional purchases every *interval* seconds until cancelled."""
+    while True:
+        try:
+            await confirm_provisional(engine)
+        except Exception:
+            logger.exception("x402 finality confirmer failed.")
+        await asyncio.sleep(interval)
@@ -4,9 +4,11 @@ Two-part integration:
 
 1. **Exception handler** — registered on the FastAPI app — catches
    ``PaymentRequired`` exceptions and returns a proper 402 response with
-   the ``PAYMENT-REQUIRED`` header (Base64-encoded JSON).
+   the ``PAYMENT-REQUIRED`` header (Base64-encoded JSON).  The header is
+   encoded once per course version and only the resource URL is spliced
+   in per response.
 
-2. **ASGI middleware** — intercepts incoming requests that carry a
+2. **Pure ASGI middleware** — intercepts incoming requests that carry a
    ``PAYMENT-SIGNATURE`` header. It decodes the payload, verifies the
    on-chain payment, records the purchase, and injects the original user
    context so the downstream route handler can proceed normally. On
@@ -26,6 +28,8 @@ import json
 import logging
 import re
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 import jwt as pyjwt
@@ -34,16 +38,21 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.auth.jwt import decode_token
 from src.auth import service as auth_service
+from src.auth.revocation import revocations
 from src.config import settings
 from src.course import service as course_service
-from src.course.exceptions import PaymentRequired
-from src.course.models import Course, CoursePurchase, Lesson
+from src.course.dependencies import LESSON_ACCESS_STATE, LessonAccess
+from src.course.exceptions import PaymentRequired, TransactionAlreadyUsed
+from src.course.models import CoursePurchase, Lesson
+from src.course.pricing import to_planck
 from src.database import engine
+from src.x402 import settlements
 from src.x402.polkadot_scheme import verify_and_settle
 from src.x402.types import (
     PaymentPayload,
@@ -79,90 +88,150 @@ def _b64_decode(value: str) -> dict:
     return json.loads(raw)
 
 
-def _build_payment_required(
-    request: Request,
-    course: Course,
-) -> X402PaymentRequired:
-    """Build the ``PaymentRequired`` payload for a course."""
-    min_amount = int(course.price * (10**settings.TOKEN_DECIMALS))
-    return X402PaymentRequired(
+def _payment_signature(scope: Scope) -> str | None:
+    """The ``PAYMENT-SIGNATURE`` header, straight from the raw ASGI headers."""
+    for name, value in scope["headers"]:
+        if name == b"payment-signature":
+            return value.decode("latin-1")
+    return None
+
+
+def _grant_access(scope: Scope, access: LessonAccess) -> None:
+    """Hand the resolved lesson access to ``require_lesson_purchase``."""
+    scope.setdefault("state", {})[LESSON_ACCESS_STATE] = access
+
+
+def _wants_async(scope: Scope) -> bool:
+    """Settle in the background (202) rather than within this request."""
+    if settings.X402_SETTLEMENT_WORKERS <= 0:
+        return False
+    if settings.X402_SETTLEMENT_MODE == "async":
+        return True
+    return "respond-async" in Headers(scope=scope).get("prefer", "")
+
+
+async def _enqueue_settlement(
+    session: AsyncSession,
+    scope: Scope,
+    payload: PaymentPayload,
+    course_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> Response:
+    """Queue the settlement and answer ``202 Accepted`` with its status URL."""
+    try:
+        settlement = await settlements.enqueue(
+            session, payload, course_id, user_id, scope["path"]
+        )
+    except TransactionAlreadyUsed as exc:
+        return JSONResponse(status_code=exc.status_code, content={"error": exc.detail})
+    status = settlements.to_status(settlement, scope.get("root_path", ""))
+    return JSONResponse(
+        status_code=202,
+        content=status.model_dump(),
+        headers={"Location": status.statusUrl, "Retry-After": "2"},
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _PaymentRequiredTemplate:
+    """A ``PAYMENT-REQUIRED`` header, encoded but for the resource URL.
+
+    ``head`` and ``tail`` are the Base64 of the JSON before and after the
+    URL; the JSON is padded with whitespace so that each part is a whole
+    number of 3-byte groups and the encodings can be concatenated.
+    """
+
+    head: str
+    tail: str
+
+    def render(self, url: str) -> str:
+        raw = json.dumps(url).encode()
+        raw += b" " * (-len(raw) % 3)
+        return self.head + base64.b64encode(raw).decode() + self.tail
+
+
+_URL_MARK = "\x00url\x00"
+
+
+@lru_cache(maxsize=settings.X402_PAYMENT_REQUIRED_CACHE_SIZE)
+def _payment_required_template(
+    course_id: str,
+    course_title: str,
+    price: float,
+    price_planck: int,
+    pay_to: str,
+) -> _PaymentRequiredTemplate:
+    """The header template for one version of a course (cached).
+
+    Every field the header depends on is part of the key, so editing a
+    course's title or price simply misses the cache.
+    """
+    payload = X402PaymentRequired(
         x402Version=2,
         resource=ResourceInfo(
-            url=str(request.url),
-            description=f"Access to course: {course.title}",
+            url=_URL_MARK,
+            description=f"Access to course: {course_title}",
             mimeType="application/json",
         ),
         accepts=[
             PaymentRequirements(
                 scheme="exact",
                 network=f"polkadot:{settings.NETWORK}",
-                maxAmountRequired=str(min_amount),
+                maxAmountRequired=str(price_planck),
                 asset="PAS",
-                payTo=settings.PLATFORM_WALLET_ADDRESS,
+                payTo=pay_to,
                 maxTimeoutSeconds=300,
                 extra={
-                    "courseId": str(course.id),
-                    "courseTitle": course.title,
-                    "price": course.price,
+                    "courseId": course_id,
+                    "courseTitle": course_title,
+                    "price": price,
                 },
             )
         ],
     )
+    raw = json.dumps(payload.model_dump(), separators=(",", ":")).encode()
+    head, tail = raw.split(json.dumps(_URL_MARK).encode())
+    head += b" " * (-len(head) % 3)
+    return _PaymentRequiredTemplate(
+        head=base64.b64encode(head).decode(), tail=base64.b64encode(tail).decode()
+    )
 
 
 # ---------------------------------------------------------------------------
 # Exception handler — converts PaymentRequired into x402 402 response
 # ---------------------------------------------------------------------------
 
+_PAYMENT_REQUIRED_BODY = json.dumps(
+    {"error": "Payment Required", "x402Version": 2}, separators=(",", ":")
+).encode()
+
 
 async def _payment_required_handler(
     request: Request, exc: PaymentRequired
-) -> JSONResponse:
+) -> Response:
     """Convert the old-style ``PaymentRequired`` exception into an x402 402.
 
     The ``PaymentRequired`` exception carries ``course_id``, ``course_title``,
     ``price``, and ``platform_wallet_address`` in its ``detail`` dict.
     """
     detail: dict = exc.detail  # type: ignore[assignment]
-    course_id = detail.get("course_id", "")
-    course_title = detail.get("course_title", "")
     price = detail.get("price", 0)
-    platform_wallet = detail.get(
-        "platform_wallet_address", settings.PLATFORM_WALLET_ADDRESS
-    )
-
-    min_amount = int(price * (10**settings.TOKEN_DECIMALS))
-
-    payload = X402PaymentRequired(
-        x402Version=2,
-        resource=ResourceInfo(
-            url=str(request.url),
-            description=f"Access to course: {course_title}",
-            mimeType="application/json",
-        ),
-        accepts=[
-            PaymentRequirements(
-                scheme="exact",
-                network=f"polkadot:{settings.NETWORK}",
-                maxAmountRequired=str(min_amount),
-                asset="PAS",
-                payTo=platform_wallet,
-                maxTimeoutSeconds=300,
-                extra={
-                    "courseId": course_id,
-                    "courseTitle": course_title,
-                    "price": price,
-                },
-            )
-        ],
+    min_amount = detail.get("price_planck")
+    if not min_amount:  # absent, or 0 before the planck backfill
+        min_amount = to_planck(price)
+
+    template = _payment_required_template(
+        detail.get("course_id", ""),
+        detail.get("course_title", ""),
+        price,
+        min_amount,
+        detail.get("platform_wallet_address", settings.PLATFORM_WALLET_ADDRESS),
     )
-
-    encoded = _b64_encode(payload.model_dump())
-
-    return JSONResponse(
+    return Response(
+        content=_PAYMENT_REQUIRED_BODY,
         status_code=402,
-        content={"error": "Payment Required", "x402Version": 2},
-        headers={"PAYMENT-REQUIRED": encoded},
+        media_type="application/json",
+        headers={"PAYMENT-REQUIRED": template.render(str(request.url))},
     )
 
 
@@ -171,35 +240,68 @@ async def _payment_required_handler(
 # ---------------------------------------------------------------------------
 
 
-class X402Middleware(BaseHTTPMiddleware):
+class X402Middleware:
     """Process ``PAYMENT-SIGNATURE`` headers on x402-protected routes.
 
-    If the header is present:
+    Pure ASGI: requests without the header, or not on a protected route,
+    are passed straight through after a scan of the raw headers and a path
+    match.  If the header is present:
     1. Decode it (Base64 → JSON → ``PaymentPayload``).
     2. Extract the user from the JWT ``Authorization`` header.
     3. Identify the course from the lesson in the URL.
     4. Call ``verify_and_settle`` to confirm on-chain and record the purchase.
-    5. If successful, let the request proceed and add ``PAYMENT-RESPONSE`` header.
+    5. If successful, let the request proceed and add ``PAYMENT-RESPONSE`` header
+       (by wrapping ``send``, so the response is not buffered).
+
+    In async mode (``X402_SETTLEMENT_MODE=async`` or ``Prefer:
+    respond-async``) step 4 is queued instead and the response is ``202``
+    with a settlement status URL (see ``src.x402.settlements``).
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
-        payment_sig = request.headers.get("PAYMENT-SIGNATURE") or request.headers.get(
-            "payment-signature"
-        )
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-        if not payment_sig:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Only process on x402-protected routes
-        path = request.url.path
-        lesson_match = _LESSON_DETAIL_RE.match(path) or _LESSON_QUIZZES_RE.match(path)
+        payment_sig = _payment_signature(scope)
+        lesson_match = payment_sig and (
+            _LESSON_DETAIL_RE.match(scope["path"])
+            or _LESSON_QUIZZES_RE.match(scope["path"])
+        )
         if not lesson_match:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
-        lesson_id_str = lesson_match.group(1)
+        settle_result = await self._settle(scope, payment_sig, lesson_match.group(1))
+        if isinstance(settle_result, Response):
+            await settle_result(scope, receive, send)
+            return
+        if settle_result is None:
+            await self.app(scope, receive, send)
+            return
 
+        # Payment settled — let the original request proceed
+        # ``require_lesson_purchase`` reuses the access resolved in _settle
+        encoded_response = _b64_encode(settle_result.model_dump())
+
+        async def send_with_payment_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["PAYMENT-RESPONSE"] = encoded_response
+            await send(message)
+
+        await self.app(scope, receive, send_with_payment_response)
+
+    async def _settle(
+        self, scope: Scope, payment_sig: str, lesson_id_str: str
+    ) -> Response | SettleResponse | None:
+        """Verify and settle the payment.
+
+        Returns the settlement, ``None`` when the course was already
+        purchased, or an error response to send instead of the route's.
+        """
         # Decode the PAYMENT-SIGNATURE header
         try:
             decoded = _b64_decode(payment_sig)
@@ -212,7 +314,7 @@ class X402Middleware(BaseHTTPMiddleware):
             )
 
         # Extract user from JWT
-        auth_header = request.headers.get("Authorization", "")
+        auth_header = Headers(scope=scope).get("Authorization", "")
         if not auth_header.startswith("Bearer "):
             return JSONResponse(
                 status_code=401,
@@ -232,6 +334,11 @@ class X402Middleware(BaseHTTPMiddleware):
                 status_code=401, content={"error": "Invalid token type."}
             )
 
+        if await revocations.is_revoked(jwt_payload.get("jti")):
+            return JSONResponse(
+                status_code=401, content={"error": "Token has been revoked."}
+            )
+
         user_id_str = jwt_payload.get("sub")
         if not user_id_str:
             return JSONResponse(
@@ -241,10 +348,11 @@ class X402Middleware(BaseHTTPMiddleware):
         user_id = uuid.UUID(user_id_str)
 
         # Open a DB session, look up the lesson → course, then verify & settle
-        settle_result: SettleResponse | None = None
-        async with AsyncSession(engine) as session:
+        # expire_on_commit=False: the lesson and course outlive the session
+        # and are handed to require_lesson_purchase through the request state
+        async with AsyncSession(engine, expire_on_commit=False) as session:
             # Verify user exists
-            user = await auth_service.get_user_by_id(session, user_id)
+            user = await auth_service.get_user_by_id_cached(session, user_id)
             if not user:
                 return JSONResponse(
                     status_code=401, content={"error": "User no longer exists."}
@@ -264,13 +372,10 @@ class X402Middleware(BaseHTTPMiddleware):
                 select(CoursePurchase).where(
                     CoursePurchase.course_id == lesson.course_id,  # type: ignore[arg-type]
                     CoursePurchase.user_id == user_id,  # type: ignore[arg-type]
+                    CoursePurchase.status != "revoked",  # type: ignore[arg-type]
                 )
             )
             existing = result.first()
-            if existing:
-                # Already purchased — just proceed, no need to settle again
-                response = await call_next(request)
-                return response
 
             # Look up the course
             course = await course_service.get_course_by_id(session, lesson.course_id)
@@ -279,6 +384,17 @@ class X402Middleware(BaseHTTPMiddleware):
                     status_code=404, content={"error": "Course not found."}
                 )
 
+            access = LessonAccess(lesson=lesson, course=course, user_id=user_id)
+            if existing:
+                # Already purchased — just proceed, no need to settle again
+                _grant_access(scope, access)
+                return None
+
+            if _wants_async(scope):
+                return await _enqueue_settlement(
+                    session, scope, payload, course.id, user_id
+                )
+
             # Verify and settle
             try:
                 settle_result = await verify_and_settle(
@@ -300,16 +416,8 @@ class X402Middleware(BaseHTTPMiddleware):
                     },
                 )
 
-        # Payment settled — let the original request proceed
-        # The downstream ``require_lesson_purchase`` will now find the purchase
-        response = await call_next(request)
-
-        # Add PAYMENT-RESPONSE header
-        if settle_result:
-            encoded_response = _b64_encode(settle_result.model_dump())
-            response.headers["PAYMENT-RESPONSE"] = encoded_response
-
-        return response
+        _grant_access(scope, access)
+        return settle_result
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,88 @@
+import uuid
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Field, SQLModel
+
+
+class X402Settlement(SQLModel, table=True):
+    """x402 payment queued for asynchronous settlement.
+
+    ``status`` goes ``pending`` → ``settled`` or ``failed``; pending rows are
+    (re)tried by the settlement workers from ``next_attempt_at`` on.
+    """
+
+    __tablename__ = "x402_settlement"  # type: ignore[assignment]
+    __table_args__ = (
+        # Worker pickup: due pending settlements, oldest first
+        sa.Index(
+            "x402_settlement_next_attempt_at_idx",
+            "next_attempt_at",
+            postgresql_where=sa.text("status = 'pending'"),
+        ),
+    )
+
+    id: uuid.UUID = Field(
+        sa_column=sa.Column(postgresql.UUID, primary_key=True, default=uuid.uuid4)
+    )
+    transaction_hash: str = Field(
+        sa_column=sa.Column(sa.Text, nullable=False, unique=True)
+    )
+    course_id: uuid.UUID = Field(
+        sa_column=sa.Column(
+            postgresql.UUID,
+            sa.ForeignKey("course.id", ondelete="CASCADE"),
+            nullable=False,
+        )
+    )
+    user_id: uuid.UUID = Field(
+        sa_column=sa.Column(
+            postgresql.UUID,
+            sa.ForeignKey("user.id", ondelete="CASCADE"),
+            nullable=False,
+            index=True,
+        )
+    )
+    # Path of the paid request, for the client to retry once settled
+    resource: str = Field(sa_column=sa.Column(sa.Text, nullable=False))
+    # The decoded PAYMENT-SIGNATURE payload
+    payload: dict[str, Any] = Field(
+        sa_column=sa.Column(postgresql.JSONB, nullable=False)
+    )
+
+    status: str = Field(
+        default="pending",
+        sa_column=sa.Column(sa.Text, nullable=False, server_default="pending"),
+    )
+    attempts: int = Field(
+        default=0, sa_column=sa.Column(sa.Integer, nullable=False, server_default="0")
+    )
+    error: str | None = Field(default=None, sa_column=sa.Column(sa.Text))
+    # The SettleResponse, once settled
+    result: dict[str, Any] | None = Field(
+        default=None, sa_column=sa.Column(postgresql.JSONB)
+    )
+
+    next_attempt_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+    )
+    created_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()
+        ),
+    )
+    updated_at: datetime | None = Field(
+        default=None,
+        sa_column=sa.Column(
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+            onupdate=sa.func.now(),
+        ),
+    )
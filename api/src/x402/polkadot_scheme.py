@@ -4,26 +4,53 @@ Implements the *post-payment proof* approach:
 1. **verify**: Confirm the ``transactionHash`` exists on-chain and that a
    ``Balances.Transfer`` to the platform wallet for the required amount is
    present in the block.
-2. **settle**: Calculate fee split, send teacher payout, and persist the
-   ``CoursePurchase`` record.
+2. **settle**: Calculate fee split, claim the ``CoursePurchase`` record, and
+   send the teacher payout.
+
+With ``X402_BEST_BLOCK_ACCEPTANCE`` a transaction not finalized yet is
+looked up in the best chain first: found there, the purchase is recorded as
+``provisional`` (access at once, payout deferred) and ``src.x402.finality``
+confirms or revokes it once the block is final or abandoned.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import uuid
 
-from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.config import settings
-from src.course.blockchain import get_block_hash_from_tx, verify_payment
-from src.course.models import Course, CoursePurchase, Lesson
+from src.course.blockchain import (
+    find_unfinalized_tx,
+    get_block_hash_from_tx,
+    run_light_client,
+    verify_payment,
+    verify_unfinalized_payment,
+)
+from src.course.exceptions import TransactionAlreadyUsed
+from src.course.models import Course
+from src.course.pricing import split_payment
+from src.course.service import settle_purchase
+from src.x402 import finality
 from src.x402.types import PaymentPayload, SettleResponse
 
 logger = logging.getLogger(__name__)
 
 
+class SettlementPending(ValueError):
+    """Verification cannot complete *yet* (transaction not finalized, chain
+    metadata unavailable); the same payload may succeed when retried."""
+
+
+# Settlements running in this worker: transaction hash → (course, user) and
+# the future that the duplicates of that settlement wait on
+_inflight: dict[
+    str, tuple[tuple[uuid.UUID, uuid.UUID], asyncio.Future[SettleResponse]]
+] = {}
+
+
 async def verify_and_settle(
     payload: PaymentPayload,
     course: Course,
@@ -32,23 +59,80 @@ async def verify_and_settle(
 ) -> SettleResponse:
     """Verify on-chain payment and persist the purchase.
 
+    Concurrent calls for the same transaction are coalesced: the first one
+    scans, verifies and settles, and the rest await its outcome instead of
+    repeating the work (or fail at once if they are for another course or
+    user).
+
     Returns a ``SettleResponse`` on success.
-    Raises ``ValueError`` with a human-readable message on failure.
+    Raises ``ValueError`` with a human-readable message on failure
+    (``SettlementPending`` when a later retry may succeed).
     """
+    tx_hash = payload.payload.transactionHash
+    purchase_key = (course.id, user_id)
+
+    inflight = _inflight.get(tx_hash)
+    if inflight is not None:
+        key, pending = inflight
+        if key != purchase_key:
+            raise ValueError(
+                f"Transaction {tx_hash} is already being settled for another purchase."
+            )
+        return await asyncio.shield(pending)
+
+    future: asyncio.Future[SettleResponse] = asyncio.get_running_loop().create_future()
+    _inflight[tx_hash] = (purchase_key, future)
+    try:
+        result = await _verify_and_settle(payload, course, user_id, session)
+    except BaseException as exc:
+        if isinstance(exc, Exception):
+            future.set_exception(exc)
+        else:  # cancelled: the waiters should retry, not be cancelled too
+            future.set_exception(
+                ValueError(f"Settlement of {tx_hash} was interrupted; please retry.")
+            )
+        future.exception()  # retrieved, even when nobody was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        del _inflight[tx_hash]
+
+
+async def _verify_and_settle(
+    payload: PaymentPayload,
+    course: Course,
+    user_id: uuid.UUID,
+    session: AsyncSession,
+) -> SettleResponse:
     proof = payload.payload
     tx_hash = proof.transactionHash
     block_hash = proof.blockHash
 
     # Capture ORM attributes before any session operations can expire them.
     course_id = course.id
-    course_price = course.price
+    if course.price_planck <= 0:
+        # 0 until the course_planck_totals migration: any transfer would match
+        raise SettlementPending(
+            "This course's price is not available yet; please retry later."
+        )
+    split = split_payment(course.price_planck, course.total_payback_reserve_planck)
     author_id = course.author_id
 
     # Step 1 — locate the block containing this transaction
+    provisional_block: str | None = None
+    if not block_hash and settings.X402_BEST_BLOCK_ACCEPTANCE:
+        # Fast path: a transfer in a best block unlocks the lesson now
+        try:
+            provisional_block = await asyncio.to_thread(find_unfinalized_tx, tx_hash)
+        except Exception:
+            logger.warning("Best-block search for %s failed.", tx_hash, exc_info=True)
+        block_hash = provisional_block
     if not block_hash:
-        block_hash = get_block_hash_from_tx(tx_hash)
+        block_hash = await run_light_client(get_block_hash_from_tx, tx_hash)
     if not block_hash:
-        raise ValueError(
+        raise SettlementPending(
             f"Transaction {tx_hash} not found in recent finalized blocks. "
             "It may not be finalized yet — please wait and retry."
         )
@@ -58,14 +142,21 @@ async def verify_and_settle(
     if not platform_address:
         raise ValueError("Platform wallet address not configured.")
 
-    min_amount = int(course_price * (10**settings.TOKEN_DECIMALS))
+    min_amount = split.price
     try:
-        verified = verify_payment(block_hash, platform_address, min_amount)
+        if provisional_block:
+            verified = await asyncio.to_thread(
+                verify_unfinalized_payment, block_hash, platform_address, min_amount
+            )
+        else:
+            verified = await run_light_client(
+                verify_payment, block_hash, platform_address, min_amount
+            )
     except RuntimeError as exc:
         # pypolkadot can raise RuntimeError when it can't decode events
         # (e.g. metadata desync after a runtime upgrade).
         logger.error("Light client RuntimeError during verify_payment: %s", exc)
-        raise ValueError(
+        raise SettlementPending(
             "On-chain verification temporarily unavailable due to a chain "
             "metadata issue. Please try again in a few minutes."
         ) from exc
@@ -76,89 +167,35 @@ async def verify_and_settle(
         )
 
     # -----------------------------------------------------------------
-    # Step 3 — settlement: fee split → teacher payout → persist
+    # Step 3 — settlement: claim the purchase → teacher payout
     #
-    # This mirrors the post-verification logic in service.create_purchase
-    # but avoids the redundant on-chain re-verification.
+    # Shared with service.create_purchase, without the redundant on-chain
+    # re-verification.  The claim is what makes duplicates on other
+    # workers safe (unique ``course_purchase.transaction_hash``).
     # -----------------------------------------------------------------
-
-    # 3a – calculate fee split
-    platform_fee = round(course_price * settings.PLATFORM_FEE_RATE, 10)
-
-    lessons_result = await session.exec(
-        select(Lesson).where(Lesson.course_id == course_id)  # type: ignore[arg-type]
-    )
-    lessons = list(lessons_result.all())
-    total_payback_reserve = round(sum(l.payback_amount for l in lessons), 10)
-
-    teacher_share = round(course_price - platform_fee - total_payback_reserve, 10)
-    if teacher_share < 0:
-        teacher_share = 0.0
-
-    # 3b – send teacher's share on-chain (if > 0)
-    teacher_payout_hash: str | None = None
-    if teacher_share > 0:
-        from src.auth.models import User
-
-        user_result = await session.exec(
-            select(User).where(User.id == author_id)  # type: ignore[arg-type]
+    try:
+        purchase = await settle_purchase(
+            session,
+            course_id=course_id,
+            author_id=author_id,
+            user_id=user_id,
+            tx_hash=tx_hash,
+            split=split,
+            provisional_block=provisional_block,
         )
-        author = user_result.first()
-        teacher_wallet = author.wallet_address if author else None
-
-        if teacher_wallet:
-            from src.platform.wallet import async_transfer_to_teacher
-
-            teacher_amount_planck = int(teacher_share * (10**settings.TOKEN_DECIMALS))
-            try:
-                teacher_payout_hash = await async_transfer_to_teacher(
-                    teacher_wallet, teacher_amount_planck
-                )
-                logger.info(
-                    "Teacher payout: %.4f PAS -> %s (tx=%s)",
-                    teacher_share,
-                    teacher_wallet,
-                    teacher_payout_hash,
-                )
-            except Exception:
-                logger.exception(
-                    "Teacher payout FAILED: %.4f PAS (%d planck) -> %s for course=%s. "
-                    "Purchase will be saved with status='pending'.",
-                    teacher_share,
-                    teacher_amount_planck,
-                    teacher_wallet,
-                    course_id,
-                )
-        else:
-            logger.warning(
-                "No wallet found for author %s; skipping teacher payout.",
-                author_id,
-            )
-
-    # 3c – persist
-    purchase = CoursePurchase(
-        id=uuid.uuid4(),
-        course_id=course_id,
-        user_id=user_id,
-        transaction_hash=tx_hash,
-        amount=course_price,
-        platform_fee_amount=platform_fee,
-        payback_reserve_amount=total_payback_reserve,
-        teacher_payout_amount=teacher_share,
-        teacher_payout_hash=teacher_payout_hash,
-        status="completed" if teacher_payout_hash else "pending",
-    )
-    session.add(purchase)
-    await session.commit()
-    await session.refresh(purchase)
+    except TransactionAlreadyUsed as exc:
+        raise ValueError(exc.detail) from exc
 
     logger.info(
-        "x402 settle OK: purchase=%s, tx=%s, course=%s, user=%s",
+        "x402 settle OK: purchase=%s, tx=%s, course=%s, user=%s, status=%s",
         purchase.id,
         tx_hash,
         course_id,
         user_id,
+        purchase.status,
     )
+    if provisional_block and purchase.block_hash == provisional_block:
+        finality.record("accepted", purchase)
 
     return SettleResponse(
         success=True,
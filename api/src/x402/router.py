@@ -0,0 +1,95 @@
+import uuid
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import UUID4
+
+from src.auth.dependencies import get_current_user_id
+from src.config import settings
+from src.database import engine
+from src.x402 import settlements
+from src.x402.exceptions import SettlementNotFound
+from src.x402.types import SettlementStatus
+
+settlement_router = APIRouter(prefix="/x402/settlements", tags=["x402"])
+
+# SSE streams re-check at least this often (and send a keep-alive comment)
+_STREAM_STEP = 15.0
+
+
+def _status_response(status_: SettlementStatus) -> JSONResponse:
+    headers = {"Retry-After": "2"} if status_.status == settlements.PENDING else {}
+    return JSONResponse(content=status_.model_dump(), headers=headers)
+
+
+async def _stream(
+    settlement_id: uuid.UUID, root_path: str, first: SettlementStatus
+) -> AsyncIterator[str]:
+    current = first
+    yield f"event: {current.status}\ndata: {current.model_dump_json()}\n\n"
+    while current.status == settlements.PENDING:
+        settlement = await settlements.wait_for_settlement(
+            engine, settlement_id, _STREAM_STEP
+        )
+        if settlement is None:
+            return
+        current = settlements.to_status(settlement, root_path)
+        if current.status == settlements.PENDING:
+            yield ": keep-alive\n\n"
+        else:
+            yield f"event: {current.status}\ndata: {current.model_dump_json()}\n\n"
+
+
+@settlement_router.get(
+    "/{settlement_id}",
+    response_model=SettlementStatus,
+    summary="Get an x402 settlement's status",
+    description=(
+        "Status of a payment queued by the x402 middleware (202 response). "
+        "``wait`` long-polls: the response is held until the settlement is no "
+        "longer pending or ``wait`` seconds have passed. With "
+        "``Accept: text/event-stream`` the status is streamed as server-sent "
+        "events until it is ``settled`` or ``failed``. Once settled, request "
+        "``resource`` again to get the paid content."
+    ),
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Settlement status (JSON or an event stream).",
+            "content": {"text/event-stream": {}},
+        },
+        status.HTTP_401_UNAUTHORIZED: {"description": "Not authenticated."},
+        status.HTTP_404_NOT_FOUND: {"description": "Settlement not found."},
+    },
+)
+async def get_settlement_status(
+    settlement_id: UUID4,
+    request: Request,
+    wait: float = Query(
+        default=0,
+        ge=0,
+        le=settings.X402_SETTLEMENT_MAX_WAIT,
+        description="Seconds to wait for a pending settlement to finish.",
+    ),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+) -> Response:
+    # No session dependency: nothing is held open while the request waits
+    settlement = await settlements.wait_for_settlement(engine, settlement_id, 0)
+    if settlement is None or settlement.user_id != user_id:
+        raise SettlementNotFound()
+
+    root_path = request.scope.get("root_path", "")
+    if "text/event-stream" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            _stream(
+                settlement_id, root_path, settlements.to_status(settlement, root_path)
+            ),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    if wait and settlement.status == settlements.PENDING:
+        settlement = await settlements.wait_for_settlement(engine, settlement_id, wait)
+        if settlement is None:
+            raise SettlementNotFound()
+    return _status_response(settlements.to_status(settlement, root_path))
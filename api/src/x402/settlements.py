@@ -0,0 +1,256 @@
+"""Asynchronous x402 settlement.
+
+With ``X402_SETTLEMENT_MODE=async`` (or a ``Prefer: respond-async`` request
+header), ``X402Middleware`` validates the payment payload, queues it in
+``x402_settlement`` and answers ``202 Accepted`` with a status URL instead
+of holding the connection through block search, event verification and
+the teacher payout.
+
+``run_settlement_worker`` (started by the app lifespan) settles queued
+payments with ``verify_and_settle``: ``X402_SETTLEMENT_WORKERS`` tasks per
+process claim due rows with ``FOR UPDATE SKIP LOCKED``, so every worker
+process can run them and a row is settled once.  Transactions that are not
+finalized yet are retried with backoff until ``X402_SETTLEMENT_TIMEOUT``.
+
+The status resource (``src.x402.router``) long-polls or streams through
+``wait_for_settlement``, which holds no database connection while it
+waits: it re-reads the row when a local worker finishes it or every
+``_POLL_STEP`` seconds.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.config import settings
+from src.course.exceptions import TransactionAlreadyUsed
+from src.course.service import get_course_by_id
+from src.x402.models import X402Settlement
+from src.x402.polkadot_scheme import SettlementPending, verify_and_settle
+from src.x402.types import PaymentPayload, SettleResponse, SettlementStatus
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+SETTLED = "settled"
+FAILED = "failed"
+
+_settlement: sa.Table = X402Settlement.__table__  # type: ignore[attr-defined]
+
+_POLL_STEP = 1.0
+_RETRY_BASE = 3.0  # seconds; roughly a block
+_RETRY_MAX = 30.0
+
+# Work queued in this process (wakes an idle worker at once)
+_work_queued = asyncio.Event()
+# Settlements finished in this process, for waiters on them
+_finished: dict[uuid.UUID, asyncio.Event] = {}
+
+
+def status_url(settlement_id: uuid.UUID, root_path: str = "") -> str:
+    return f"{root_path}/x402/settlements/{settlement_id}"
+
+
+def to_status(settlement: X402Settlement, root_path: str = "") -> SettlementStatus:
+    return SettlementStatus(
+        id=str(settlement.id),
+        status=settlement.status,
+        transaction=settlement.transaction_hash,
+        resource=settlement.resource,
+        statusUrl=status_url(settlement.id, root_path),
+        error=settlement.error,
+        paymentResponse=(
+            SettleResponse.model_validate(settlement.result)
+            if settlement.result
+            else None
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Queue
+# ---------------------------------------------------------------------------
+async def enqueue(
+    session: AsyncSession,
+    payload: PaymentPayload,
+    course_id: uuid.UUID,
+    user_id: uuid.UUID,
+    resource: str,
+) -> X402Settlement:
+    """Queue *payload* for settlement.
+
+    A retried payload gets the settlement already queued for its
+    transaction; one that has ``failed`` (e.g. finality stalled past
+    ``X402_SETTLEMENT_TIMEOUT``) is queued again from scratch, so a paid
+    transaction can always be redeemed later.
+
+    Raises:
+        TransactionAlreadyUsed: the transaction is queued for another
+            course or user.
+    """
+    tx_hash = payload.payload.transactionHash
+    statement = insert(_settlement).values(
+        id=uuid.uuid4(),
+        transaction_hash=tx_hash,
+        course_id=course_id,
+        user_id=user_id,
+        resource=resource,
+        payload=payload.model_dump(),
+    )
+    await session.exec(
+        statement.on_conflict_do_update(  # type: ignore[call-overload]
+            index_elements=["transaction_hash"],
+            set_={
+                "status": PENDING,
+                "resource": statement.excluded.resource,
+                "payload": statement.excluded.payload,
+                "attempts": 0,
+                "error": sa.null(),
+                "result": sa.null(),
+                "next_attempt_at": sa.func.now(),
+                "created_at": sa.func.now(),
+                "updated_at": sa.func.now(),
+            },
+            where=sa.and_(
+                _settlement.c.status == FAILED,
+                _settlement.c.course_id == statement.excluded.course_id,
+                _settlement.c.user_id == statement.excluded.user_id,
+            ),
+        )
+    )
+    await session.commit()
+    settlement = (
+        await session.exec(
+            select(X402Settlement).where(
+                X402Settlement.transaction_hash == tx_hash  # type: ignore[arg-type]
+            )
+        )
+    ).one()
+    if settlement.course_id != course_id or settlement.user_id != user_id:
+        raise TransactionAlreadyUsed(tx_hash)
+    _work_queued.set()
+    return settlement
+
+
+async def wait_for_settlement(
+    engine: AsyncEngine, settlement_id: uuid.UUID, timeout: float
+) -> X402Settlement | None:
+    """The settlement once it is no longer pending, or after *timeout* s."""
+    deadline = time.monotonic() + timeout
+    while True:
+        async with AsyncSession(engine) as session:
+            settlement = await session.get(X402Settlement, settlement_id)
+        remaining = deadline - time.monotonic()
+        if settlement is None or settlement.status != PENDING or remaining <= 0:
+            _finished.pop(settlement_id, None)
+            return settlement
+        finished = _finished.setdefault(settlement_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(finished.wait(), min(remaining, _POLL_STEP))
+        except TimeoutError:
+            pass
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+def _retry_delay(attempts: int) -> float:
+    return min(_RETRY_BASE * 2 ** (attempts - 1), _RETRY_MAX)
+
+
+async def _settle(session: AsyncSession, settlement: X402Settlement) -> None:
+    """Attempt *settlement* once and record the outcome on it (not committed)."""
+    settlement.attempts += 1
+    retry_error: str | None = None
+    try:
+        course = await get_course_by_id(session, settlement.course_id)
+        if course is None:
+            raise ValueError("Course not found.")
+        result = await verify_and_settle(
+            PaymentPayload.model_validate(settlement.payload),
+            course,
+            settlement.user_id,
+            session,
+        )
+    except SettlementPending as exc:
+        retry_error = str(exc)
+    except ValueError as exc:
+        settlement.status = FAILED
+        settlement.error = str(exc)
+        return
+    except Exception:
+        logger.exception("x402 settlement %s failed unexpectedly", settlement.id)
+        retry_error = "Payment verification failed due to a server error."
+    else:
+        settlement.status = SETTLED
+        settlement.error = None
+        settlement.result = result.model_dump()
+        return
+
+    now = datetime.now(timezone.utc)
+    assert settlement.created_at is not None
+    giving_up_at = settlement.created_at + timedelta(
+        seconds=settings.X402_SETTLEMENT_TIMEOUT
+    )
+    settlement.error = retry_error
+    if now >= giving_up_at:
+        settlement.status = FAILED
+    else:
+        settlement.next_attempt_at = now + timedelta(
+            seconds=_retry_delay(settlement.attempts)
+        )
+
+
+async def settle_next(engine: AsyncEngine) -> bool:
+    """Settle one due settlement; ``False`` when there was none."""
+    # The row stays locked (FOR UPDATE) until the outcome is committed, so no
+    # other worker picks it up; the settlement itself runs in its own session
+    async with AsyncSession(engine, expire_on_commit=False) as claim:
+        settlement = (
+            await claim.exec(
+                select(X402Settlement)
+                .where(
+                    X402Settlement.status == PENDING,  # type: ignore[arg-type]
+                    X402Settlement.next_attempt_at <= sa.func.now(),  # type: ignore[arg-type,operator]
+                )
+                .order_by(X402Settlement.next_attempt_at)  # type: ignore[arg-type]
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+        ).first()
+        if settlement is None:
+            return False
+        async with AsyncSession(engine) as session:
+            await _settle(session, settlement)
+        claim.add(settlement)
+        await claim.commit()
+
+    finished = _finished.pop(settlement.id, None)
+    if finished is not None:
+        finished.set()
+    return True
+
+
+async def run_settlement_worker(engine: AsyncEngine, interval: float) -> None:
+    """Settle queued payments until cancelled, polling every *interval* s."""
+    while True:
+        try:
+            if await settle_next(engine):
+                continue
+        except Exception:
+            logger.exception("x402 settlement worker failed.")
+        try:
+            await asyncio.wait_for(_work_queued.wait(), interval)
+        except TimeoutError:
+            pass
+        _work_queued.clear()
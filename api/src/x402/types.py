@@ -86,3 +86,20 @@ class SettleResponse(BaseModel):
     transaction: str  # the verified transaction hash
     network: str  # "polkadot:paseo"
     payer: str | None = None  # sender SS58 / hex, if known
+
+
+# ---------------------------------------------------------------------------
+# Server → Client (asynchronous settlement: 202 body and status resource)
+# ---------------------------------------------------------------------------
+
+
+class SettlementStatus(BaseModel):
+    """State of a queued settlement (``X402_SETTLEMENT_MODE=async``)."""
+
+    id: str
+    status: str  # "pending" | "settled" | "failed"
+    transaction: str  # the transaction hash being verified
+    resource: str  # the paid path; request it again once settled
+    statusUrl: str
+    error: str | None = None  # why it failed, or the last retryable error
+    paymentResponse: SettleResponse | None = None  # once settled
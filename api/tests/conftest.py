@@ -0,0 +1,96 @@
+"""Shared fixtures.
+
+No test reaches the chain: the ``src.course.blockchain`` and
+``src.platform.wallet`` calls on the tested paths are stubbed.  Tests using
+the ``session`` or ``engine`` fixture need a disposable Postgres database
+in ``TEST_DATABASE_URL`` (it is migrated once and its tables are emptied
+before every test) and are skipped without one.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if TEST_DATABASE_URL:
+    # Code that uses the application engine must not touch another database
+    os.environ["DATABASE_URL"] = TEST_DATABASE_URL
+
+import pytest  # noqa: E402
+import sqlalchemy as sa  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: E402
+
+import main  # noqa: E402, F401  (registers every table)
+from src.auth.models import User  # noqa: E402
+from src.course.models import Course  # noqa: E402
+from src.database import create_engine  # noqa: E402
+from src.migrations.runner import migrate  # noqa: E402
+from src.models import Role  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def engine(anyio_backend):
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(TEST_DATABASE_URL)
+    await migrate(engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def session(engine):
+    tables = ", ".join(f'"{t.name}"' for t in SQLModel.metadata.sorted_tables)
+    async with engine.begin() as conn:
+        await conn.execute(sa.text(f"TRUNCATE {tables} CASCADE"))
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(session: AsyncSession):
+    async def make(role: Role = Role.STUDENT) -> User:
+        user = User(
+            id=uuid.uuid4(),
+            wallet_address=f"5{uuid.uuid4().hex}",
+            display_name=role.value,
+            role=role,
+        )
+        session.add(user)
+        await session.commit()
+        return user
+
+    return make
+
+
+@pytest.fixture
+async def teacher(make_user) -> User:
+    return await make_user(Role.TEACHER)
+
+
+@pytest.fixture
+async def student(make_user) -> User:
+    return await make_user()
+
+
+@pytest.fixture
+async def course(session: AsyncSession, teacher: User) -> Course:
+    course = Course(
+        id=uuid.uuid4(),
+        title="Polkadot basics",
+        description="Relay chain, parachains and XCM.",
+        price=3.0,
+        price_planck=30_000_000_000,
+        total_payback_reserve_planck=10_000_000_000,
+        author_id=teacher.id,
+    )
+    session.add(course)
+    await session.commit()
+    return course
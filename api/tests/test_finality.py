@@ -0,0 +1,221 @@
+"""Finality confirmation of purchases accepted from a best block."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import timedelta
+
+import pytest
+import sqlalchemy as sa
+
+from src.config import settings
+from src.course.models import CoursePurchase
+from src.course.pricing import split_payment
+from src.course.service import settle_purchase
+from src.x402 import finality
+
+pytestmark = pytest.mark.anyio
+
+TX_HASH = "0x" + "ef" * 32
+
+
+class Chain:
+    """Stubbed chain lookups used by ``src.x402.finality``."""
+
+    def __init__(self, monkeypatch) -> None:
+        self.finality: dict[str, str] = {}
+        self.best: dict[str, str] = {}  # tx hash → best block
+        self.finalized: dict[str, str] = {}  # tx hash → finalized block
+        self.verified: list[tuple[str, int]] = []  # (block, min amount)
+        self.paid = True
+        for name in (
+            "block_finality",
+            "find_unfinalized_tx",
+            "get_block_hash_from_tx",
+            "verify_payment",
+            "verify_unfinalized_payment",
+        ):
+            monkeypatch.setattr(finality, name, getattr(self, name))
+
+    def block_finality(self, block_hash):
+        return self.finality.get(block_hash, "orphaned")
+
+    def find_unfinalized_tx(self, tx_hash):
+        return self.best.get(tx_hash)
+
+    def get_block_hash_from_tx(self, tx_hash):
+        return self.finalized.get(tx_hash)
+
+    def verify_payment(self, block_hash, recipient, min_amount):
+        self.verified.append((block_hash, min_amount))
+        return {"block_hash": block_hash} if self.paid else None
+
+    verify_unfinalized_payment = verify_payment
+
+
+@pytest.fixture
+def chain(monkeypatch) -> Chain:
+    return Chain(monkeypatch)
+
+
+def _provisional(block_hash: str | None = "0xbest") -> CoursePurchase:
+    return CoursePurchase(
+        id=uuid.uuid4(),
+        course_id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        transaction_hash=TX_HASH,
+        amount=3.0,
+        amount_planck=30_000_000_000,
+        teacher_payout_planck=17_000_000_000,
+        block_hash=block_hash,
+        status=finality.PROVISIONAL,
+    )
+
+
+# ---------------------------------------------------------------------------
+# One check: _confirm
+# ---------------------------------------------------------------------------
+async def test_finalized_block_confirms(chain):
+    purchase = _provisional()
+    chain.finality["0xbest"] = "finalized"
+
+    assert await finality._confirm(purchase, overdue=False) == "confirmed"
+    assert purchase.status == "pending"
+
+
+@pytest.mark.parametrize("overdue", [False, True])
+async def test_unfinalized_block_waits_until_overdue(chain, overdue):
+    purchase = _provisional()
+    chain.finality["0xbest"] = "unfinalized"
+
+    outcome = await finality._confirm(purchase, overdue=overdue)
+    if overdue:
+        assert outcome == "revoked"
+        assert purchase.status == finality.REVOKED
+    else:
+        assert outcome is None
+        assert purchase.status == finality.PROVISIONAL
+
+
+@pytest.mark.parametrize("reorged_to", ["best", "finalized"])
+async def test_orphaned_block_follows_the_transaction(chain, reorged_to):
+    purchase = _provisional()
+    getattr(chain, reorged_to)[TX_HASH] = "0xnew"
+
+    # Moved, even when overdue: the new block gets its own check
+    assert await finality._confirm(purchase, overdue=True) is None
+    assert purchase.block_hash == "0xnew"
+    assert purchase.status == finality.PROVISIONAL
+    # Re-verified for the amount recorded on the purchase
+    assert chain.verified == [("0xnew", purchase.amount_planck)]
+
+
+async def test_orphaned_block_without_payment_is_revoked_when_overdue(chain):
+    purchase = _provisional()
+    chain.best[TX_HASH] = "0xnew"
+    chain.paid = False
+
+    assert await finality._confirm(purchase, overdue=False) is None
+    assert purchase.block_hash == "0xbest"
+    assert await finality._confirm(purchase, overdue=True) == "revoked"
+    assert purchase.status == finality.REVOKED
+
+
+async def test_purchase_without_block_is_looked_up(chain):
+    purchase = _provisional(block_hash=None)
+    chain.finalized[TX_HASH] = "0xfinal"
+
+    assert await finality._confirm(purchase, overdue=False) is None
+    assert purchase.block_hash == "0xfinal"
+
+
+# ---------------------------------------------------------------------------
+# confirm_provisional (Postgres)
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def payouts(monkeypatch) -> list[int]:
+    sent: list[int] = []
+
+    async def transfer(wallet: str, amount_planck: int) -> str:
+        sent.append(amount_planck)
+        return f"0xpayout{len(sent)}"
+
+    monkeypatch.setattr("src.platform.wallet.async_transfer_to_teacher", transfer)
+    return sent
+
+
+@pytest.fixture
+async def provisional(session, course, student) -> CoursePurchase:
+    return await settle_purchase(
+        session,
+        course_id=course.id,
+        author_id=course.author_id,
+        user_id=student.id,
+        tx_hash=TX_HASH,
+        split=split_payment(course.price_planck, course.total_payback_reserve_planck),
+        provisional_block="0xbest",
+    )
+
+
+async def _reload(session, purchase: CoursePurchase) -> CoursePurchase:
+    await session.refresh(purchase)
+    return purchase
+
+
+async def test_confirmed_purchase_is_paid_out(
+    engine, session, provisional, chain, payouts
+):
+    chain.finality["0xbest"] = "finalized"
+    confirmed = finality.metrics.confirmed
+
+    assert await finality.confirm_provisional(engine) == 1
+    purchase = await _reload(session, provisional)
+    assert purchase.status == "completed"
+    assert purchase.teacher_payout_hash == "0xpayout1"
+    assert payouts == [provisional.teacher_payout_planck]
+    assert finality.metrics.confirmed == confirmed + 1
+
+    # Nothing left to check, nothing paid twice
+    assert await finality.confirm_provisional(engine) == 0
+    assert len(payouts) == 1
+
+
+async def test_unfinalized_purchase_is_revoked_after_the_timeout(
+    engine, session, provisional, chain, payouts
+):
+    chain.finality["0xbest"] = "unfinalized"
+
+    assert await finality.confirm_provisional(engine) == 1
+    assert (await _reload(session, provisional)).status == finality.PROVISIONAL
+
+    await session.exec(
+        sa.update(CoursePurchase)  # type: ignore[call-overload]
+        .where(CoursePurchase.id == provisional.id)  # type: ignore[arg-type]
+        .values(
+            provisional_since=sa.func.localtimestamp()
+            - timedelta(seconds=settings.X402_FINALITY_TIMEOUT + 60)
+        )
+    )
+    await session.commit()
+
+    assert await finality.confirm_provisional(engine) == 1
+    assert (await _reload(session, provisional)).status == finality.REVOKED
+    assert payouts == []
+
+
+async def test_chain_errors_never_revoke(
+    engine, session, provisional, chain, monkeypatch
+):
+    def unreachable(block_hash):
+        raise ConnectionError("node down")
+
+    monkeypatch.setattr(finality, "block_finality", unreachable)
+    await session.exec(
+        sa.update(CoursePurchase)  # type: ignore[call-overload]
+        .where(CoursePurchase.id == provisional.id)  # type: ignore[arg-type]
+        .values(provisional_since=sa.func.localtimestamp() - timedelta(days=1))
+    )
+    await session.commit()
+
+    assert await finality.confirm_provisional(engine) == 1
+    assert (await _reload(session, provisional)).status == finality.PROVISIONAL
@@ -0,0 +1,124 @@
+"""Lesson ordering: gapped indexes, single-row moves and re-spacing."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+import sqlalchemy as sa
+
+from src.course.exceptions import InvalidOrder
+from src.course.models import Lesson
+from src.course.service import INDEX_GAP, _apply_order, _move
+
+pytestmark = pytest.mark.anyio
+
+_lesson: sa.Table = Lesson.__table__  # type: ignore[attr-defined]
+
+
+@pytest.fixture
+def add_lessons(session, course):
+    async def add(*indexes: int) -> list[uuid.UUID]:
+        ids = [uuid.uuid4() for _ in indexes]
+        await session.exec(
+            sa.insert(_lesson),  # type: ignore[call-overload]
+            params=[
+                {
+                    "id": lesson_id,
+                    "course_id": course.id,
+                    "title": f"Lesson {index}",
+                    "description": "",
+                    "video_url": "",
+                    "payback_amount": 0.0,
+                    "lesson_index": index,
+                }
+                for lesson_id, index in zip(ids, indexes)
+            ],
+        )
+        await session.commit()
+        return ids
+
+    return add
+
+
+async def _indexes(session, course) -> dict[uuid.UUID, int]:
+    result = await session.exec(
+        sa.select(_lesson.c.id, _lesson.c.lesson_index)  # type: ignore[call-overload]
+        .where(_lesson.c.course_id == course.id)
+    )
+    return dict(result.all())
+
+
+async def _move_lesson(session, course, lesson_id, after_id):
+    return await _move(session, _lesson, "course_id", course.id, lesson_id, after_id)
+
+
+async def test_apply_order_respaces_in_the_given_order(session, course, add_lessons):
+    a, b, c = await add_lessons(5, 6, 7)
+
+    positions = await _apply_order(session, _lesson, "course_id", course.id, [c, a, b])
+    await session.commit()
+
+    expected = {c: INDEX_GAP, a: 2 * INDEX_GAP, b: 3 * INDEX_GAP}
+    assert {p.id: p.index for p in positions} == expected
+    assert await _indexes(session, course) == expected
+
+
+async def test_apply_order_only_touches_the_parent(session, course, add_lessons):
+    (a,) = await add_lessons(5)
+
+    await _apply_order(session, _lesson, "course_id", uuid.uuid4(), [a])
+    await session.commit()
+
+    assert await _indexes(session, course) == {a: 5}
+
+
+async def test_move_between_neighbours_writes_one_row(session, course, add_lessons):
+    a, b, c = await add_lessons(INDEX_GAP, 2 * INDEX_GAP, 3 * INDEX_GAP)
+
+    positions = await _move_lesson(session, course, c, a)
+
+    midpoint = (INDEX_GAP + 2 * INDEX_GAP) // 2
+    assert [(p.id, p.index) for p in positions] == [(c, midpoint)]
+    assert await _indexes(session, course) == {
+        a: INDEX_GAP,
+        b: 2 * INDEX_GAP,
+        c: midpoint,
+    }
+
+
+async def test_move_to_front_and_end(session, course, add_lessons):
+    a, b, c = await add_lessons(INDEX_GAP, 2 * INDEX_GAP, 3 * INDEX_GAP)
+
+    (front,) = await _move_lesson(session, course, c, None)
+    assert front.id == c
+    assert 0 <= front.index < INDEX_GAP
+
+    (end,) = await _move_lesson(session, course, a, b)
+    assert (end.id, end.index) == (a, 3 * INDEX_GAP)
+
+    indexes = await _indexes(session, course)
+    assert sorted(indexes, key=indexes.__getitem__) == [c, b, a]
+
+
+async def test_move_without_a_free_index_respaces(session, course, add_lessons):
+    a, b, c = await add_lessons(0, 1, 2)
+
+    positions = await _move_lesson(session, course, c, a)
+
+    assert [p.id for p in positions] == [a, c, b]
+    assert await _indexes(session, course) == {
+        a: INDEX_GAP,
+        c: 2 * INDEX_GAP,
+        b: 3 * INDEX_GAP,
+    }
+
+
+async def test_move_after_unknown_item_is_refused(session, course, add_lessons):
+    a, b = await add_lessons(INDEX_GAP, 2 * INDEX_GAP)
+
+    # After itself, or after an item of another parent
+    for after_id in (a, uuid.uuid4()):
+        with pytest.raises(InvalidOrder):
+            await _move_lesson(session, course, a, after_id)
+    assert await _indexes(session, course) == {a: INDEX_GAP, b: 2 * INDEX_GAP}
@@ -0,0 +1,109 @@
+"""Keyset pagination helpers."""
+
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.auth.models import User
+from src.pagination import InvalidCursor, decode_cursor, encode_cursor, paginate
+
+KEY_TYPES = (datetime, uuid.UUID)
+
+
+def _raw_cursor(values) -> str:
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_cursor_round_trip():
+    key = (datetime(2024, 5, 1, 12, 30, 15, 250), uuid.uuid4())
+    cursor = encode_cursor(*key)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, *KEY_TYPES) == key
+    assert decode_cursor(encode_cursor(7, "x", 0.5), int, str, float) == (7, "x", 0.5)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not base64!",
+        _raw_cursor({"created_at": "2024-01-01T00:00:00"}),
+        _raw_cursor(["2024-01-01T00:00:00"]),
+        _raw_cursor(["2024-01-01T00:00:00", str(uuid.uuid4()), 1]),
+        _raw_cursor(["yesterday", str(uuid.uuid4())]),
+        _raw_cursor(["2024-01-01T00:00:00", "not-a-uuid"]),
+        # Well-formed JSON of the wrong element types
+        _raw_cursor(["2024-01-01T00:00:00", 123]),
+        _raw_cursor([20240101, str(uuid.uuid4())]),
+        _raw_cursor(["2024-01-01T00:00:00", None]),
+        _raw_cursor(["2024-01-01T00:00:00", ["a"]]),
+    ],
+)
+def test_malformed_cursor_is_a_bad_request(cursor):
+    with pytest.raises(InvalidCursor) as excinfo:
+        decode_cursor(cursor, *KEY_TYPES)
+    assert excinfo.value.status_code == 400
+
+
+@pytest.mark.parametrize("value", [True, None, [1], {"a": 1}])
+def test_scalar_cursor_rejects_other_json_types(value):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(_raw_cursor([value]), int)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+_users = sa.select(User).order_by(User.created_at, User.id)  # type: ignore[arg-type]
+_keys = (User.created_at, User.id)
+
+
+def test_paginate_by_offset_without_cursor():
+    sql = _sql(paginate(_users, _keys, KEY_TYPES, offset=20, limit=10, cursor=None))
+
+    assert "OFFSET" in sql
+    assert "LIMIT" in sql
+    assert '("user".created_at, "user".id) >' not in sql
+
+
+@pytest.mark.parametrize("descending, operator", [(False, ">"), (True, "<")])
+def test_paginate_after_cursor(descending, operator):
+    key = (datetime(2024, 5, 1), uuid.uuid4())
+    statement = paginate(
+        _users,
+        _keys,
+        KEY_TYPES,
+        offset=20,
+        limit=10,
+        cursor=encode_cursor(*key),
+        descending=descending,
+    )
+    sql = _sql(statement)
+
+    # The cursor replaces the offset
+    assert "OFFSET" not in sql
+    assert f'("user".created_at, "user".id) {operator} (' in sql
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert set(key) <= set(params.values())
+
+
+def test_paginate_rejects_malformed_cursor():
+    with pytest.raises(InvalidCursor):
+        paginate(
+            _users,
+            _keys,
+            KEY_TYPES,
+            offset=0,
+            limit=10,
+            cursor=_raw_cursor(["2024-01-01T00:00:00", 123]),
+        )
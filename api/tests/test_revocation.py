@@ -0,0 +1,135 @@
+"""Token revocation: the Bloom filter and its mirror of ``revoked_token``."""
+
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import sqlalchemy as sa
+
+from src.auth.models import RevokedToken
+from src.auth.revocation import BloomFilter, RevocationList
+
+_revoked: sa.Table = RevokedToken.__table__  # type: ignore[attr-defined]
+
+
+# ---------------------------------------------------------------------------
+# BloomFilter
+# ---------------------------------------------------------------------------
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [str(uuid.uuid4()) for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert bloom.count == 1000
+    assert all(key in bloom for key in keys)
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(2000, 0.01)
+    for _ in range(2000):
+        bloom.add(str(uuid.uuid4()))
+
+    probes = 20_000
+    hits = sum(str(uuid.uuid4()) in bloom for _ in range(probes))
+    assert hits / probes < 0.02
+
+
+def test_bloom_filter_sizing():
+    bloom = BloomFilter(1000, 0.01)
+    # ~9.6 bits and 7 hashes per key for a 1% error rate
+    assert 9500 <= bloom.size <= 9600
+    assert bloom.hashes == 7
+    assert "anything" not in BloomFilter(0, 0.01)
+
+
+# ---------------------------------------------------------------------------
+# RevocationList
+# ---------------------------------------------------------------------------
+def _claims(lifetime: float = 3600) -> dict:
+    return {"jti": uuid.uuid4().hex, "exp": time.time() + lifetime}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("jti", [None, 42, "never-revoked"])
+async def test_filter_miss_needs_no_query(jti):
+    # No engine: a filter miss must answer without a connection
+    revocations = RevocationList(None, 100, 0.01, 60)  # type: ignore[arg-type]
+    assert not await revocations.is_revoked(jti)
+
+
+@pytest.fixture
+async def revocations(engine, session) -> RevocationList:
+    # ``session`` empties the tables first
+    revocations = RevocationList(engine, 100, 0.01, 60)
+    await revocations.rebuild()
+    return revocations
+
+
+@pytest.mark.anyio
+async def test_revoked_token_is_rejected(session, revocations):
+    claims = _claims()
+    await revocations.revoke(session, claims)
+
+    assert await revocations.is_revoked(claims["jti"])
+    assert not await revocations.is_revoked(_claims()["jti"])
+
+
+@pytest.mark.anyio
+async def test_token_without_jti_is_not_recorded(session, revocations):
+    await revocations.revoke(session, {"exp": time.time() + 3600})
+
+    assert await session.scalar(sa.select(sa.func.count()).select_from(_revoked)) == 0
+
+
+@pytest.mark.anyio
+async def test_filter_false_positive_is_absorbed(revocations):
+    revocations._add("not-in-the-table")
+    assert not await revocations.is_revoked("not-in-the-table")
+
+
+@pytest.mark.anyio
+async def test_other_workers_learn_revocations_on_sync(engine, session, revocations):
+    other = RevocationList(engine, 100, 0.01, 60)
+    await other.rebuild()
+    claims = _claims()
+    await revocations.revoke(session, claims)
+
+    assert not await other.is_revoked(claims["jti"])
+    await other.sync()
+    assert await other.is_revoked(claims["jti"])
+
+
+@pytest.mark.anyio
+async def test_rebuild_drops_expired_revocations(session, revocations):
+    expired = uuid.uuid4().hex
+    await session.exec(
+        sa.insert(_revoked).values(  # type: ignore[call-overload]
+            jti=expired, expires_at=datetime.now(timezone.utc) - timedelta(minutes=1)
+        )
+    )
+    await session.commit()
+    await revocations.sync()
+    assert not await revocations.is_revoked(expired)
+
+    await revocations.rebuild()
+    assert expired not in revocations._filter
+    assert await session.scalar(sa.select(sa.func.count()).select_from(_revoked)) == 0
+
+
+@pytest.mark.anyio
+async def test_saturated_filter_is_rebuilt_larger(engine, session):
+    revocations = RevocationList(engine, 1, 0.01, 60)
+    await revocations.rebuild()
+    claims = [_claims() for _ in range(3)]
+    for c in claims:
+        await revocations.revoke(session, c)
+
+    await revocations.sync()
+    assert revocations._filter.capacity >= 6
+    assert revocations._filter.count == 3
+    for c in claims:
+        assert await revocations.is_revoked(c["jti"])
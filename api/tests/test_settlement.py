@@ -0,0 +1,255 @@
+"""x402 settlement: coalescing in ``verify_and_settle`` and the purchase claim."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+import sqlalchemy as sa
+
+from src.course.exceptions import TransactionAlreadyUsed
+from src.course.models import Course, CoursePurchase
+from src.course.pricing import split_payment
+from src.course.service import settle_purchase
+from src.x402 import polkadot_scheme
+from src.x402.polkadot_scheme import SettlementPending, verify_and_settle
+from src.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    PolkadotPaymentProof,
+    SettleResponse,
+)
+
+pytestmark = pytest.mark.anyio
+
+TX_HASH = "0x" + "ab" * 32
+
+
+def _payload(tx_hash: str = TX_HASH) -> PaymentPayload:
+    return PaymentPayload(
+        accepted=PaymentRequirements(
+            scheme="exact",
+            network="polkadot:paseo",
+            maxAmountRequired="30000000000",
+            asset="PAS",
+            payTo="5platform",
+        ),
+        payload=PolkadotPaymentProof(transactionHash=tx_hash),
+    )
+
+
+def _course() -> Course:
+    return Course(
+        id=uuid.uuid4(),
+        title="t",
+        description="d",
+        price=3.0,
+        author_id=uuid.uuid4(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Coalescing (the settlement itself is stubbed)
+# ---------------------------------------------------------------------------
+class StubSettlement:
+    """Stands in for ``_verify_and_settle``; blocks until ``release``."""
+
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.error = error
+
+    async def __call__(self, payload, course, user_id, session) -> SettleResponse:
+        self.calls += 1
+        self.started.set()
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return SettleResponse(
+            success=True,
+            transaction=payload.payload.transactionHash,
+            network=payload.accepted.network,
+        )
+
+
+@pytest.fixture
+def stub(monkeypatch) -> StubSettlement:
+    stub = StubSettlement()
+    monkeypatch.setattr(polkadot_scheme, "_verify_and_settle", stub)
+    return stub
+
+
+async def test_duplicates_wait_for_the_running_settlement(stub):
+    course, user_id = _course(), uuid.uuid4()
+    first = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await stub.started.wait()
+    second = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await asyncio.sleep(0)
+    stub.release.set()
+
+    assert await first == await second
+    assert stub.calls == 1
+    assert TX_HASH not in polkadot_scheme._inflight
+
+
+async def test_settlement_for_another_purchase_is_refused(stub):
+    course = _course()
+    first = asyncio.create_task(
+        verify_and_settle(_payload(), course, uuid.uuid4(), None)
+    )
+    await stub.started.wait()
+    with pytest.raises(ValueError, match="another purchase"):
+        await verify_and_settle(_payload(), course, uuid.uuid4(), None)
+    with pytest.raises(ValueError, match="another purchase"):
+        await verify_and_settle(_payload(), _course(), uuid.uuid4(), None)
+    stub.release.set()
+    await first
+    assert stub.calls == 1
+
+
+async def test_other_transactions_are_not_coalesced(stub):
+    course, user_id = _course(), uuid.uuid4()
+    stub.release.set()
+    await asyncio.gather(
+        verify_and_settle(_payload(), course, user_id, None),
+        verify_and_settle(_payload("0x" + "cd" * 32), course, user_id, None),
+    )
+    assert stub.calls == 2
+
+
+async def test_failure_is_shared_and_not_cached(stub):
+    course, user_id = _course(), uuid.uuid4()
+    stub.error = SettlementPending("not finalized yet")
+    first = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await stub.started.wait()
+    second = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await asyncio.sleep(0)
+    stub.release.set()
+
+    for task in (first, second):
+        with pytest.raises(SettlementPending):
+            await task
+    assert TX_HASH not in polkadot_scheme._inflight
+
+    # A retry runs the settlement again
+    stub.error = None
+    await verify_and_settle(_payload(), course, user_id, None)
+    assert stub.calls == 2
+
+
+async def test_cancelled_settlement_asks_waiters_to_retry(stub):
+    course, user_id = _course(), uuid.uuid4()
+    first = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await stub.started.wait()
+    second = asyncio.create_task(verify_and_settle(_payload(), course, user_id, None))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    with pytest.raises(ValueError, match="interrupted"):
+        await second
+    assert TX_HASH not in polkadot_scheme._inflight
+
+
+# ---------------------------------------------------------------------------
+# settle_purchase: the claim on the transaction (Postgres)
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def payouts(monkeypatch) -> list[tuple[str, int]]:
+    """Teacher payouts sent, instead of transfers on chain."""
+    sent: list[tuple[str, int]] = []
+
+    async def transfer(wallet: str, amount_planck: int) -> str:
+        sent.append((wallet, amount_planck))
+        return f"0xpayout{len(sent)}"
+
+    monkeypatch.setattr("src.platform.wallet.async_transfer_to_teacher", transfer)
+    return sent
+
+
+async def _settle(session, course, user, provisional_block=None) -> CoursePurchase:
+    return await settle_purchase(
+        session,
+        course_id=course.id,
+        author_id=course.author_id,
+        user_id=user.id,
+        tx_hash=TX_HASH,
+        split=split_payment(course.price_planck, course.total_payback_reserve_planck),
+        provisional_block=provisional_block,
+    )
+
+
+async def test_claim_pays_the_teacher_once(session, course, teacher, student, payouts):
+    purchase = await _settle(session, course, student)
+
+    split = split_payment(course.price_planck, course.total_payback_reserve_planck)
+    assert purchase.status == "completed"
+    assert purchase.teacher_payout_hash == "0xpayout1"
+    assert purchase.amount_planck == course.price_planck
+    assert purchase.teacher_payout_planck == split.teacher_share
+    assert payouts == [(teacher.wallet_address, split.teacher_share)]
+
+    again = await _settle(session, course, student)
+    assert again.id == purchase.id
+    assert again.status == "completed"
+    assert len(payouts) == 1
+
+
+async def test_claim_by_another_user_conflicts(
+    session, course, student, make_user, payouts
+):
+    await _settle(session, course, student)
+    with pytest.raises(TransactionAlreadyUsed) as excinfo:
+        await _settle(session, course, await make_user())
+    assert excinfo.value.status_code == 409
+    assert len(payouts) == 1
+
+
+async def test_provisional_claim_defers_the_payout(session, course, student, payouts):
+    purchase = await _settle(session, course, student, provisional_block="0xbest")
+
+    assert purchase.status == "provisional"
+    assert purchase.block_hash == "0xbest"
+    assert purchase.provisional_since is not None
+    assert purchase.teacher_payout_hash is None
+    assert payouts == []
+
+
+async def test_revoked_claim_is_reinstated(session, course, student, payouts):
+    revoked = await _settle(session, course, student, provisional_block="0xbest")
+    await session.exec(
+        sa.update(CoursePurchase)  # type: ignore[call-overload]
+        .where(CoursePurchase.id == revoked.id)  # type: ignore[arg-type]
+        .values(status="revoked")
+    )
+    await session.commit()
+
+    purchase = await _settle(session, course, student)
+    assert purchase.id == revoked.id
+    assert purchase.status == "completed"
+    assert purchase.block_hash is None
+    assert purchase.provisional_since is None
+    # The purchase keeps its original date
+    assert purchase.created_at == revoked.created_at
+    assert len(payouts) == 1
+
+
+async def test_revoked_claim_of_another_user_conflicts(
+    session, course, student, make_user, payouts
+):
+    revoked = await _settle(session, course, student, provisional_block="0xbest")
+    await session.exec(
+        sa.update(CoursePurchase)  # type: ignore[call-overload]
+        .where(CoursePurchase.id == revoked.id)  # type: ignore[arg-type]
+        .values(status="revoked")
+    )
+    await session.commit()
+
+    with pytest.raises(TransactionAlreadyUsed):
+        await _settle(session, course, await make_user())
+    await session.refresh(revoked)
+    assert revoked.status == "revoked"
+    assert payouts == []
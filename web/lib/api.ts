@@ -222,6 +222,21 @@ export interface CourseProgress {
   lessons: LessonProgressSummary[];
 }
 
+export interface CourseProgressOverview {
+  course_id: string;
+  course_title: string;
+  purchased_at: string;
+  total_lessons: number;
+  completed_lessons: number;
+  passed_lessons: number;
+  completion_pct: number;
+  total_questions: number;
+  answered: number;
+  correct: number;
+  score_pct: number;
+  total_earned: number;
+}
+
 // ---------------------------------------------------------------------------
 // x402 V2 protocol types
 // ---------------------------------------------------------------------------
@@ -374,6 +389,32 @@ function b64Decode<T = unknown>(value: string): T {
   return JSON.parse(atob(padded)) as T;
 }
 
+// ---------------------------------------------------------------------------
+// Read-your-writes token
+//
+// The API returns X-Last-Write on responses whose request wrote to the
+// primary database; echoing the latest one makes reads that follow (lesson
+// access after a purchase, progress after an answer) avoid a stale replica.
+// Kept in sessionStorage so it survives reloads within the tab.
+// ---------------------------------------------------------------------------
+
+const LAST_WRITE_HEADER = "X-Last-Write";
+const LAST_WRITE_KEY = "learnearn-last-write";
+
+let _lastWrite: string | null =
+  typeof window !== "undefined"
+    ? window.sessionStorage.getItem(LAST_WRITE_KEY)
+    : null;
+
+function rememberLastWrite(res: Response): void {
+  const value = res.headers.get(LAST_WRITE_HEADER);
+  if (!value || (_lastWrite && Number(value) <= Number(_lastWrite))) return;
+  _lastWrite = value;
+  if (typeof window !== "undefined") {
+    window.sessionStorage.setItem(LAST_WRITE_KEY, value);
+  }
+}
+
 // ---------------------------------------------------------------------------
 // Core fetch with auth headers + token refresh + 402 intercept
 // ---------------------------------------------------------------------------
@@ -391,7 +432,12 @@ async function authFetch(
     headers.set("Authorization", `Bearer ${token}`);
   }
 
+  if (_lastWrite && !headers.has(LAST_WRITE_HEADER)) {
+    headers.set(LAST_WRITE_HEADER, _lastWrite);
+  }
+
   const res = await fetch(url, { ...init, headers });
+  rememberLastWrite(res);
 
   // 401 — try refresh once, then retry
   if (res.status === 401 && !_retried && _refreshTokens) {
@@ -638,4 +684,10 @@ export const progressApi = {
     authFetch(`${API_BASE}/courses/${courseId}/progress`).then(
       handleResponse<CourseProgress>,
     ),
+
+  /** Get progress across every course the authenticated user bought. */
+  myProgress: () =>
+    authFetch(`${API_BASE}/progress/me`).then(
+      handleResponse<CourseProgressOverview[]>,
+    ),
 };
@@ -51,7 +51,7 @@ interface AuthState {
   /** Update display name for the current user */
   updateDisplayName: (newName: string) => Promise<void>;
 
-  /** Clear all auth state (logout / disconnect) */
+  /** Revoke the tokens and clear all auth state (logout / disconnect) */
   logout: () => void;
 
   /** Get the current access token (for use by api.ts) */
@@ -210,14 +210,27 @@ export const useAuthStore = create<AuthState>()(
         }
       },
 
-      logout: () =>
+      logout: () => {
+        const { accessToken, refreshToken } = get();
+        if (refreshToken) {
+          // Revoke server-side; local state is cleared regardless
+          apiFetch<void>("/auth/logout", {
+            method: "POST",
+            headers: {
+              "Content-Type": "application/json",
+              ...(accessToken ? { Authorization: `Bearer ${accessToken}` } : {}),
+            },
+            body: JSON.stringify({ refresh_token: refreshToken }),
+          }).catch(() => {});
+        }
         set({
           user: null,
           accessToken: null,
           refreshToken: null,
           isLoading: false,
           error: null,
-        }),
+        });
+      },
     }),
     {
       name: "polkadot-learnearn-auth",